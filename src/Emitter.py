@@ -19,15 +19,15 @@ class Emitter(QObject):
 	send_API_key_signal: Signal = Signal(str) 	# 发送设置API密钥的信号
 	school_timetable_path_signal:Signal = Signal(object) #发送课表的信号
 	view_and_edit_schedule_signal: Signal = Signal(object)  # 发送查看单条日程信号
-	update_upcoming_event_signal: Signal = Signal(object)  # 向后端发送更新upcoming的回调信号
 	delete_event_signal: Signal = Signal(object)  # 发送删除事件的信号
 	delete_activity_event_signal: Signal = Signal() # 发送删除活动事件的信号以便weekview更新
-	search_all_event_signal: Signal = Signal(object)  # 向后端发送搜索全局事件的信号
 	search_some_columns_event_signal: Signal = Signal(object)  # 向后端发送搜索部分列事件的信号
 	search_time_event_signal: Signal = Signal(object)  # 向后端发送搜索时间范围内事件的信号
 	backend_data_to_frontend_signal: Signal = Signal(object)  # 向前端发送后端数据的信号
-	notice_signal: Signal = Signal(object)  # 向通知栏发送最新数据
-	latest_event_signal: Signal = Signal(object)  # 处理前端通知更新最新数据
+	notice_signal: Signal = Signal(object)  # 向提醒调度器发送待提醒事件的变化
+	pending_reminders_signal: Signal = Signal(object)  # 向后端请求全部待提醒事件
+	db_request_signal: Signal = Signal(int, object)  # 向后台数据库线程发送(请求id, 请求)
+	events_changed_signal: Signal = Signal()  # 数据库中的事件被增删改（或切换了数据库），前端缓存需要失效
 	@staticmethod
 	def instance() -> "Emitter":
 		if Emitter._instance is None:
@@ -36,6 +36,8 @@ class Emitter(QObject):
 
 	def __init__(self):
 		super().__init__()
+		self._request_counter = 0  # 异步请求id，单调递增
+		self._pending_requests: dict[int, object] = {}  # 请求id -> 等待结果的回调
 
 	# ===转发信号函数====
 	def send_refresh_upcoming_signal(self):
@@ -67,9 +69,14 @@ class Emitter(QObject):
 		log.info(f"发送后端数据到前端信号")
 		self.backend_data_to_frontend_signal.emit(data)
 
+	def send_events_changed_signal(self):
+		"""通知前端数据库中的事件已变化"""
+		self.events_changed_signal.emit()
+
 	def send_notice_signal(self, data):
-		"""向通知栏发送最新数据，回传数据为ddlevent"""
-		#log.info(f"向通知栏发送最新数据:{data.title} {data.datetime}")
+		"""
+		向提醒调度器发送待提醒事件的变化：(事件列表, "load"/"upsert") 或 (id列表, "remove")
+		"""
 		self.notice_signal.emit(data)
 
 	# ===对接后端信号函数，发送信号第一个参数为命令====
@@ -120,31 +127,54 @@ class Emitter(QObject):
 		out = ("delete_event", (event_id, event_table_type))
 		self.delete_event_signal.emit(out)
 
+	def send_delete_events_in_dates_signal(self, dates: list[QDate]):
+		"""
+		发送删除若干天内全部事件的信号，后端在一个事务中完成删除
+		"""
+		date_strs = [date.toString("yyyy-MM-dd") for date in dates]
+		log.info(f"发送删除若干天内全部事件的信号，日期为{date_strs}")
+		out = ("delete_events_in_dates", (date_strs,))
+		self.delete_event_signal.emit(out)
+
 	# ===向后端发送请求（回传数据），回调信号===
 
-	def request_search_all_event_signal(self, keyword: tuple[str]):
+	def request_search_all_event_signal(self, keyword: tuple[str], callback) -> int:
 		"""
 		向后端发送搜索全局事件的请求
-		keyword为搜索关键字，字符串元组
+		keyword为搜索关键字，字符串元组；结果为tuple[BaseEvent]，到达后调用callback
 		"""
 		log.info(f"向后端发送搜索全局事件的请求，搜索关键字为{keyword}")
-		out = ("search_all", keyword)
-		self.search_all_event_signal.emit(out)
+		return self.request_backend_async(("search_all", keyword), callback)
 
-	def request_update_upcoming_event_signal(self, start_pos: int, event_num: int):
+	def request_upcoming_page_signal(self, cursor: tuple, event_num: int, callback) -> int:
 		"""
-		向后端发送更新upcoming的请求
+		向后端发送获取upcoming下一页的请求
+		cursor为已显示的最后一个事件的(datetime, id)，None表示第一页；结果到达后调用callback
 		"""
-		log.info(f"向后端发送更新upcoming的请求，参数为start_pos:{start_pos}，event_num:{event_num}")
-		out = ("update_upcoming", (start_pos, event_num))
-		self.update_upcoming_event_signal.emit(out)
-	def request_update_specific_date_upcoming_event_signal(self, date:QDate):
+		log.info(f"向后端发送获取upcoming下一页的请求，参数为cursor:{cursor}，event_num:{event_num}")
+		return self.request_backend_async(("upcoming_page", (cursor, event_num)), callback)
+
+	def request_update_specific_date_upcoming_event_signal(self, date: QDate, callback) -> int:
 		"""
-		向后端发送更新某日的upcoming的请求
+		向后端发送获取某日全部事件的请求，结果到达后调用callback
 		"""
 		log.info(f"向后端发送更新specific_date_upcoming的请求，参数为日期:{date}")
-		out = ("update_specific_date_upcoming", (date, ))
-		self.update_upcoming_event_signal.emit(out)		
+		return self.request_backend_async(("update_specific_date_upcoming", (date, )), callback)
+
+	def request_events_in_month_signal(self, year: int, month: int, callback) -> int:
+		"""
+		向后端发送获取某月全部事件的请求（用于日历预取），结果到达后调用callback
+		"""
+		log.info(f"向后端发送获取{year}年{month}月事件的请求")
+		return self.request_backend_async(("events_in_month", (year, month)), callback)
+
+	def request_activities_between_twodays_signal(self, start_date: str, end_date: str, callback) -> int:
+		"""
+		向后端发送获取两日期之间全部activity发生的请求（用于周视图预取），结果到达后调用callback
+		"""
+		log.info(f"向后端发送获取{start_date}~{end_date}的activity的请求")
+		return self.request_backend_async(("activities_between_twodays", (start_date, end_date)), callback)
+
 	def request_search_time_event_signal(self, start_time: str, end_time: str):
 		"""
 		向后端发送搜索时间范围内事件的请求
@@ -162,11 +192,38 @@ class Emitter(QObject):
 		out = ("search_some_columns", (columns, keyword))
 		self.search_some_columns_event_signal.emit(out)
 
-	def request_latest_event_signal(self, now_time: QDateTime):
+	# ===异步请求：在后台数据库线程中执行，结果按请求id回调===
+
+	def request_backend_async(self, request: tuple, callback) -> int:
+		"""
+		发送异步查询请求，立即返回请求id（不阻塞界面）。
+		结果在GUI线程中以 callback(result) 的形式送回；请求被 cancel_backend_request 取消后结果直接丢弃
+		"""
+		self._request_counter += 1
+		request_id = self._request_counter
+		self._pending_requests[request_id] = callback
+		self.db_request_signal.emit(request_id, request)
+		return request_id
+
+	def cancel_backend_request(self, request_id: int):
+		"""取消尚未返回的请求，之后到达的结果将被丢弃"""
+		if request_id is not None:
+			self._pending_requests.pop(request_id, None)
+
+	@Slot(int, object)
+	def receive_backend_result(self, request_id: int, result):
+		"""接收后台数据库线程的结果并交给对应回调，已取消或过期的结果直接丢弃"""
+		callback = self._pending_requests.pop(request_id, None)
+		if callback is None:
+			log.info(f"丢弃已取消的请求结果，请求id为{request_id}")
+			return
+		callback(result)
+
+	def request_pending_reminders_signal(self, now_time: QDateTime):
 		"""
-		向后端发送需要更新最新的事件
+		向后端请求提醒时间不早于now_time的全部事件，结果以 (事件列表, "load") 经 notice_signal 回传
 		"""
 		formatted_time = now_time.toString("yyyy-MM-dd HH:mm")
-		#log.info(f"向后端发送需要更新最新的事件，当前时间为{formatted_time}")
-		out = ("latest_event", (formatted_time,))
-		self.latest_event_signal.emit(out)
+		log.info(f"向后端请求全部待提醒事件，当前时间为{formatted_time}")
+		out = ("pending_reminders", (formatted_time,))
+		self.pending_reminders_signal.emit(out)
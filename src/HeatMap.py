@@ -1,4 +1,5 @@
 from src.common import *
+import math
 from calendar import monthrange
 from src.events.Event import *
 from src.events.EventManager import EventSQLManager
@@ -10,109 +11,182 @@ LIGHT_THEME_COLORS = [
 DARK_THEME_COLORS = [
     "#222222", "#4e7933", "#6dc36d", "#a0e883", "#e5ffb2"
 ]
-class DayItem(QObject, QGraphicsRectItem):
-    double_clicked = Signal(QDate)
-    def __init__(self, date: QDate, count: int, rect: QRectF):
-        QObject.__init__(self)
-        QGraphicsRectItem.__init__(self, rect)
-        self.date = date
-        self.count = count 
-        self.setBrush(QBrush(self.map_color(count)))
+
+def heat_color_level(count: int) -> int:
+    """事件数对应的颜色档位（0~4）"""
+    if count == 0:
+        return 0
+    elif count <= 3:
+        return 1
+    elif count <= 6:
+        return 2
+    elif count <= 10:
+        return 3
+    else:
+        return 4
+
+class YearHeatMapItem(QGraphicsItem):
+    """
+    整年热力图：一个图元按扁平的每日计数数组绘制12个月，不为每天创建图元。
+    整张图预先渲染为像素图并按 (年份, 尺寸) 缓存；悬浮提示与双击通过坐标计算定位日期
+    """
+    TITLE_SPACING = 20  # 上下两行月份块之间为标题预留的高度
+    CELL_SPACING = 2  # 日期格之间的间距
+    PIXMAP_CACHE_SIZE = 8  # 最多缓存的像素图数
+
+    def __init__(self, heat_map: "YearHeatMapView"):
+        super().__init__()
+        self.heat_map = heat_map
+        self.year = QDate.currentDate().year()
+        self.counts: list[int] = []  # 下标为当年第几天（从0开始）
+        self.cell_size = 12.0
+        self.spacing = 8.0  # 月份块之间的间距
+        self.hover_date: QDate = None
+        # (年份, 格子大小, 间距, 设备像素比, 是否深色) -> (渲染时的计数, 像素图)
+        self.pixmap_cache: OrderedDict = OrderedDict()
         self.setAcceptHoverEvents(True)
-        self.setToolTip(f"{date.toString()}:\n{count} events")
-        self.setPen(QPen(Qt.NoPen))
 
-    def hoverEnterEvent(self, event):
+    def set_year(self, year: int, data: dict[str, int]):
+        """设置年份与每日事件数 {"yyyy-MM-dd": 数量}"""
+        self.year = year
+        self.counts = [0] * QDate(year, 1, 1).daysInYear()
+        for day, count in data.items():
+            date = QDate.fromString(day, "yyyy-MM-dd")
+            if date.year() == year:
+                self.counts[date.dayOfYear() - 1] = count
+        self.hover_date = None
+        self.update()
+
+    def set_layout(self, cell_size: float, spacing: float):
+        """设置日期格大小与月份块间距"""
+        if (cell_size, spacing) == (self.cell_size, self.spacing):
+            return
+        self.prepareGeometryChange()
+        self.cell_size = cell_size
+        self.spacing = spacing
+
+    def month_origin(self, month: int) -> QPointF:
+        """月份块左上角的位置，4列3行排列"""
+        row, col = divmod(month - 1, 4)
+        return QPointF(col * (self.cell_size * 7 + self.spacing), row * (self.cell_size * 6 + self.TITLE_SPACING + self.spacing))
+
+    def first_column(self, month: int) -> int:
+        """该月1号所在的列（周日为第0列）"""
+        return QDate(self.year, month, 1).dayOfWeek() % 7
+
+    def boundingRect(self) -> QRectF:
+        step = self.cell_size + self.CELL_SPACING
+        last = self.month_origin(12)
+        return QRectF(0, 0, last.x() + 7 * step - self.CELL_SPACING, last.y() + self.cell_size * 2 + 6 * step - self.CELL_SPACING)
+
+    def render_pixmap(self, device_pixel_ratio: float) -> QPixmap:
+        """渲染整年热力图，相同年份、尺寸与计数时直接复用缓存"""
+        is_dark = QApplication.palette().color(QPalette.Window).value() < 128
+        key = (self.year, self.cell_size, self.spacing, device_pixel_ratio, is_dark)
+        cached = self.pixmap_cache.get(key)
+        if cached is not None and cached[0] == self.counts:
+            self.pixmap_cache.move_to_end(key)
+            return cached[1]
+        rect = self.boundingRect()
+        pixmap = QPixmap(max(1, math.ceil(rect.width() * device_pixel_ratio)), max(1, math.ceil(rect.height() * device_pixel_ratio)))
+        pixmap.setDevicePixelRatio(device_pixel_ratio)
+        pixmap.fill(Qt.transparent)
+        color_map = DARK_THEME_COLORS if is_dark else LIGHT_THEME_COLORS
+        brushes = [QBrush(QColor(color)) for color in color_map]
+        painter = QPainter(pixmap)
+        painter.setFont(QApplication.font())
+        painter.setPen(QColor("white") if is_dark else QColor("black"))
+        # 添加月份标题
+        for month in range(1, 13):
+            origin = self.month_origin(month)
+            painter.drawText(QRectF(origin.x(), origin.y(), 7 * (self.cell_size + self.CELL_SPACING), self.cell_size * 2),
+                             Qt.AlignLeft | Qt.AlignTop, QDate(self.year, month, 1).toString("MMMM"))
+        # 添加每日格
+        painter.setPen(Qt.NoPen)
+        step = self.cell_size + self.CELL_SPACING
+        day_index = 0
+        for month in range(1, 13):
+            origin = self.month_origin(month)
+            top = origin.y() + self.cell_size * 2
+            column = self.first_column(month)
+            for day in range(QDate(self.year, month, 1).daysInMonth()):
+                row, col = divmod(column + day, 7)
+                painter.setBrush(brushes[heat_color_level(self.counts[day_index])])
+                painter.drawRect(QRectF(origin.x() + col * step, top + row * step, self.cell_size, self.cell_size))
+                day_index += 1
+        painter.end()
+        self.pixmap_cache[key] = (list(self.counts), pixmap)
+        while len(self.pixmap_cache) > self.PIXMAP_CACHE_SIZE:
+            self.pixmap_cache.popitem(last=False)
+        return pixmap
+
+    def paint(self, painter, option, widget=None):
+        if not self.counts:
+            return
+        painter.drawPixmap(QPointF(0, 0), self.render_pixmap(painter.device().devicePixelRatioF()))
+
+    def date_at(self, pos: QPointF) -> QDate | None:
+        """按坐标计算鼠标所在的日期，不在任何日期格上返回 None"""
+        step = self.cell_size + self.CELL_SPACING
+        block_col = int(pos.x() // (self.cell_size * 7 + self.spacing))
+        if pos.x() < 0 or block_col > 3:
+            return None
+        for block_row in range(3):
+            month = block_row * 4 + block_col + 1
+            origin = self.month_origin(month)
+            x = pos.x() - origin.x()
+            y = pos.y() - origin.y() - self.cell_size * 2
+            if x < 0 or y < 0:
+                continue
+            col, row = int(x // step), int(y // step)
+            # 落在格子之间的间隙上不算
+            if col > 6 or row > 5 or x - col * step > self.cell_size or y - row * step > self.cell_size:
+                continue
+            day = row * 7 + col - self.first_column(month) + 1
+            if 1 <= day <= QDate(self.year, month, 1).daysInMonth():
+                return QDate(self.year, month, day)
+        return None
+
+    def count_on(self, date: QDate) -> int:
+        return self.counts[date.dayOfYear() - 1]
+
+    def hoverMoveEvent(self, event):
         # 在鼠标屏幕坐标处显示系统 tooltip
-        pos = event.screenPos()
-        QToolTip.showText(pos, f"{self.date.toString()}:\n{self.count} events")
-        super().hoverEnterEvent(event)
+        date = self.date_at(event.pos())
+        if date == self.hover_date:
+            return
+        self.hover_date = date
+        if date is None:
+            QToolTip.hideText()
+        else:
+            QToolTip.showText(event.screenPos(), f"{date.toString()}:\n{self.count_on(date)} events")
 
     def hoverLeaveEvent(self, event):
         # 鼠标移出时隐藏 tooltip
+        self.hover_date = None
         QToolTip.hideText()
         super().hoverLeaveEvent(event)
 
-    def map_color(self, count: int):
-        # 颜色映射，todo
-        # 判断是否深色模式
-        is_dark = QApplication.palette().color(QPalette.Window).value() < 128
-        color_map = DARK_THEME_COLORS if is_dark else LIGHT_THEME_COLORS
-
-        if count == 0:
-            return QColor(color_map[0])
-        elif count <= 3:
-            return QColor(color_map[1])
-        elif count <= 6:
-            return QColor(color_map[2])
-        elif count <= 10:
-            return QColor(color_map[3])
-        else:
-            return QColor(color_map[4])
-
     def mouseDoubleClickEvent(self, event):
         """处理双击事件"""
-        if event.button() == Qt.LeftButton:  # 仅处理左键双击
-            # 在这里添加双击后的逻辑
-            log.info(f"双击了日期: {self.date.toString()}，事件数量: {self.count}")
-
-            # 示例：发出自定义信号（需先定义信号）
-            # self.doubleClicked.emit(self.date, self.count)
-            self.double_clicked.emit(self.date)
-            super().mouseDoubleClickEvent(event)  # 调用基类方法确保默认行为        
-
-class MonthBlock(QObject, QGraphicsItemGroup):
-    DoubleClicked = Signal(QDate)
-    def __init__(self,year:int,month:int,data_list:dict,cell_size=12, spacing=2):
-        QObject.__init__(self)
-        QGraphicsItemGroup.__init__(self)
-
-        self.year = year
-        self.month = month
-        self.data_list = data_list
-        self.cell_size = cell_size
-        self.spacing = spacing
-        self.setHandlesChildEvents(False)
-        self.build()
-
-    def build(self):
-        first_weekday, days_in_month = monthrange(self.year, self.month)
-        first_weekday = (first_weekday + 1) % 7
-        date = QDate(self.year, self.month, 1)
-        # 添加月份标题
-        is_dark = QApplication.palette().color(QPalette.Window).value() < 128
-        text_color = QColor("white") if is_dark else QColor("black")
-        title = QGraphicsSimpleTextItem(date.toString("MMMM"))
-        title.setBrush(QBrush(text_color))
-        title.setPos(0, 0)
-        self.addToGroup(title)
-        self.title_height = self.cell_size * 2
-        # 添加每日格
-        row = 0
-        col = first_weekday
-
-        for day in range(1, days_in_month + 1):
-            d = QDate(self.year, self.month, day)
-            count = self.data_list.get(d.toString("yyyy-MM-dd"), 0)
-
-            x = col * (self.cell_size + self.spacing)
-            y = self.title_height + row * (self.cell_size + self.spacing)
-            rect = QRectF(x, y, self.cell_size, self.cell_size)
-
-            item = DayItem(d, count, rect)
-            item.setParentItem(self)
-            item.double_clicked.connect(self.DoubleClicked)
-            col += 1
-            if col == 7:
-                col = 0
-                row += 1
+        date = self.date_at(event.pos())
+        if event.button() == Qt.LeftButton and date is not None:  # 仅处理左键双击
+            log.info(f"双击了日期: {date.toString()}，事件数量: {self.count_on(date)}")
+            self.heat_map.Double_Clicked.emit(date)
+        super().mouseDoubleClickEvent(event)
 
 class YearHeatMapView(QWidget):
+    """
+    年度热力图视图。单年模式显示 self.year 一年；多年模式把有事件的全部年份（至少包含今年）
+    从新到旧纵向排列，每年一屏，滚动浏览。每年的数据都只是一次 event_day_counts 的区间读取
+    """
+    YEAR_TITLE_HEIGHT = 30  # 多年模式下每年上方年份标题的高度
 
     Double_Clicked = Signal(QDate)
-    def __init__(self, year:int):
+    def __init__(self, year:int = None):
         super().__init__()
-        self.year = year
+        self.year = year if year is not None else QDate.currentDate().year()
+        self.multi_year = False
         self.view = QGraphicsView()
         self.view.setStyleSheet("""
         /* 垂直滚动条 */
@@ -228,6 +302,30 @@ class YearHeatMapView(QWidget):
             }
         """)
 
+        # 单年/多年模式切换
+        self.mode_btn = QPushButton("全部年份")
+        self.mode_btn.setCheckable(True)
+        self.mode_btn.setFixedHeight(30)
+        self.mode_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #f0f0f0;
+                border-radius: 15px;
+                color: #333;
+                padding: 0px 12px;
+                border: none;
+            }
+            QPushButton:hover {
+                background-color: #e0e0e0;
+                color: #0078d7;
+            }
+            QPushButton:checked {
+                background-color: #0078d7;
+                color: white;
+            }
+        """)
+        self.mode_btn.setCursor(Qt.PointingHandCursor)
+        self.mode_btn.toggled.connect(self.set_multi_year)
+
         nav_layout = QHBoxLayout()
         nav_layout.setContentsMargins(10, 5, 10, 5)
         nav_layout.setSpacing(15)  # 增加按钮和标签之间的间距
@@ -235,6 +333,7 @@ class YearHeatMapView(QWidget):
         nav_layout.addStretch()
         nav_layout.addWidget(self.year_label)
         nav_layout.addStretch()
+        nav_layout.addWidget(self.mode_btn)
         nav_layout.addWidget(self.next_btn)
 
         # === 总体布局 ===
@@ -243,32 +342,78 @@ class YearHeatMapView(QWidget):
         main_layout.addWidget(self.view)
         self.setLayout(main_layout)
 
+        # 每个显示的年份一个整年热力图图元，切换年份或缩放时复用，不重建
+        self.heat_map_items: list[YearHeatMapItem] = [YearHeatMapItem(self)]
+        self.year_title_items: list[QGraphicsSimpleTextItem] = []
+        self.scene.addItem(self.heat_map_items[0])
+
         self.data = {}
         self.get_data()
         self.build_scene()
 
-    def refresh(self,year:int):
-        self.year = year
+    def refresh(self, year:int = None):
+        if year is not None:
+            self.year = year
         self.data = {}
         self.get_data()
         self.build_scene()
+        self.scroll_to_year(self.year)
+
+    def set_multi_year(self, enabled: bool):
+        """切换单年/多年模式"""
+        if enabled == self.multi_year:
+            return
+        self.multi_year = enabled
+        if self.mode_btn.isChecked() != enabled:
+            self.mode_btn.setChecked(enabled)
+        self.refresh()
+
+    def displayed_years(self) -> list[int]:
+        """当前模式下要显示的年份，多年模式从新到旧排列"""
+        if not self.multi_year:
+            return [self.year]
+        first_year = last_year = QDate.currentDate().year()
+        year_range = EventSQLManager.get_event_year_range()
+        if year_range is not None:
+            first_year = min(first_year, year_range[0])
+            last_year = max(last_year, year_range[1])
+        first_year = min(first_year, self.year)
+        last_year = max(last_year, self.year)
+        return list(range(last_year, first_year - 1, -1))
 
     def get_data(self):
-        tmp_data:list[BaseEvent] = []
-        self.data.clear()
-        for i in range(1,13):
-            tmp_data.extend(EventSQLManager.get_events_in_month(self.year,i))
-        for event in tmp_data:
-            self.data.setdefault(event.datetime[:10],0) 
-            self.data[event.datetime[:10]] += 1
+        # 每日事件数直接读取数据库中增量维护的计数表，每年一次区间读取
+        years = self.displayed_years()
+        while len(self.heat_map_items) < len(years):
+            item = YearHeatMapItem(self)
+            self.scene.addItem(item)
+            self.heat_map_items.append(item)
+        while len(self.heat_map_items) > len(years):
+            self.scene.removeItem(self.heat_map_items.pop())
+        for item, year in zip(self.heat_map_items, years):
+            counts = EventSQLManager.count_events_per_day(year)
+            item.set_year(year, counts)
+            if year == self.year:
+                self.data.clear()
+                self.data.update(counts)
+        if self.multi_year:
+            self.year_label.setText(f"{years[-1]} - {years[0]}")
+        else:
+            self.year_label.setText(str(self.year))
+
+    def scroll_to_year(self, year: int):
+        """多年模式下滚动到指定年份"""
+        for item in self.heat_map_items:
+            if item.year == year:
+                self.view.ensureVisible(item.sceneBoundingRect().adjusted(0, -self.YEAR_TITLE_HEIGHT, 0, 0), 0, 0)
+                return
 
     def resizeEvent(self, event):
         super().resizeEvent(event)
         self.build_scene()
 
     def build_scene(self):
-        self.scene.clear()
-
+        """按视图大小计算日期格尺寸并重新排布热力图"""
         total_columns = 4
         total_rows = 3
         view_width = self.view.viewport().width()
@@ -284,28 +429,39 @@ class YearHeatMapView(QWidget):
         # 计算 cell_size（按列/行最小值）
         cell_width = month_block_width / 7
         cell_height = (month_block_height - 20) / 6  # 20: 预留标题高度
-        cell_size = min(cell_width, cell_height)
-
-        for i in range(12):
-            row = i // 4
-            col = i % 4
-            month = i + 1
-
-            block = MonthBlock(self.year, month, self.data,cell_size=cell_size,spacing=2)
-            block.DoubleClicked.connect(self.Double_Clicked)
-            x = col * (cell_size * 7 + spacing)
-            y = row * (cell_size * 6 + 20 + spacing)
-            block.setPos(x, y)
-            self.scene.addItem(block)
-
-        self.scene.setSceneRect(self.scene.itemsBoundingRect())
+        cell_size = max(1.0, min(cell_width, cell_height))
+
+        # 多年模式每年一屏，为年份标题留出高度
+        title_height = self.YEAR_TITLE_HEIGHT if self.multi_year else 0
+        if self.multi_year:
+            cell_height = (month_block_height - 20 - title_height / total_rows) / 6
+            cell_size = max(1.0, min(cell_width, cell_height))
+
+        while len(self.year_title_items) < len(self.heat_map_items):
+            title = QGraphicsSimpleTextItem()
+            font = QApplication.font()
+            font.setPointSize(14)
+            font.setBold(True)
+            title.setFont(font)
+            self.scene.addItem(title)
+            self.year_title_items.append(title)
+        for title in self.year_title_items:
+            title.setVisible(False)
+
+        top = 0.0
+        for item, title in zip(self.heat_map_items, self.year_title_items):
+            item.set_layout(cell_size, spacing)
+            if self.multi_year:
+                title.setText(str(item.year))
+                title.setBrush(QApplication.palette().color(QPalette.WindowText))
+                title.setPos(0, top)
+                title.setVisible(True)
+            item.setPos(0, top + title_height)
+            top += title_height + item.boundingRect().height() + spacing
+        self.scene.setSceneRect(QRectF(0, 0, self.heat_map_items[0].boundingRect().width(), top - spacing))
 
     def goto_prev_year(self):
-        self.year -= 1
-        self.year_label.setText(str(self.year))
-        self.refresh(self.year)
+        self.refresh(self.year - 1)
 
     def goto_next_year(self):
-        self.year += 1
-        self.year_label.setText(str(self.year))
-        self.refresh(self.year)
\ No newline at end of file
+        self.refresh(self.year + 1)
@@ -79,10 +79,9 @@ class MainWindow(QMainWindow):
 		self.setup_create_event_window()  # 日程填写窗口
 		self.setup_upcoming_window()  # 日程展示窗口
 		self.setup_week_view_window() # 周视图窗口
-		self.setup_week_view_window() # 周视图窗口
 		self.setup_heatmap_window() # 热力图窗口
 		self.setup_aichat_window() # ai助手窗口
-		Emitter.instance().delete_activity_event_signal.connect(self.week_view.update_view_geometry)
+		Emitter.instance().delete_activity_event_signal.connect(self.week_view.reload_schedules)
 		self.navigate_to("Calendar", self.main_stack)
 		# 初始化通知系统
 		self.notice_system = Notice()
@@ -378,6 +377,7 @@ class MainWindow(QMainWindow):
 		self.week_view.schedule_area_clicked.connect(lambda info: self.navigate_to("Schedule", self.main_stack, None, ("from_weekview_add",info)))
 		self.week_view.schedule_del_btn_clicked.connect(lambda event: Emitter.instance().send_delete_event_signal(event.id, event.table_name()))
 		self.week_view.schedule_double_clicked.connect(lambda event: self.check_one_schedule((event,)))
+		self.week_view.schedule_cluster_double_clicked.connect(self.check_schedule_in_cluster)
 
 	def setup_heatmap_window(self):
 		self.heatmap_window = QWidget()
@@ -444,7 +444,7 @@ class MainWindow(QMainWindow):
 		btn_layout.addWidget(sidebar_btn, alignment=Qt.AlignmentFlag.AlignLeft)
 		btn_layout.addWidget(return_btn, alignment=Qt.AlignmentFlag.AlignRight)
 		# 加入热力图
-		self.heatmap_view = YearHeatMapView(year=2025)	# 这里年份暂时这样处理
+		self.heatmap_view = YearHeatMapView(year=QDate.currentDate().year())
 		self.heatmap_view.Double_Clicked.connect(
     		lambda date: self.navigate_to("Upcoming", self.main_stack, date))
 		heatmap_layout.addWidget(self.heatmap_view)
@@ -714,7 +714,7 @@ class MainWindow(QMainWindow):
 			elif name == "Weekview":
 				self.week_view.load_schedules()
 			elif name == "HeatMap":
-				self.heatmap_view.refresh(year=2025)
+				self.heatmap_view.refresh()
 			elif name == "AIChat":
 				pass
 			stack.setCurrentIndex(self.main_stack_map[name])
@@ -722,6 +722,17 @@ class MainWindow(QMainWindow):
 		else:
 			raise RuntimeError(f"错误：未知页面 {name}")
 
+	def check_schedule_in_cluster(self, events: tuple):
+		"""周视图 +N 汇总块被双击：弹出组内全部日程供选择，选中后跳转到其编辑界面"""
+		if len(events) == 1:
+			self.check_one_schedule(events)
+			return
+		menu = QMenu(self)
+		for event in events:
+			action = menu.addAction(f"{event.title} {event.start_time}-{event.end_time}")
+			action.triggered.connect(lambda checked=False, event=event: self.check_one_schedule((event,)))
+		menu.exec(QCursor.pos())
+
 	def check_one_schedule(self, data: tuple):
 		"""跳转到指定天的日程编辑界面"""
 		event: BaseEvent = data[0]
@@ -778,7 +789,8 @@ class MainWindow(QMainWindow):
 
 	def get_search_result(self):
 		"""向后端发送搜索内容"""
-		text = self.search_edit.text().split()
+		# 空格分隔多个关键词，双引号括起的部分作为一个短语
+		text = [phrase or word for phrase, word in re.findall(r'"([^"]+)"|(\S+)', self.search_edit.text())]
 		if len(text) > 0:
 			self.search_column.load_searched_data(tuple(text))
 			self.search_edit.clear()
@@ -15,11 +15,56 @@ def get_month_range(year: int, month: int):
 	end_date = start_date.addDays(41)  # 到最后补齐42个格
 	return start_date, end_date
 
+class CalendarDayStyle:
+	"""
+	日期格绘制所需的主题颜色、字体和字体度量。按格子高度与视图字体预先计算一次，所有格子共享，
+	避免在每次 paint 中查询调色板和构造字体
+	"""
+	MAX_EVENTS_TO_SHOW = 3  # 每格最多显示的事件数
+	EVENT_COLORS = (QColor(225, 160, 125), QColor(230, 205, 145), QColor(140, 175, 195), QColor(150, 165, 135))  # 循环颜色
+
+	def __init__(self, cell_height: float, base_font: QFont):
+		palette = QApplication.palette()  # 获取主题
+		self.background_color = palette.color(QPalette.Base)  # 背景色（适配主题）
+		self.btn_color = palette.color(QPalette.Button)  # 按钮背景色
+		self.light_color = palette.color(QPalette.Highlight)
+		self.text_color = palette.color(QPalette.Text)
+		self.mid_color = palette.color(QPalette.Mid)
+		self.today_color = QColor("#1E90FF")
+		self.background_brush = QBrush(self.background_color)
+		self.btn_brush = QBrush(self.btn_color)
+		self.light_brush = QBrush(self.light_color)
+		self.border_pen = QPen(self.mid_color)  # 边框颜色
+		self.text_pen = QPen(self.text_color)
+		self.event_brushes = tuple(QBrush(color) for color in self.EVENT_COLORS)
+
+		self.day_font = QFont(base_font)
+		# 每月1号：月份字体较大，日期字体较小
+		self.month_font = QFont(base_font)
+		self.month_font.setPointSizeF(base_font.pointSizeF() * 1.4)
+		self.month_font.setBold(True)
+		self.first_day_font = QFont(self.month_font)
+		self.first_day_font.setPointSizeF(self.month_font.pointSizeF() * 0.7)
+		self.first_day_font.setBold(False)
+		self.month_metrics = QFontMetrics(self.month_font)
+		self.first_day_metrics = QFontMetrics(self.first_day_font)
+
+		# 根据格子高度动态调整字体大小
+		self.event_font = QFont(base_font)
+		self.event_font.setPointSize(max(6, min(12, int(cell_height * 0.13))))
+		self.event_metrics = QFontMetrics(self.event_font)
+		self.line_height = self.event_metrics.lineSpacing()
+		self.more_font = QFont(self.event_font)
+		self.more_font.setPointSize(self.event_font.pointSize() - 1)
+		self.more_font.setItalic(True)
+
+
 class CalendarDayItem(QObject, QGraphicsRectItem):
 	"""
 	单元格
 	"""
 	clicked = Signal(QDate)
+	select_clicked = Signal(QDate, bool)  # 左键单击：(日期, 是否按住Shift)
 	right_clicked = Signal(QDate, QPoint)
 	double_clicked = Signal(QDate)
 
@@ -34,6 +79,67 @@ class CalendarDayItem(QObject, QGraphicsRectItem):
 		self._hovering = False
 		self._selected = False
 		self.event: list[BaseEvent] = events
+		self.day_style: CalendarDayStyle = None  # 由 CalendarView 在布局时统一设置
+		self._text_cache = None  # 省略后的标题与1号的文字位置，见 layout_text
+		self._text_cache_key = None
+		# 格子内容缓存为像素图，悬浮或选中只重绘当前格子
+		self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
+
+	def bind(self, date: QDate, is_current_month: bool, is_today: bool, events: list[BaseEvent]):
+		"""
+		复用单元格：翻页时重新绑定日期与事件，而不是销毁重建
+		"""
+		self.date = date
+		self.is_current_month = is_current_month
+		self.is_today = is_today
+		self.event = events
+		self._selected = False
+		self._text_cache = None
+		self.update()
+
+	def set_selected(self, selected: bool):
+		if self._selected != selected:
+			self._selected = selected
+			self.update()
+
+	def set_style(self, style: CalendarDayStyle):
+		self.day_style = style
+		self._text_cache = None
+		self.update()
+
+	def layout_text(self) -> dict:
+		"""
+		计算并缓存本格的文字布局（省略后的事件标题、1号的月份与日期位置），
+		只有日期、事件、尺寸或样式变化后才重新计算
+		"""
+		style = self.day_style
+		rect = self.rect()
+		key = (style, rect.width(), rect.height())
+		if self._text_cache is not None and self._text_cache_key == key:
+			return self._text_cache
+		cache = {}
+		if self.date.day() == 1:
+			month_text = f"{self.date.month()}月"
+			month_width = style.month_metrics.horizontalAdvance(month_text)
+			day_width = style.first_day_metrics.horizontalAdvance("1")
+			# 使日号“1”居中
+			x_day = (rect.width() - day_width) / 2
+			# 水平对齐基准线
+			y_base = 6 + max(style.month_metrics.ascent(), style.first_day_metrics.ascent())
+			cache["month_text"] = month_text
+			cache["month_pos"] = QPointF(x_day - month_width - 4, y_base)
+			cache["day_pos"] = QPointF(x_day, y_base)
+		cache["day_text"] = str(self.date.day())
+		event_width = int(rect.width() - 8)
+		cache["titles"] = [
+			" " + style.event_metrics.elidedText(event.title, Qt.ElideRight, event_width)  # 左侧加空格留边距
+			for event in self.event[:style.MAX_EVENTS_TO_SHOW]
+		]
+		event_count = len(self.event)
+		cache["more_text"] = f"更多 ({event_count - style.MAX_EVENTS_TO_SHOW})..." if event_count > style.MAX_EVENTS_TO_SHOW else None
+		self._text_cache = cache
+		self._text_cache_key = key
+		return cache
 
 	def hoverEnterEvent(self, event):
 		self._hovering = True
@@ -55,19 +161,10 @@ class CalendarDayItem(QObject, QGraphicsRectItem):
 
 	def mouseReleaseEvent(self, event):
 		if event.button() == Qt.LeftButton and getattr(self, "_pressed_inside", False) and self.contains(event.pos()):
-			view = self.scene().views()[0]
-		modifiers = QApplication.keyboardModifiers()
-		shift_pressed = modifiers & Qt.ShiftModifier
-
-		if not shift_pressed:
-			# 不按Shift，清除其他选中，只选中当前
-			if hasattr(view, "clear_selection"):
-				view.clear_selection()
-			self._selected = True
-		else:
-			# 按住Shift，切换当前选中状态
-			self._selected = not self._selected
-		self.update()
+			# 选中状态由 CalendarView 统一管理
+			shift_pressed = bool(QApplication.keyboardModifiers() & Qt.ShiftModifier)
+			self.select_clicked.emit(self.date, shift_pressed)
+		super().mouseReleaseEvent(event)
 
 	def contextMenuEvent(self, event):
 		global_pos = event.screenPos()
@@ -75,122 +172,55 @@ class CalendarDayItem(QObject, QGraphicsRectItem):
 		log.info("用户点击右键，弹出菜单")
 
 	def paint(self, painter, option, widget=None):
-		palette = QApplication.palette()  # 获取主题
-		# 根据主题设置颜色
-		background_color = palette.color(QPalette.Base)  # 背景色（适配主题）
-		btn_color = palette.color(QPalette.Button)  # 按钮背景色
-		light_color = palette.color(QPalette.Highlight)
-		if self._selected:  # 选中
-			painter.setBrush(QBrush(light_color))
-		elif self._hovering:  # 悬浮
-			painter.setBrush(QBrush(light_color))
+		style = self.day_style
+		if style is None:
+			return
+		text = self.layout_text()
+		rect = self.rect()
+		if self._selected or self._hovering:  # 选中或悬浮
+			painter.setBrush(style.light_brush)
 		else:
-			painter.setBrush(QBrush(background_color) if self.is_current_month else QBrush(btn_color))
-
-		text_color = palette.color(QPalette.Text)
-		mid_color = palette.color(QPalette.Mid)
-		painter.setPen(QPen(mid_color))  # 边框颜色
-		painter.drawRect(self.rect())
-		painter.setPen(QColor("#1E90FF") if self.is_today else QPen(text_color))  # 日期的颜色
-		if self.date.day() == 1:
-			rect = self.rect()
-			# 月份字体较大
-			font_month = painter.font()
-			font_month.setPointSizeF(font_month.pointSizeF() * 1.4)
-			font_month.setBold(True)
-			month_text = f"{self.date.month()}月"
-			painter.setFont(font_month)
-			month_metrics = QFontMetrics(font_month)
-			month_width = month_metrics.horizontalAdvance(month_text)
-			# 日期字体较小
-			font_day = painter.font()
-			font_day.setPointSizeF(font_day.pointSizeF() * 0.7)
-			font_day.setBold(False)
-			painter.setFont(font_day)
-			day_text = "1"
-			day_metrics = QFontMetrics(font_day)
-			day_width = day_metrics.horizontalAdvance(day_text)
-			# 使日号“1”居中
-			x_day = rect.x() + (rect.width() - day_width) / 2
-			x_month = x_day - month_width - 4
-			# 水平对齐基准线
-			y_base_month = rect.y() + 6 + month_metrics.ascent()
-			y_base_day = rect.y() + 6 + day_metrics.ascent()
-			y_base = max(y_base_month, y_base_day)
-
-			painter.setFont(font_month)
-			painter.drawText(QPointF(x_month, y_base), month_text)
-			painter.setFont(font_day)
-			painter.drawText(QPointF(x_day, y_base), day_text)
+			painter.setBrush(style.background_brush if self.is_current_month else style.btn_brush)
+		painter.setPen(style.border_pen)
+		painter.drawRect(rect)
+		painter.setPen(style.today_color if self.is_today else style.text_pen)  # 日期的颜色
+		if "month_text" in text:
+			painter.setFont(style.month_font)
+			painter.drawText(rect.topLeft() + text["month_pos"], text["month_text"])
+			painter.setFont(style.first_day_font)
+			painter.drawText(rect.topLeft() + text["day_pos"], text["day_text"])
 		else:
-			text = str(self.date.day())
-			rect = self.rect().adjusted(0, 10, 0, 0)  # 顶部留一定间距以求美观
-			painter.drawText(rect, Qt.AlignHCenter | Qt.AlignTop, text)
+			painter.setFont(style.day_font)
+			painter.drawText(rect.adjusted(0, 10, 0, 0), Qt.AlignHCenter | Qt.AlignTop, text["day_text"])  # 顶部留一定间距以求美观
 
 		# 绘制事件列表，最多3条
-		max_events_to_show = 3
-		event_area_rect = self.rect().adjusted(4, 24, -4, -4)
-
-		# 根据格子高度动态调整字体大小
-		cell_height = self.rect().height()
-		dynamic_font_size = max(6, min(12, int(cell_height * 0.13)))
-
-		font = painter.font()
-		font.setPointSize(dynamic_font_size)
-		painter.setFont(font)
-
-		font_metrics = QFontMetrics(font)
-		line_height = font_metrics.lineSpacing()
-
-		x = event_area_rect.left()
-		y = event_area_rect.top() + line_height
-
-		bg_colors = (QColor(225, 160, 125), QColor(230, 205, 145), QColor(140, 175, 195), QColor(150, 165, 135))  # 循环颜色
-
-		for i, event in enumerate(self.event[:max_events_to_show]):
+		event_area_rect = rect.adjusted(4, 24, -4, -4)
+		line_height = style.line_height
+		painter.setFont(style.event_font)
+		for i, title in enumerate(text["titles"]):
 			# 计算当前日程条目的背景矩形区域
-			bg_rect = QRectF(
-				event_area_rect.left(),
-				event_area_rect.top() + i * line_height,
-				event_area_rect.width(),
-				line_height
-			)
-
+			bg_rect = QRectF(event_area_rect.left(), event_area_rect.top() + i * line_height, event_area_rect.width(), line_height)
 			# 绘制圆角背景矩形
 			painter.setPen(Qt.NoPen)  # 无边框
-			painter.setBrush(QBrush(bg_colors[i % 3]))
+			painter.setBrush(style.event_brushes[i % 3])
 			painter.drawRoundedRect(bg_rect, 4, 4)  # 4px圆角
+			painter.setPen(style.text_pen)
+			painter.drawText(bg_rect, Qt.AlignLeft | Qt.AlignVCenter, title)
 
-			# 绘制文字
-			painter.setPen(QPen(text_color))
-			elided_text = font_metrics.elidedText(event.title, Qt.ElideRight, int(event_area_rect.width()))
-			painter.drawText(bg_rect, Qt.AlignLeft | Qt.AlignVCenter, " " + elided_text)  # 左侧加空格留边距
-
-		event_count = len(self.event)
 		# 超过三条显示更多
-		metrics = QFontMetrics(font)
-		line_h = metrics.lineSpacing()
-		if event_count > max_events_to_show:
-			# 计算背景矩形区域
+		if text["more_text"] is not None:
 			bg_rect = QRectF(
 				event_area_rect.left(),
-				event_area_rect.top() + max_events_to_show * line_h,
+				event_area_rect.top() + style.MAX_EVENTS_TO_SHOW * line_height,
 				event_area_rect.width(),
-				line_h
+				line_height
 			)
-
 			painter.setPen(Qt.NoPen)
-			painter.setBrush(QBrush(bg_colors[3]))  # 绿色
+			painter.setBrush(style.event_brushes[3])  # 绿色
 			painter.drawRoundedRect(bg_rect, 4, 4)
-
-			more_font = QFont(font)
-			more_font.setPointSize(font.pointSize() - 1)
-			more_font.setItalic(True)
-			painter.setFont(more_font)
-			painter.setPen(QPen(text_color))  # "更多"的颜色
-
-			text = f"更多 ({event_count - max_events_to_show})..."
-			painter.drawText(bg_rect, Qt.AlignRight | Qt.AlignVCenter, text)
+			painter.setFont(style.more_font)
+			painter.setPen(style.text_pen)  # "更多"的颜色
+			painter.drawText(bg_rect, Qt.AlignRight | Qt.AlignVCenter, text["more_text"])
 
 
 class CalendarView(QWidget):
@@ -199,11 +229,21 @@ class CalendarView(QWidget):
 	"""
 	double_clicked = Signal(QDate)
 	view_single_day = Signal(QDate)
+	MONTH_CACHE_SIZE = 12  # 最多缓存的月份数
 
 	def __init__(self):
 		super().__init__()
 		# 日程信息
 		self.schedules = defaultdict(list)
+		# 按 (年, 月) 缓存已加载的日程（LRU），翻页时直接从内存重绘；任何事件变化都会清空缓存
+		self.month_cache: OrderedDict[tuple[int, int], defaultdict] = OrderedDict()
+		self.prefetch_requests: dict[tuple[int, int], int] = {}  # 正在后台预取的月份 -> 请求id
+		# 空闲时预取前后相邻的月份
+		self.prefetch_timer = QTimer(self)
+		self.prefetch_timer.setSingleShot(True)
+		self.prefetch_timer.setInterval(0)
+		self.prefetch_timer.timeout.connect(self.prefetch_adjacent_months)
+		Emitter.instance().events_changed_signal.connect(self.invalidate_month_cache)
 		# 绑定快捷键
 		self.setFocusPolicy(Qt.StrongFocus)
 		QShortcut(QKeySequence(Qt.Key_Left), self, self.go_to_prev_month)
@@ -263,24 +303,43 @@ class CalendarView(QWidget):
 		self.view.setRenderHints(self.view.renderHints() | QPainter.Antialiasing)
 		self.view.setTransformationAnchor(QGraphicsView.AnchorUnderMouse)
 		self.view.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-		self.view.clear_selection = self.clear_selection
 		self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
 		self.view.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
 		self.view.setVerticalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
-		self.view.setViewportUpdateMode(QGraphicsView.FullViewportUpdate)
+		# 只重绘发生变化的区域（悬浮、选中的格子）
+		self.view.setViewportUpdateMode(QGraphicsView.MinimalViewportUpdate)
 		layout.addWidget(self.view)
 
+		# 固定的周几栏与 6x7 日期格，只创建一次，翻页时重新绑定，缩放时重新布局
+		self.weekday_items: list[QGraphicsRectItem] = []
+		self.weekday_text_items: list[QGraphicsSimpleTextItem] = []
+		self.day_items: list[CalendarDayItem] = []
+		self.date_items: dict[QDate, CalendarDayItem] = {}  # 当前页日期 -> 日期格
+		self.selected_items: set[CalendarDayItem] = set()  # 当前选中的日期格
+		self.build_grid()
+		# 合并连续的 resize，同一轮拖动只重新布局一次
+		self.layout_size = QSize()
+		self.relayout_timer = QTimer(self)
+		self.relayout_timer.setSingleShot(True)
+		self.relayout_timer.setInterval(16)
+		self.relayout_timer.timeout.connect(self._delayed_draw)
+
 		self.current_year = QDate.currentDate().year()
 		self.current_month = QDate.currentDate().month()
 		self.update_title()
 		self.handle_page_changed(self.current_year, self.current_month)
+		self.draw_month(self.current_year, self.current_month)
 
 	# 控制draw_month出发时间，避免第一次初始化时候在resize前draw
 	def showEvent(self, event):
 		super().showEvent(event)
-		QTimer.singleShot(0, self._delayed_draw)
+		self.relayout_timer.start()
 
 	def _delayed_draw(self):
+		# 视口尺寸没有变化时无需重新布局
+		if self.view.viewport().size() == self.layout_size:
+			return
+		self.layout_size = self.view.viewport().size()
 
 		# 更新标题字体
 		base_width = 700
@@ -309,10 +368,7 @@ class CalendarView(QWidget):
 		day_width = w / 7
 		weekday_height = 30  # 固定周几栏高度
 		day_height = (h - weekday_height) / 6  # 剩余高度分给日期		
-		total_cols = 7
-		total_rows = 6
-		self.scene.setSceneRect(0, 0, total_cols * day_width, weekday_height + total_rows * day_height)
-		self.draw_month(self.current_year, self.current_month)
+		self.layout_grid(day_width, day_height, weekday_height)
 		self.view.resetTransform()
 
 	def update_title(self):
@@ -320,76 +376,97 @@ class CalendarView(QWidget):
 
 	def resizeEvent(self, event):
 		super().resizeEvent(event)
-		QTimer.singleShot(0, self._delayed_draw)	
-
-		print("sceneRect:", self.scene.sceneRect())
-		print("viewport size:", self.view.viewport().size())
-		bound = self.scene.itemsBoundingRect()
-		print("itemsBoundingRect:", bound)
+		self.relayout_timer.start()
 
-	def clear_selection(self):
-		for item in self.scene.items():
-			if isinstance(item, CalendarDayItem):
-				item._selected = False
-				item.update()
-
-	def draw_month(self, year, month, day_width=None, day_height=None):
-		self.scene.clear()
-		start_date, end_date = get_month_range(year, month)
-
-		if day_width is None:
-			day_width = self.view.width() / 7
-		if day_height is None:
-			day_height = self.view.height() / 6
-		# 添加周几栏（固定在顶部）
+	def build_grid(self):
+		"""
+		创建周几栏和42个日期格，连接信号，整个生命周期只执行一次
+		"""
 		weekday_names = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
-		weekday_height = 30  # 周几栏高度
+		palette = QApplication.palette()
+		background_color = palette.color(QPalette.Button)  # 背景色（适配主题）
+		text_color = palette.color(QPalette.Text)
 		for col in range(7):
-			palette = QApplication.palette()
-			background_color = palette.color(QPalette.Button)  # 背景色（适配主题）
-			text_color = palette.color(QPalette.Text)
-			rect = QRectF(col * day_width, 0, day_width, weekday_height)
-			weekday_item = QGraphicsRectItem(rect)
+			weekday_item = QGraphicsRectItem()
 			weekday_item.setBrush(QBrush(background_color))  # 浅灰色背景
 			weekday_item.setPen(QPen(Qt.NoPen))
 			self.scene.addItem(weekday_item)
-
 			# 添加周几文本
 			text_item = QGraphicsSimpleTextItem(weekday_names[col], weekday_item)
 			text_item.setFont(QFont("Microsoft YaHei", 10, QFont.Bold))
 			text_item.setBrush(QBrush(text_color))  # 深灰色文字
+			self.weekday_items.append(weekday_item)
+			self.weekday_text_items.append(text_item)
+
+		today = QDate.currentDate()
+		for _ in range(42):
+			item = CalendarDayItem(rect=QRectF(), date=today, is_current_month=False, is_today=False, events=[])
+			# item.clicked.connect(self.date_clicked.emit)
+			item.select_clicked.connect(self.handle_select_click)
+			item.right_clicked.connect(self.handle_right_click)
+			item.double_clicked.connect(self.double_clicked.emit)
+			self.scene.addItem(item)
+			self.day_items.append(item)
+		self.apply_day_style(0)
+
+	def layout_grid(self, day_width: float, day_height: float, weekday_height: float = 30):
+		"""
+		按新的格子尺寸摆放已有的图元，不创建也不删除任何图元
+		"""
+		for col, (weekday_item, text_item) in enumerate(zip(self.weekday_items, self.weekday_text_items)):
+			rect = QRectF(col * day_width, 0, day_width, weekday_height)
+			weekday_item.setRect(rect)
 			# 文本居中
 			text_width = text_item.boundingRect().width()
 			text_item.setPos(rect.x() + (rect.width() - text_width) / 2, rect.y() + 5)
-		col = 0
-		row = 0
-		today = QDate.currentDate()
+		for index, item in enumerate(self.day_items):
+			row, col = divmod(index, 7)
+			item.setRect(QRectF(col * day_width, weekday_height + row * day_height, day_width, day_height))
+		self.scene.setSceneRect(0, 0, 7 * day_width, weekday_height + 6 * day_height)
+		self.apply_day_style(day_height)
 
-		current = QDate(start_date)
-		while current < end_date.addDays(1):
-			rect = QRectF(col * day_width, weekday_height + row * day_height, day_width, day_height)
-			item = CalendarDayItem(
-				rect=rect,
+	def apply_day_style(self, day_height: float):
+		"""
+		按格子高度重新计算共享的绘制样式并下发给所有日期格
+		"""
+		self.day_height = day_height
+		style = CalendarDayStyle(day_height, self.view.font())
+		for item in self.day_items:
+			item.set_style(style)
+
+	def apply_theme(self):
+		"""
+		系统主题变化后更新周几栏与日期格的颜色
+		"""
+		palette = QApplication.palette()
+		for weekday_item, text_item in zip(self.weekday_items, self.weekday_text_items):
+			weekday_item.setBrush(QBrush(palette.color(QPalette.Button)))
+			text_item.setBrush(QBrush(palette.color(QPalette.Text)))
+		self.apply_day_style(self.day_height)
+
+	def changeEvent(self, event):
+		super().changeEvent(event)
+		if event.type() == QEvent.PaletteChange and getattr(self, "day_items", None):
+			self.apply_theme()
+
+	def draw_month(self, year, month):
+		"""
+		将42个日期格重新绑定到指定月份的日期与事件
+		"""
+		start_date, _ = get_month_range(year, month)
+		today = QDate.currentDate()
+		# 重新绑定会清除格子的选中状态
+		self.selected_items.clear()
+		self.date_items.clear()
+		for offset, item in enumerate(self.day_items):
+			current = start_date.addDays(offset)
+			item.bind(
 				date=current,
 				is_current_month=(current.month() == month),
 				is_today=(current == today),
 				events=self.schedules[current]
 			)
-			# item.clicked.connect(self.date_clicked.emit)
-			item.right_clicked.connect(self.handle_right_click)
-			item.double_clicked.connect(self.double_clicked.emit)
-			self.scene.addItem(item)
-			col += 1
-			if col == 7:
-				col = 0
-				row += 1
-			current = current.addDays(1)
-
-		total_cols = 7
-		total_rows = 7
-		# self.scene.setSceneRect(0, 0, total_cols * day_width, total_rows * day_height)
-		self.scene.setSceneRect(0, 0, total_cols * day_width, weekday_height + (total_rows - 1) * day_height)
-
+			self.date_items[current] = item
 
 	def go_to_month(self, year: int, month: int):
 		self.current_year = year
@@ -429,46 +506,105 @@ class CalendarView(QWidget):
 		self.go_to_month(today.year(), today.month())
 
 	def clear_selection(self):
-		for item in self.scene.items():
-			if isinstance(item, CalendarDayItem):
-				item._selected = False
-				item.update()
+		for item in self.selected_items:
+			item.set_selected(False)
+		self.selected_items.clear()
+
+	def set_item_selected(self, item: CalendarDayItem, selected: bool):
+		item.set_selected(selected)
+		if selected:
+			self.selected_items.add(item)
+		else:
+			self.selected_items.discard(item)
+
+	def handle_select_click(self, date: QDate, shift_pressed: bool):
+		item = self.date_items.get(date)
+		if item is None:
+			return
+		if not shift_pressed:
+			# 不按Shift，清除其他选中，只选中当前
+			self.clear_selection()
+			self.set_item_selected(item, True)
+		else:
+			# 按住Shift，切换当前选中状态
+			self.set_item_selected(item, item not in self.selected_items)
 
 	def add_schedule(self, event: BaseEvent):
 		date = QDate.fromString(event.datetime.split(" ")[0], "yyyy-MM-dd")
 		self.schedules[date].append(event)
 
 	def handle_page_changed(self, year: int, month: int):
-		"""月份或年份变化时的回调"""
+		"""月份或年份变化时的回调，优先使用缓存，未命中时才同步查询"""
 		log.info(f"页面切换至: {year}年{month}月")
-		events = EventSQLManager.get_events_in_month(year, month)
-		if events is not None and len(events) > 0:
-			log.info(f"接收数据成功，共接收 {len(events)} 条数据：\n" +
-					"\n".join(f"- {event.title} @ {event.datetime}" for event in events))
-		self.schedules.clear()
+		key = (year, month)
+		if key in self.month_cache:
+			self.month_cache.move_to_end(key)
+		else:
+			events = EventSQLManager.get_events_in_month(year, month)
+			if events is not None and len(events) > 0:
+				log.info(f"接收数据成功，共接收 {len(events)} 条数据：\n" +
+						"\n".join(f"- {event.title} @ {event.datetime}" for event in events))
+			self.cache_month(key, events)
+		self.schedules = self.month_cache[key]
+		self.prefetch_timer.start()
+
+	@staticmethod
+	def adjacent_month(year: int, month: int, step: int) -> tuple[int, int]:
+		"""
+		获取相隔 step 个月的 (年, 月)
+		"""
+		index = year * 12 + month - 1 + step
+		return index // 12, index % 12 + 1
+
+	def cache_month(self, key: tuple[int, int], events: list[BaseEvent]):
+		"""
+		将某月的事件按日期分组后放入缓存，超过容量时淘汰最久未使用的月份
+		"""
+		schedules = defaultdict(list)
 		for event in events:
-			self.add_schedule(event)
+			schedules[QDate.fromString(event.datetime[:10], "yyyy-MM-dd")].append(event)
+		self.month_cache[key] = schedules
+		self.month_cache.move_to_end(key)
+		while len(self.month_cache) > self.MONTH_CACHE_SIZE:
+			self.month_cache.popitem(last=False)
+
+	def prefetch_adjacent_months(self):
+		"""
+		在后台数据库线程中预取上一月和下一月，结果到达后放入缓存
+		"""
+		for step in (1, -1):
+			key = self.adjacent_month(self.current_year, self.current_month, step)
+			if key in self.month_cache or key in self.prefetch_requests:
+				continue
+			self.prefetch_requests[key] = Emitter.instance().request_events_in_month_signal(
+				*key, lambda events, key=key: self.receive_prefetched_month(key, events))
+
+	def receive_prefetched_month(self, key: tuple[int, int], events: tuple[BaseEvent]):
+		self.prefetch_requests.pop(key, None)
+		if key not in self.month_cache:
+			self.cache_month(key, events)
+			log.info(f"预取{key[0]}年{key[1]}月日程完成，共 {len(events)} 条")
+
+	def invalidate_month_cache(self):
+		"""
+		事件被增删改后清空月份缓存，并丢弃尚未返回的预取结果（它们可能是修改前的数据）
+		"""
+		for request_id in self.prefetch_requests.values():
+			Emitter.instance().cancel_backend_request(request_id)
+		self.prefetch_requests.clear()
+		self.month_cache.clear()
 
 	def handle_right_click(self, date: QDate, pos: QPoint):
 		# 找出触发右键的单元格
-		clicked_item = None
-		for item in self.scene.items():
-			if isinstance(item, CalendarDayItem) and item.date == date:
-				clicked_item = item
-				break
+		clicked_item = self.date_items.get(date)
 
 		# 如果单元格未被选中，就单独选中它
-		if clicked_item and not clicked_item._selected:
+		if clicked_item is not None and clicked_item not in self.selected_items:
 			self.clear_selection()
-			clicked_item._selected = True
-			clicked_item.update()
+			self.set_item_selected(clicked_item, True)
 
 		# 收集当前所有选中项
-		selected_items = [
-			item for item in self.scene.items()
-			if isinstance(item, CalendarDayItem) and item._selected
-		]
-		selected_dates = [item.date for item in selected_items]
+		selected_dates = sorted(item.date for item in self.selected_items)
 
 		# 构造右键菜单
 		menu = QMenu()
@@ -487,31 +623,9 @@ class CalendarView(QWidget):
 		self.update_title()
 	
 	def delete_multiple_days(self,dates:list[QDate]):
-		for date in dates:
-			self.sent_delete_events_for_day(date)
-				
-	def sent_delete_events_for_day(self,date:QDate):
-		# 连接接收信号
-		Emitter.instance().backend_data_to_frontend_signal.connect(self.delete_events_for_day)
-		# 发送请求信号
-		Emitter.instance().request_update_specific_date_upcoming_event_signal(date)
-		# 断开接收信号连接
-		Emitter.instance().backend_data_to_frontend_signal.disconnect(self.delete_events_for_day)
-	
-	def delete_events_for_day(self,events:tuple[BaseEvent]):
-		for event in events:
-			self.delete_one_item(event)
+		# 所有日期在后端一次删除，之后只刷新一次
+		Emitter.instance().send_delete_events_in_dates_signal(dates)
 		self.refresh()
 
-	def delete_one_item(self, event: BaseEvent):
-		"""
-		删除事件
-		"""
-		if isinstance(event, ActivityEvent) and event.datetime is None:
-			event.datetime = event.start_date + " " + event.start_time
-			log.info(f"删除ActivityEvent：{event.title} event.datetime:{event.datetime}")
-		elif isinstance(event, ActivityEvent):
-			log.info(f"删除ActivityEvent：{event.title} event.datetime:{event.datetime}")
-		date = event.datetime[:10]
-		log.info(f"删除date = {date}")
-		Emitter.instance().send_delete_event_signal(event.id, event.table_name())
\ No newline at end of file
+	def sent_delete_events_for_day(self,date:QDate):
+		self.delete_multiple_days([date])
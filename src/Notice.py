@@ -2,6 +2,7 @@ import sys
 import os
 from src.common import *
 from src.events.Event import *
+import heapq
 
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
 SRC_DIR = os.path.join(BASE_DIR, "src")
@@ -19,77 +20,109 @@ def resource_path(relative_path):
 	return os.path.abspath(relative_path)
 
 class Notice(QObject):
+	"""
+	提醒调度器：用最小堆保存全部未到期提醒的 (advance_time, id)，只为最近一次提醒设置单次定时器，
+	两次提醒之间不做任何轮询。同一时刻到期的提醒合并为一批发出
+	"""
 	notify_to_floating_window = Signal(object)  # 向悬浮窗发送通知信号(标题，内容，颜色代码)
 	notify_to_tray = Signal(object)  # 向托盘发送通知信号(标题，内容，颜色代码)
 	notify_show_floating_window = Signal()
 	notify_to_backend = Signal()
 
+	MAX_TIMER_INTERVAL = 3600 * 1000  # 定时器最长间隔（毫秒），超过则中途醒来重新计算，避免系统休眠等造成的漂移
+
 	def __init__(self):
 		super().__init__()
-		self.scheduled_notices = []  # 存储计划通知
-		self.if_backend_exist_event = True
-		self.latest_event: DDLEvent = None
+		self.reminder_heap: list[tuple[str, int]] = []  # (advance_time, id) 最小堆，允许残留已失效的项
+		self.reminders: dict[int, DDLEvent] = {}  # id -> 尚未提醒的事件，堆中的项只有与此处一致时才有效
+		self.latest_event: DDLEvent = None  # 下一条将要提醒的事件，显示在悬浮窗上
 		self.timer = QTimer()
+		self.timer.setSingleShot(True)
+		# 默认的 CoarseTimer 允许约 5% 的误差，1小时的间隔可能晚约3分钟，提醒需要准时
+		self.timer.setTimerType(Qt.PreciseTimer)
 		self.timer.timeout.connect(self.check_notice)
-		self.timer.start(1000)  # 每秒检查一次
-		Emitter.instance().notice_signal.connect(self.update_latest_event)
+		Emitter.instance().notice_signal.connect(self.update_reminders)
+		self.request_pending_reminders(QDateTime.currentDateTime())
+
+	@staticmethod
+	def now_str() -> str:
+		return QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm")
 
 	def check_notice(self):
-		if not self.if_backend_exist_event:
-		# 	"""如果后端没有存储任何事件，不进行提醒"""
+		"""定时器到期：取出所有已到提醒时间的事件，一次性发出"""
+		now = self.now_str()
+		due_events = []
+		while self.reminder_heap and self.reminder_heap[0][0] <= now:
+			advance_time, event_id = heapq.heappop(self.reminder_heap)
+			event = self.reminders.get(event_id)
+			if event is None or event.advance_time != advance_time:
+				continue  # 已删除或已修改的残留项
+			del self.reminders[event_id]
+			due_events.append(event)
+		if due_events:
+			log.info(f"提醒: " + "; ".join(f"{event.title} - {event.notes}" for event in due_events))
+			if sys.platform == "darwin":
+				for event in due_events:
+					notify_mac(title='ChronosFlow', subtitle=event.title, message=event.notes)
+			else:
+				self.notify_show_floating_window.emit()
+				self.notify_to_tray.emit(tuple(due_events))
+		self.arm_timer()
+		if due_events:
+			self.publish_latest_event()
+
+	def arm_timer(self):
+		"""丢弃堆顶的失效项，并把定时器设到下一条有效提醒的时间"""
+		while self.reminder_heap:
+			advance_time, event_id = self.reminder_heap[0]
+			event = self.reminders.get(event_id)
+			if event is not None and event.advance_time == advance_time:
+				break
+			heapq.heappop(self.reminder_heap)
+		if not self.reminder_heap:
+			self.timer.stop()
 			return
-		current = QDateTime.currentDateTime()
-		if self.latest_event:
-			notify_time = QDateTime.fromString(self.latest_event.advance_time, "yyyy-MM-dd HH:mm")
-			log.info(f"{self.latest_event.title} - {self.latest_event.notes}-{notify_time}")
-			if self.latest_event and current >= notify_time:
-				log.info(f"提醒: {self.latest_event.title} - {self.latest_event.notes}")
-				if sys.platform == "darwin":
-					notify_mac(title='ChronosFlow', subtitle=self.latest_event.title,message=self.latest_event.notes)
-				else:
-					self.notify_show_floating_window.emit()
-					self.notify_to_tray.emit((self.latest_event,))
-
-				self.latest_event = None
-				current = QDateTime.currentDateTime().addSecs(60)
-				self.request_latest_event(current)
-
+		notify_time = QDateTime.fromString(self.reminder_heap[0][0], "yyyy-MM-dd HH:mm")
+		interval = QDateTime.currentDateTime().msecsTo(notify_time)
+		self.timer.start(max(0, min(interval, self.MAX_TIMER_INTERVAL)))
+
+	def update_reminders(self, reminder_info: tuple):
+		"""
+		接收后端的提醒变化：(事件列表, "load") 整体重建；(事件列表, "upsert") 新增或修改；(id列表, "remove") 删除
+		"""
+		data, tag = reminder_info
+		now = self.now_str()
+		if tag == "load":
+			self.reminders = {event.id: event for event in data if event.advance_time >= now}
+			self.reminder_heap = [(event.advance_time, event.id) for event in self.reminders.values()]
+			heapq.heapify(self.reminder_heap)
+			log.info(f"tag：{tag} 共载入 {len(self.reminders)} 条待提醒事件")
+		elif tag == "upsert":
+			for event in data:
+				# 旧的堆项留在堆中，因 advance_time 或对象不再一致而被跳过
+				self.reminders.pop(event.id, None)
+				if event.advance_time < now:
+					continue  # 提醒时间已过，不再补发
+				self.reminders[event.id] = event
+				heapq.heappush(self.reminder_heap, (event.advance_time, event.id))
+			log.info(f"tag：{tag} 更新 {len(data)} 条提醒，当前共 {len(self.reminders)} 条待提醒事件")
+		elif tag == "remove":
+			for event_id in data:
+				self.reminders.pop(event_id, None)
+			log.info(f"tag：{tag} 删除 {len(data)} 条提醒，当前共 {len(self.reminders)} 条待提醒事件")
 		else:
-			self.request_latest_event(current)
-			
-	def update_latest_event(self, latest_event_info: tuple):
-		tag = latest_event_info[1]
-		if tag == "create":
-			# 说明这是后端从零开始接受的第一条新消息
-			self.if_backend_exist_event = True
-			self.latest_event = latest_event_info[0]
-			log.info(
-				f"tag：{tag} 最新DDLEvent：{self.latest_event.title}; 提醒时间{self.latest_event.advance_time}; 截止时间{self.latest_event.datetime}")
-		elif tag == "update":
-			# 说明后端有更新，需要重新获取最新消息
-			self.latest_event = latest_event_info[0]
-			if self.latest_event:
-				self.if_backend_exist_event = True
-				log.info(f"tag：{tag} 最新DDLEvent：{self.latest_event.title}; 提醒时间{self.latest_event.advance_time}; 截止时间{self.latest_event.datetime}")		
-			else:
-				log.info(f"暂无DDLEvent")
-				self.if_backend_exist_event = False	
-		elif tag == "get":
-			# 说明因提醒消耗了新消息，现在正在获取下一条最新消息
-			if latest_event_info[0] is None:
-				# 说明后端没有储存的当前时间以后的新日程了
-				log.info(f"暂无DDLEvent")
-				self.if_backend_exist_event = False
-			else:
-				self.latest_event = latest_event_info[0]
-				self.if_backend_exist_event = True
-				log.info(
-					f"tag：{tag}最新DDLEvent：{self.latest_event.title}; 提醒时间{self.latest_event.advance_time}; 截止时间{self.latest_event.datetime}")
-		"""把消息传递给悬浮窗以便于展示"""
+			log.error(f"未知的提醒更新类型：{tag}")
+			return
+		self.arm_timer()
+		self.publish_latest_event()
+
+	def publish_latest_event(self):
+		"""把下一条提醒传递给悬浮窗以便于展示，须在 arm_timer 清理堆顶之后调用"""
+		self.latest_event = self.reminders[self.reminder_heap[0][1]] if self.reminder_heap else None
 		self.notify_to_floating_window.emit((self.latest_event,))
 
-	def request_latest_event(self, cur_time: QDateTime):
-		Emitter.instance().request_latest_event_signal(cur_time)
+	def request_pending_reminders(self, cur_time: QDateTime):
+		Emitter.instance().request_pending_reminders_signal(cur_time)
 
 
 class NotificationWidget(QFrame):
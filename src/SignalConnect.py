@@ -1,5 +1,6 @@
 from src.Emitter import Emitter
 from src.events.EventManager import receive_signal,request_signal
+from src.events.DBWorker import start_db_worker
 from src.common import logging
 log = logging.getLogger(__name__)
 
@@ -10,15 +11,14 @@ def connect_event_signal():
 	'''
 	try:
 		Emitter.instance().create_event_signal.connect(receive_signal)
-		Emitter.instance().search_all_event_signal.connect(request_signal)
 		Emitter.instance().search_some_columns_event_signal.connect(request_signal)
 		Emitter.instance().storage_path_signal.connect(receive_signal)
 		Emitter.instance().search_time_event_signal.connect(request_signal)
-		Emitter.instance().update_upcoming_event_signal.connect(request_signal)
 		Emitter.instance().delete_event_signal.connect(receive_signal)
 		Emitter.instance().modify_event_signal.connect(receive_signal)
-		Emitter.instance().latest_event_signal.connect(request_signal)
+		Emitter.instance().pending_reminders_signal.connect(request_signal)
 		Emitter.instance().school_timetable_path_signal.connect(receive_signal)
+		start_db_worker()  # 查询请求在后台数据库线程中执行
 		log.info("成功连接创建事件信号")
 	except Exception as e:
 		log.error(f"连接信号失败，Error:{e}")
@@ -133,12 +133,16 @@ class Tray(QObject):
 		
 	@Slot(object)
 	def show_notification(self, data: tuple):
-		"""显示通知"""
-		event = data[0]
+		"""显示通知，data为同一时刻到期的全部事件，多条时合并为一条通知"""
+		if len(data) == 1:
+			title, message = data[0].title, data[0].notes
+		else:
+			title = f"{len(data)} 个日程到达提醒时间"
+			message = "\n".join(event.title for event in data)
 		if platform.system() == 'Windows':
-			self.tray.showMessage(event.title, event.notes, QSystemTrayIcon.Information, 2000)
+			self.tray.showMessage(title, message, QSystemTrayIcon.Information, 2000)
 		else:
-			rumps.notification(event.title, event.notes, "")
+			rumps.notification(title, message, "")
 
 	# macOS菜单回调函数
 	def _pystray_show_main(self, icon, item):
@@ -2,7 +2,7 @@ from src.common import *
 from src.Emitter import Emitter
 from src.events.Event import *
 from src.MainWindow import *
-from src.FontSetting import set_font
+from src.FontSetting import common_font, delete_font, one_day_font
 
 log = logging.getLogger("Upcoming")
 
@@ -53,40 +53,6 @@ class DeleteButton(QPushButton):
 		self._event = event
 
 
-class EyeButton(QPushButton):
-	"""单例眼睛按钮"""
-	_instance = None
-
-	@staticmethod
-	def instance() -> "EyeButton":
-		if EyeButton._instance is None:
-			EyeButton._instance = EyeButton()
-		return EyeButton._instance
-
-	def __init__(self, parent=None):
-		super().__init__("👁️", parent)
-		self.setStyleSheet("""
-			QPushButton {
-				background-color: transparent;
-				border: none;
-				padding: 10px 15px;  /* 更紧凑的点击区域 */
-				font-size: 24px;     /* 放大图标 */
-				qproperty-iconSize: 24px;  /* 如果使用 setIcon() */
-				color: #555;        /* 中性灰色 */
-				border-radius: 4px; /* 圆角悬停背景 */
-			}
-			QPushButton:hover {
-				color: #07C160;     /* 绿色悬停 */
-				background-color: rgba(7, 193, 96, 0.2); /* 浅绿色背景 */
-			}
-			QPushButton:pressed {
-				color: #05974C;
-				background-color: rgba(5, 151, 76, 0.4); /* 按压加深 */
-			}
-		""")
-		self.setToolTip("查看")  # 增加提示文本
-		self.setCursor(Qt.PointingHandCursor)  # 手型光标
-
 
 class FloatingButton(QPushButton):
 	"""悬浮按钮"""
@@ -152,134 +118,348 @@ class FloatingButton(QPushButton):
 		super().showEvent(event)
 
 
-class CustomListItem(QWidget):
-	"""一条日程"""
-	delete_me_signal: Signal = Signal(BaseEvent)
-	view_and_edit_signal: Signal = Signal(BaseEvent)
-	finished_signal: Signal = Signal(BaseEvent)
-	unfinished_signal: Signal = Signal(BaseEvent)
+class UpcomingRow:
+	"""
+	Upcoming列表中的一行：日期标签、日程或提示文字（加载中、无匹配、无日程）
+	"""
+	DATE = 0
+	EVENT = 1
+	HINT = 2
+	__slots__ = ("kind", "date", "event", "text", "color", "font_kind", "height")
+
+	def __init__(self, kind: int, date: str = None, event: BaseEvent = None, text: str = "", color: int = 0,
+				 font_kind: int = 0, height: int = 0):
+		self.kind = kind
+		self.date = date  # yyyy-MM-dd，日期标签与日程有效
+		self.event = event
+		self.text = text
+		self.color = color  # 日程卡片的颜色序号
+		self.font_kind = font_kind  # 同 set_font 的 kind
+		self.height = height  # 提示行的固定高度，0表示按文字计算
+
+
+class DateRowCounter:
+	"""
+	按日期统计行数的树状数组（Fenwick树），下标为日期的 ordinal，稀疏存储。
+	O(log) 内修改某日期的行数，或求某日期之前（含）所有日期的总行数，即该日期分组在列表中的位置
+	"""
+	SIZE = 1 << 20  # ordinal 上限，约覆盖到公元2870年
+
+	def __init__(self):
+		self.tree: dict[int, int] = {}
+		self.ordinals: dict[str, int] = {}  # yyyy-MM-dd -> ordinal
+
+	def ordinal(self, date: str) -> int:
+		if date not in self.ordinals:
+			self.ordinals[date] = datetime.strptime(date, "%Y-%m-%d").toordinal()
+		return self.ordinals[date]
+
+	def add(self, date: str, delta: int):
+		i = self.ordinal(date)
+		while i < self.SIZE:
+			self.tree[i] = self.tree.get(i, 0) + delta
+			i += i & -i
 
-	def __init__(self, event: BaseEvent, parent=None, color_choice=0):
+	def rows_before(self, date: str) -> int:
+		"""早于 date 的所有日期的总行数"""
+		return self.rows_until(self.ordinal(date) - 1)
+
+	def rows_until(self, i: int) -> int:
+		total = 0
+		while i > 0:
+			total += self.tree.get(i, 0)
+			i -= i & -i
+		return total
+
+	def clear(self):
+		self.tree.clear()
+
+
+class UpcomingModel(QAbstractListModel):
+	"""
+	Upcoming列表的数据模型，每行是一个 UpcomingRow，由 UpcomingDelegate 负责绘制。
+	行按日期分组、分组按日期升序排列，提示行在最后。groups 保存每个日期的行（标签在首），
+	DateRowCounter 给出分组的起始行，item_index 按 (事件id, 日期) 找到日程，
+	插入、完成、取消完成与删除都只需 O(log N) 的定位，不再线性扫描整个列表
+	"""
+	RowRole = Qt.UserRole + 1  # 取出整行 UpcomingRow
+
+	def __init__(self, parent=None):
 		super().__init__(parent)
-		self.setAttribute(Qt.WA_StyledBackground, True)
-		self.setAutoFillBackground(False)
-		self.setMouseTracking(True)  # 启用鼠标跟踪
-
-		colors = (
-			"rgba(210, 125, 150, 0.9)",
-			"rgba(230, 205, 145, 0.9)",
-			"rgba(140, 175, 195, 0.9)",
-			"rgba(150, 165, 135, 0.9)",
-			"rgba(225, 160, 125, 0.9)",
-			"rgba(175, 155, 190, 0.9)"
-		)
-		self.setStyleSheet(f"""
-		            CustomListItem {{
-		                border-radius: 15px;
-		                background-color: {colors[color_choice]};
-		            }}
-		            CustomListItem:hover {{
-		                background-color: {colors[color_choice].replace('0.9', '1.0')};
-		            }}
-		        """)
-
-		# 绑定item和对应的event
-		self.nevent = event
-
-		# 设置消息布局
-		layout = QHBoxLayout(self)
-		layout.setContentsMargins(5, 2, 5, 2)  # 边距：左、上、右、下
-
-		if hasattr(self.nevent, "done"):
-			self.finish_checkbox = QCheckBox()
-			self.finish_checkbox.setChecked(bool(self.nevent.done))
-			# self.finish_checkbox.clicked.connect(lambda x:self.this_one_is_finished(x))
-			# 当打勾时触发
-			self.finish_checkbox.clicked.connect(lambda checked: self.make_this_one_finished() if checked else None)
-			# 当取消打勾时触发
-			self.finish_checkbox.clicked.connect(
-				lambda checked: self.make_this_one_unfinished() if not checked else None)
-			layout.addWidget(self.finish_checkbox)
-
-		# 展示主题的标签
-		self.theme_display_label = QLabel(f"{event.title}")
-		self.theme_display_label.setStyleSheet("""
-				color: palette(text);
-		""")
-		if hasattr(event, "done"):
-			if event.done == 0:
-				set_font(self.theme_display_label)
-			else:
-				set_font(self.theme_display_label, 3)
-		else:
-			set_font(self.theme_display_label)
-		layout.addWidget(self.theme_display_label)
-
-		# 弹性空白区域（将右侧按钮推到最右）
-		spacer = QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum)
-		layout.addItem(spacer)
-
-		self.view_schedule_button = EyeButton()
-		self.view_schedule_button.clicked.connect(self.this_one_is_viewed_and_edited)
-		self.delete_button = DeleteButton()
-		self.delete_button.clicked.connect(self.this_one_is_deleted)
-
-		self.setLayout(layout)
-		layout.addWidget(self.view_schedule_button)
-		layout.addWidget(self.delete_button)
-
-	def this_one_is_deleted(self):
-		self.delete_me_signal.emit(self.nevent)
-
-	def this_one_is_viewed_and_edited(self):
-		"""查看后发信号"""
-		self.view_and_edit_signal.emit(self.nevent)
-
-	# def this_one_is_finished(self, checked: bool):
-	# 	"""打勾或取消打勾后发信号"""
-	# 	self.nevent.done = checked
-	# 	if isinstance(self.nevent, DDLEvent):
-	# 		Emitter.instance().send_modify_event_signal(self.nevent.id, "DDL", *self.nevent.to_args())
-	# 	else:
-	# 		log.error(f"{type(self.nevent)}事件未实现完成功能")
-
-	def make_this_one_finished(self):
-		"""标记日程已完成"""
-		self.nevent.done = 1
-		if isinstance(self.nevent, DDLEvent):
-			Emitter.instance().send_modify_event_signal(self.nevent.id, "DDL", *self.nevent.to_args())
-		else:
-			log.error(f"{type(self.nevent)}事件未实现完成功能")
-		self.finished_signal.emit(self.nevent)
+		self.rows: list[UpcomingRow] = []
+		self.groups: dict[str, list[UpcomingRow]] = {}  # 日期 -> [日期标签, 日程...]
+		self.row_counter = DateRowCounter()
+		self.item_index: dict[tuple[int, str], UpcomingRow] = {}  # (事件id, 日期) -> 日程行
+		self.item_dates: dict[int, set[str]] = {}  # 事件id -> 该事件已显示的日期，重复的activity每次发生占一行
+
+	def rowCount(self, parent=QModelIndex()):
+		return 0 if parent.isValid() else len(self.rows)
+
+	def data(self, index: QModelIndex, role=Qt.DisplayRole):
+		if not index.isValid() or index.row() >= len(self.rows):
+			return None
+		row = self.rows[index.row()]
+		if role == self.RowRole:
+			return row
+		if role == Qt.DisplayRole:
+			return row.event.title if row.kind == UpcomingRow.EVENT else row.text
+		if role == Qt.ToolTipRole and row.kind == UpcomingRow.EVENT:
+			return row.event.notes
+		return None
+
+	def flags(self, index: QModelIndex):
+		if not index.isValid() or self.rows[index.row()].kind == UpcomingRow.HINT:
+			return Qt.NoItemFlags
+		return Qt.ItemIsEnabled
+
+	def insert_row(self, position: int, row: UpcomingRow):
+		self.beginInsertRows(QModelIndex(), position, position)
+		self.rows.insert(position, row)
+		self.endInsertRows()
+
+	def append_row(self, row: UpcomingRow):
+		self.insert_row(len(self.rows), row)
+
+	def remove_row(self, position: int):
+		self.beginRemoveRows(QModelIndex(), position, position)
+		del self.rows[position]
+		self.endRemoveRows()
+
+	def remove_row_object(self, row: UpcomingRow):
+		"""按对象删除一行（用于加载标签等提示行）"""
+		for position in range(len(self.rows) - 1, -1, -1):
+			if self.rows[position] is row:
+				self.remove_row(position)
+				return
 
-	def make_this_one_unfinished(self):
-		self.nevent.done = 0
-		if isinstance(self.nevent, DDLEvent):
-			Emitter.instance().send_modify_event_signal(self.nevent.id, "DDL", *self.nevent.to_args())
-		else:
-			log.error(f"{type(self.nevent)}事件未实现完成功能")
-		self.unfinished_signal.emit(self.nevent)
+	def clear_rows(self):
+		self.beginResetModel()
+		self.rows.clear()
+		self.groups.clear()
+		self.row_counter.clear()
+		self.item_index.clear()
+		self.item_dates.clear()
+		self.endResetModel()
+
+	def has_date_label(self, date: str) -> bool:
+		return date in self.groups
+
+	def add_date_label(self, row: UpcomingRow):
+		"""按日期升序插入日期标签"""
+		self.insert_row(self.row_counter.rows_before(row.date), row)
+		self.groups[row.date] = [row]
+		self.row_counter.add(row.date, 1)
+
+	def add_event_row(self, row: UpcomingRow, at_top: bool):
+		"""
+		把日程插入其日期分组：at_top 为 True 时插到日期标签正下方，否则插到该日期的末尾
+		"""
+		group = self.groups[row.date]
+		offset = 1 if at_top else len(group)
+		self.insert_row(self.row_counter.rows_before(row.date) + offset, row)
+		group.insert(offset, row)
+		self.row_counter.add(row.date, 1)
+		self.item_index[(row.event.id, row.date)] = row
+		self.item_dates.setdefault(row.event.id, set()).add(row.date)
+
+	def remove_event_row(self, event_id: int, date: str, keep_label: bool) -> bool:
+		"""
+		删除日程，返回是否找到。该日期没有日程且 keep_label 为 False 时一并删除日期标签
+		"""
+		row = self.item_index.pop((event_id, date), None)
+		if row is None:
+			return False
+		dates = self.item_dates[event_id]
+		dates.discard(date)
+		if not dates:
+			del self.item_dates[event_id]
+		group = self.groups[date]
+		offset = group.index(row)  # 只在当天的分组内查找
+		start = self.row_counter.rows_before(date)
+		self.remove_row(start + offset)
+		del group[offset]
+		self.row_counter.add(date, -1)
+		if len(group) == 1 and not keep_label:
+			self.remove_row(start)
+			del self.groups[date]
+			self.row_counter.add(date, -1)
+		return True
+
+	def remove_all_event_rows(self, event_id: int) -> int:
+		"""
+		删除某事件在所有日期上的日程行，返回删除的行数。空出来的日期标签一并删除
+		"""
+		dates = sorted(self.item_dates.get(event_id, ()))
+		for date in dates:
+			self.remove_event_row(event_id, date, keep_label=False)
+		return len(dates)
+
+	def row_changed(self, position: int):
+		index = self.index(position)
+		self.dataChanged.emit(index, index)
 
 
-class Upcoming(QListWidget):
+class UpcomingDelegate(QStyledItemDelegate):
 	"""
-	容纳多个SingleUpcoming，有滚动等功能
+	绘制Upcoming的每一行，并对日程卡片上的复选框、查看、删除区域做点击检测。
+	所有行共用这一个委托，不再为每行创建控件，只有可见行才会被绘制
+	"""
+	toggle_clicked: Signal = Signal(object)  # 复选框，参数为 UpcomingRow
+	view_clicked: Signal = Signal(object)  # 查看按钮
+	delete_clicked: Signal = Signal(object)  # 删除按钮
+
+	CARD_COLORS = (
+		QColor(210, 125, 150),
+		QColor(230, 205, 145),
+		QColor(140, 175, 195),
+		QColor(150, 165, 135),
+		QColor(225, 160, 125),
+		QColor(175, 155, 190),
+	)
+	CARD_HEIGHT = 80  # 日程卡片高度
+	MARGIN = 5  # 行间距
+	HINT_COLOR = QColor("#6c757d")
+
+	def __init__(self, parent=None):
+		super().__init__(parent)
+		self.hover_row: UpcomingRow = None  # 鼠标所在的日程行
+		self.hover_part: str = None  # 鼠标所在的区域："check"/"view"/"delete"
+		self.icon_font = QFont(common_font)
+		self.icon_font.setPixelSize(24)
+
+	def row_font(self, row: UpcomingRow) -> QFont:
+		if row.kind == UpcomingRow.EVENT:
+			return delete_font if getattr(row.event, "done", 0) else common_font
+		return one_day_font if row.font_kind == 4 else common_font
+
+	def part_rects(self, rect: QRect, row: UpcomingRow) -> dict[str, QRect]:
+		"""计算日程卡片各区域的位置，绘制与点击检测共用"""
+		card = rect.adjusted(self.MARGIN, self.MARGIN, -self.MARGIN, -self.MARGIN)
+		center_y = card.center().y()
+		delete = QRect(card.right() - 10 - 40, center_y - 20, 40, 40)
+		view = QRect(delete.left() - 6 - 54, center_y - 22, 54, 44)
+		parts = {"card": card, "delete": delete, "view": view}
+		title_left = card.left() + 12
+		if hasattr(row.event, "done"):
+			parts["check"] = QRect(card.left() + 10, center_y - 10, 20, 20)
+			title_left = parts["check"].right() + 10
+		parts["title"] = QRect(title_left, card.top(), view.left() - 6 - title_left, card.height())
+		return parts
+
+	def hit_test(self, rect: QRect, row: UpcomingRow, pos: QPoint) -> str:
+		"""返回 pos 所在的可点击区域名，不在任何区域返回 None"""
+		if row is None or row.kind != UpcomingRow.EVENT:
+			return None
+		parts = self.part_rects(rect, row)
+		for name in ("check", "view", "delete"):
+			if name in parts and parts[name].contains(pos):
+				return name
+		return None
+
+	def sizeHint(self, option: QStyleOptionViewItem, index: QModelIndex) -> QSize:
+		row = index.data(UpcomingModel.RowRole)
+		if row is None:
+			return super().sizeHint(option, index)
+		if row.kind == UpcomingRow.EVENT:
+			return QSize(option.rect.width(), self.CARD_HEIGHT + 2 * self.MARGIN)
+		if row.height > 0:
+			return QSize(option.rect.width(), row.height)
+		metrics = QFontMetrics(self.row_font(row))
+		return QSize(option.rect.width(), metrics.lineSpacing() * (row.text.count("\n") + 1) + 2 * self.MARGIN)
+
+	def paint(self, painter: QPainter, option: QStyleOptionViewItem, index: QModelIndex):
+		row = index.data(UpcomingModel.RowRole)
+		if row is None:
+			return
+		painter.save()
+		painter.setRenderHint(QPainter.Antialiasing)
+		if row.kind == UpcomingRow.EVENT:
+			self.paint_event_row(painter, option, row)
+		else:
+			painter.setFont(self.row_font(row))
+			painter.setPen(self.HINT_COLOR if row.kind == UpcomingRow.HINT and row.font_kind == 4
+						   else option.palette.color(QPalette.Text))
+			alignment = Qt.AlignCenter if row.kind == UpcomingRow.HINT else Qt.AlignLeft | Qt.AlignVCenter
+			painter.drawText(option.rect.adjusted(self.MARGIN, 0, -self.MARGIN, 0), alignment, row.text)
+		painter.restore()
+
+	def paint_event_row(self, painter: QPainter, option: QStyleOptionViewItem, row: UpcomingRow):
+		parts = self.part_rects(option.rect, row)
+		hovered = bool(option.state & QStyle.State_MouseOver)
+		hover_part = self.hover_part if self.hover_row is row else None
+
+		# 卡片背景，悬停时不透明
+		color = QColor(self.CARD_COLORS[row.color % len(self.CARD_COLORS)])
+		color.setAlphaF(1.0 if hovered else 0.9)
+		painter.setPen(Qt.NoPen)
+		painter.setBrush(color)
+		painter.drawRoundedRect(parts["card"], 15, 15)
+
+		# 复选框
+		if "check" in parts:
+			check_option = QStyleOptionButton()
+			check_option.rect = parts["check"]
+			check_option.state = QStyle.State_Enabled | (QStyle.State_On if row.event.done else QStyle.State_Off)
+			if hover_part == "check":
+				check_option.state |= QStyle.State_MouseOver
+			widget = option.widget
+			style = widget.style() if widget is not None else QApplication.style()
+			style.drawPrimitive(QStyle.PE_IndicatorCheckBox, check_option, painter, widget)
+
+		# 标题
+		title_font = self.row_font(row)
+		painter.setFont(title_font)
+		painter.setPen(option.palette.color(QPalette.Text))
+		title = QFontMetrics(title_font).elidedText(row.event.title, Qt.ElideRight, max(0, parts["title"].width()))
+		painter.drawText(parts["title"], Qt.AlignLeft | Qt.AlignVCenter, title)
+
+		# 查看按钮
+		painter.setFont(self.icon_font)
+		if hover_part == "view":
+			painter.setPen(Qt.NoPen)
+			painter.setBrush(QColor(7, 193, 96, 51))
+			painter.drawRoundedRect(parts["view"], 4, 4)
+			painter.setPen(QColor("#07C160"))
+		else:
+			painter.setPen(QColor("#555555"))
+		painter.drawText(parts["view"], Qt.AlignCenter, "👁️")
+
+		# 删除按钮
+		delete_hovered = hover_part == "delete"
+		painter.setPen(QPen(QColor(255, 80, 80, 128 if delete_hovered else 77), 1))
+		painter.setBrush(QColor(255, 80, 80, 38 if delete_hovered else 26))
+		painter.drawRoundedRect(parts["delete"], 8, 8)
+		painter.setPen(QColor("#E03C3C") if delete_hovered else QColor("#FF5050"))
+		painter.drawText(parts["delete"], Qt.AlignCenter, "🗑")
+
+	def editorEvent(self, event, model, option: QStyleOptionViewItem, index: QModelIndex) -> bool:
+		"""鼠标释放时检测点击区域并发出对应信号"""
+		if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton:
+			row = index.data(UpcomingModel.RowRole)
+			part = self.hit_test(option.rect, row, event.position().toPoint())
+			if part == "check":
+				self.toggle_clicked.emit(row)
+				return True
+			if part == "view":
+				self.view_clicked.emit(row)
+				return True
+			if part == "delete":
+				self.delete_clicked.emit(row)
+				return True
+		return super().editorEvent(event, model, option, index)
+
+
+class Upcoming(QListView):
+	"""
+	按日期分组显示日程，有滚动加载等功能。
+	数据保存在 UpcomingModel 中，由 UpcomingDelegate 绘制，只有可见行才有绘制开销
 	"""
 
 	def __init__(self, kind=0, parent=None):
 		super().__init__(parent)
 
 		self.setStyleSheet("""
-		    QListWidget::item:selected {
-		        background: transparent;
-		        border: none;
-		        color: palette(text)
-		    }
-		    QListWidget { background: transparent; }
-		    QListWidget::item {
-        			/* 控制行间距（相邻项的间隔） */
-        			margin: 5px;  
-        	}
+			QListView { background: transparent; border: none; }
 			/* 垂直滚动条 */
 			QScrollBar:vertical {
 				border: none;
@@ -327,37 +507,60 @@ class Upcoming(QListWidget):
 			QScrollBar::add-page:horizontal, QScrollBar::sub-page:horizontal {
 				background: none;
 			}
-			QListWidget::item:selected {
-				background: transparent;
-				border: none;
-				color: palette(text)
-			}
-			QListWidget { background: transparent; }
-			QListWidget::item {
-					/* 控制行间距（相邻项的间隔） */
-					margin: 5px;  
-			}
 		""")
 
+		self.list_model = UpcomingModel(self)
+		self.delegate = UpcomingDelegate(self)
+		self.setModel(self.list_model)
+		self.setItemDelegate(self.delegate)
+		self.setSelectionMode(QAbstractItemView.NoSelection)
+		self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+		self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+		self.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+		self.setFocusPolicy(Qt.NoFocus)
+		self.setMouseTracking(True)  # 启用鼠标跟踪，用于按钮悬停效果
+		self.delegate.toggle_clicked.connect(self.toggle_one_item)
+		self.delegate.view_clicked.connect(lambda row: self.view_and_edit_one_item(row.event))
+		self.delegate.delete_clicked.connect(lambda row: self.delete_one_item(row.event))
+
 		self.kind = kind  # 0:Upcoming页面的Upcoming；1:Calendar页面的search_column；2:某个日期的Upcoming
 		self.events_used_to_update: tuple[BaseEvent] = tuple()  # 储存这次需要更新的至多10个数据
-		self.index_of_date_label = dict()  # 储存显示日期的项的位置
-		self.items_of_one_date = dict()  # 储存同一日期的项的位置,每个日期对应一个列表，列表中的项为tuple(id,位置)
 		self.loading = False  # 是否正在加载
 		self.no_more_events = False  # 是否显示全部数据
-		self.event_num = 0  # 记录当前个数，传给后端提取数据
+		self.event_num = 0  # 记录当前个数
 		self.page_num = 10  # 每页显示的事件数
-		self.loading_item = None  # 加载标签
+		self.page_cursor = None  # 已加载的最后一个事件的(datetime, id)，传给后端提取下一页
+		self.loading_item: UpcomingRow = None  # 加载标签
+		self.notify_item: UpcomingRow = None  # 无日程提示
+		self.pending_request = None  # 尚未返回的后台请求id，刷新或发起新请求时取消，过期结果直接丢弃
 		self.float_btn: FloatingButton = None  # 悬浮按钮
 		self.color_choice = 0  # 0:red 1:yellow 2:blue 3:green
 
 		if self.kind == 0:
 			self.load_more_data()
-			log.info(f"共{self.event_num}条日程")
 			self.verticalScrollBar().valueChanged.connect(self.check_scroll)  # 检测是否滚动到底部
 		elif self.kind == 2:
 			self.load_more_data()
 
+	def mouseMoveEvent(self, event):
+		"""记录鼠标所在的按钮区域，供委托绘制悬停效果"""
+		pos = event.position().toPoint()
+		index = self.indexAt(pos)
+		row = index.data(UpcomingModel.RowRole) if index.isValid() else None
+		part = self.delegate.hit_test(self.visualRect(index), row, pos) if row is not None else None
+		if (row, part) != (self.delegate.hover_row, self.delegate.hover_part):
+			self.delegate.hover_row = row
+			self.delegate.hover_part = part
+			self.viewport().update()
+			self.viewport().setCursor(Qt.PointingHandCursor if part else Qt.ArrowCursor)
+		super().mouseMoveEvent(event)
+
+	def leaveEvent(self, event):
+		self.delegate.hover_row = None
+		self.delegate.hover_part = None
+		self.viewport().update()
+		super().leaveEvent(event)
+
 	def check_scroll(self):
 		"""检查是否滚动到底部"""
 		if self.verticalScrollBar().value() == self.verticalScrollBar().maximum():
@@ -372,47 +575,45 @@ class Upcoming(QListWidget):
 			else:
 				log.error("未知错误，无法加载数据")
 
+	def clear(self):
+		"""清空列表"""
+		self.list_model.clear_rows()
+		self.delegate.hover_row = None
+		self.loading_item = None
+		self.notify_item = None
+
 	def show_loading_label(self):
 		"""显示加载标签"""
-		self.loading_item = QListWidgetItem("Loading……")
-		self.loading_item.setTextAlignment(Qt.AlignCenter)
-		self.addItem(self.loading_item)
+		self.loading_item = UpcomingRow(UpcomingRow.HINT, text="Loading……")
+		self.list_model.append_row(self.loading_item)
 
-	def add_date_label(self, date):
-		"""
-		在所有同一天的日程前加上日期
-		"""
+	def hide_loading_label(self):
+		"""删除加载标签"""
+		if self.loading_item is not None:
+			self.list_model.remove_row_object(self.loading_item)
+			self.loading_item = None
+
+	@staticmethod
+	def date_label_text(date: str) -> str:
 		today = QDate.currentDate()
 		tomorrow = today.addDays(1).toString("yyyy-MM-dd")
 		today = today.toString("yyyy-MM-dd")
 
-		date = date[:10]
 		if date == today:
-			date_text = '\n今天\n————————'
+			return '\n今天\n————————'
 		elif date == tomorrow:
-			date_text = '\n明天\n————————'
-		else:
-			tmp_date = date.split('-')
-			if date[:4] == today[:4]:
-				date_text = f"\n{int(tmp_date[1])}月{int(tmp_date[2])}日\n————————"
-			else:
-				date_text = f"\n{tmp_date[0]}年{int(tmp_date[1])}月{int(tmp_date[2])}日\n————————"
-
-		date_item = QListWidgetItem(date_text)
-		set_font(date_item)
-
-		# 寻找插入位置（第一个比自身日期大的日期）
-		record = None
-		for key in self.index_of_date_label.keys():
-			if key > date:
-				record = key
-				break
-		if not record is None:
-			self.insertItem(self.index_of_date_label[record].row(), date_item)
-		else:
-			self.addItem(date_item)
-		self.index_of_date_label[date] = QPersistentModelIndex(self.indexFromItem(date_item))
-		self.index_of_date_label = dict(sorted(self.index_of_date_label.items()))  # 保证日期标签按升序排列，仅支持python3.7及以上
+			return '\n明天\n————————'
+		tmp_date = date.split('-')
+		if date[:4] == today[:4]:
+			return f"\n{int(tmp_date[1])}月{int(tmp_date[2])}日\n————————"
+		return f"\n{tmp_date[0]}年{int(tmp_date[1])}月{int(tmp_date[2])}日\n————————"
+
+	def add_date_label(self, date):
+		"""
+		在所有同一天的日程前加上日期，日期标签按升序排列
+		"""
+		date = date[:10]
+		self.list_model.add_date_label(UpcomingRow(UpcomingRow.DATE, date=date, text=self.date_label_text(date)))
 
 	def get_specific_date_data(self, data: tuple[BaseEvent]):
 		"""从后端加载特定日期的数据"""
@@ -425,12 +626,7 @@ class Upcoming(QListWidget):
 			log.info("接受数据为空，无更多数据")
 			# 数据加载完毕
 			self.no_more_events = True
-
-		# 删除加载标签
-		if hasattr(self, "loading_item"):
-			self.takeItem(self.row(self.loading_item))
-			del self.loading_item
-		self.index_of_date_label = dict(sorted(self.index_of_date_label.items()))  # 保证日期标签按升序排列
+		self.hide_loading_label()
 
 	def get_data(self, data: tuple[BaseEvent] = None):
 		"""从后端加载数据"""
@@ -439,83 +635,28 @@ class Upcoming(QListWidget):
 					"\n".join(f"- {event.title} @ {event.datetime}" for event in data))
 			self.events_used_to_update = data
 			self.event_num += len(data)
+			self.page_cursor = (data[-1].datetime, data[-1].id)
 		else:
 			log.info("接受数据为空，无更多数据")
 			# 数据加载完毕
 			self.no_more_events = True
-		# 删除加载标签
-		if hasattr(self, "loading_item"):
-			self.takeItem(self.row(self.loading_item))
-			del self.loading_item
+		self.hide_loading_label()
 
 	def add_one_item(self, event: BaseEvent):
 		"""
-		将每条的日期和已有的日期比较，如果日期已有，插入到这一日期标签的下面；如果没有，新建日期标签
-		self.index_of_data_label的key的形式为event.datetime[:10],仅有年月日
+		将每条的日期和已有的日期比较，如果日期已有，插入到这一日期标签的下面；如果没有，新建日期标签。
+		未完成的日程插到日期标签的正下方，已完成的日程插到该日期的末尾
 		"""
-		custom_widget = CustomListItem(event, color_choice=self.color_choice)
+		item = UpcomingRow(UpcomingRow.EVENT, date=event.datetime[:10], event=event, color=self.color_choice)
 		self.color_choice += 1
 		if self.color_choice == 6:
 			self.color_choice = 0
 
-		item = QListWidgetItem()
-		item.setSizeHint(QSize(custom_widget.sizeHint().width(), 80))  # 设置合适的大小
-
 		# 如果没有对应日期的标签，就加上
-		if not event.datetime[:10] in self.index_of_date_label:
-			self.add_date_label(event.datetime)
-			# 如果未完成，插到自己的日期标签的下方
-			if hasattr(event, "done") and event.done == 0:
-				self.insertItem(self.index_of_date_label[event.datetime[:10]].row() + 1, item)
-				self.setItemWidget(item, custom_widget)
-				self.items_of_one_date[event.datetime[:10]] = [
-					(event.id, QPersistentModelIndex(self.indexFromItem(item)))]  # 获取永久位置
-			# 如果完成，插到下一个日期标签的上方
-			else:
-				date = event.datetime[:10]
-				record = None
-				for key in self.index_of_date_label.keys():
-					if key > date:
-						record = key
-						break
-				if not record is None:
-					self.insertItem(self.index_of_date_label[record].row(), item)
-					self.setItemWidget(item, custom_widget)
-					self.items_of_one_date[event.datetime[:10]] = [
-						(event.id, QPersistentModelIndex(self.indexFromItem(item)))]
-				else:
-					self.addItem(item)
-					self.setItemWidget(item, custom_widget)
-					self.items_of_one_date[event.datetime[:10]] = [
-						(event.id, QPersistentModelIndex(self.indexFromItem(item)))]
-		else:
-			if hasattr(event, "done") and event.done == 0:
-				self.insertItem(self.index_of_date_label[event.datetime[:10]].row() + 1, item)
-				self.setItemWidget(item, custom_widget)
-				self.items_of_one_date[event.datetime[:10]].append(
-					(event.id, QPersistentModelIndex(self.indexFromItem(item))))
-			else:
-				date = event.datetime[:10]
-				record = None
-				for key in self.index_of_date_label.keys():
-					if key > date:
-						record = key
-						break
-				if not record is None:
-					self.insertItem(self.index_of_date_label[record].row(), item)
-					self.setItemWidget(item, custom_widget)
-					self.items_of_one_date[event.datetime[:10]].append(
-						(event.id, QPersistentModelIndex(self.indexFromItem(item))))
-				else:
-					self.addItem(item)
-					self.setItemWidget(item, custom_widget)
-					self.items_of_one_date[event.datetime[:10]].append(
-						(event.id, QPersistentModelIndex(self.indexFromItem(item))))
-
-		custom_widget.delete_me_signal.connect(self.delete_one_item)
-		custom_widget.view_and_edit_signal.connect(self.view_and_edit_one_item)
-		custom_widget.finished_signal.connect(self.finish_one_item)
-		custom_widget.unfinished_signal.connect(self.make_one_item_unfinished)
+		if not self.list_model.has_date_label(item.date):
+			self.add_date_label(item.date)
+		# 未完成的插到自己的日期标签的下方，完成的插到下一个日期标签的上方
+		self.list_model.add_event_row(item, at_top=hasattr(event, "done") and event.done == 0)
 		log.info(f"{event.title}插入完成")
 
 	def view_and_edit_one_item(self, event: BaseEvent):
@@ -523,6 +664,19 @@ class Upcoming(QListWidget):
 		log.info(f"查看编辑事件：{event.title}")
 		Emitter.instance().send_view_and_edit_schedule_signal((event,))
 
+	def toggle_one_item(self, row: UpcomingRow):
+		"""点击复选框：切换完成状态并通知后端"""
+		event = row.event
+		event.done = 0 if event.done else 1
+		if isinstance(event, DDLEvent):
+			Emitter.instance().send_modify_event_signal(event.id, "DDL", *event.to_args())
+		else:
+			log.error(f"{type(event)}事件未实现完成功能")
+		if event.done:
+			self.finish_one_item(event)
+		else:
+			self.make_one_item_unfinished(event)
+
 	def finish_one_item(self, event: BaseEvent):
 		"""标记一个事件已完成"""
 		# 先删除
@@ -550,46 +704,49 @@ class Upcoming(QListWidget):
 			log.info(f"ActivityEvent：{event.title} event.datetime:{event.datetime}")
 		elif isinstance(event, ActivityEvent):
 			log.info(f"ActivityEvent：{event.title} event.datetime:{event.datetime}")
-		# event.datetime = event.datetime
 		date = event.datetime[:10]
 		log.info(f"date = {date}")
-		# 查找该事件
-		for i in range(len(self.items_of_one_date[date])):
-			if self.items_of_one_date[date][i][0] == event.id:
-				self.takeItem(self.row(self.itemFromIndex(self.items_of_one_date[date][i][1])))  # 去除item
+		if isinstance(event, ActivityEvent) and not keep_corresponding_event:
+			# 后端删除的是整个activity，它在其他日期的发生也要一并移除
+			removed = self.list_model.remove_all_event_rows(event.id)
+			self.event_num -= removed
+			log.info(f"删除事件成功：{event.title}，共移除 {removed} 行")
+		# 通过 (id, 日期) 直接定位该事件
+		elif self.list_model.remove_event_row(event.id, date, keep_label=keep_corresponding_event):
+			if not keep_corresponding_event:
 				self.event_num -= 1
-				del self.items_of_one_date[date][i]
-				if not keep_corresponding_event:
-					log.info(f"删除事件成功：{event.title} @ {event.datetime}")
-				# 删除日期标签
-				if not keep_corresponding_event:
-					if len(self.items_of_one_date[date]) == 0:
-						del self.items_of_one_date[date]
-						self.takeItem(self.row(self.itemFromIndex(self.index_of_date_label[date])))
-						del self.index_of_date_label[date]
-						log.info(f"日期标签删除成功：{date}")
-				break
+				log.info(f"删除事件成功：{event.title} @ {event.datetime}")
 		if not keep_corresponding_event:
 			Emitter.instance().send_delete_event_signal(event.id, event.table_name())
 
+	def cancel_pending_request(self):
+		"""取消尚未返回的后台请求，其结果到达后会被丢弃"""
+		Emitter.instance().cancel_backend_request(self.pending_request)
+		self.pending_request = None
+
 	def load_more_data(self):
-		"""将数据添加到self"""
+		"""向后台请求下一页数据，先显示加载标签，数据到达后由 receive_more_data 添加到self"""
 		if self.kind == 0:
-			# 连接接收信号
-			Emitter.instance().backend_data_to_frontend_signal.connect(self.get_data)
+			self.loading = True
 			# 显示加载标签
 			self.show_loading_label()
-			# 发送请求信号
-			Emitter.instance().request_update_upcoming_event_signal(self.event_num, self.page_num)
-			# 断开接收信号连接
-			Emitter.instance().backend_data_to_frontend_signal.disconnect(self.get_data)
-			# 停止加载
-			self.loading = False
-			if self.no_more_events:
-				log.info("没有更多数据了，停止加载……")
-				return
-			for event in self.events_used_to_update:
-				self.add_one_item(event)
+			# 发送请求，结果异步回传
+			self.pending_request = Emitter.instance().request_upcoming_page_signal(
+				self.page_cursor, self.page_num, self.receive_more_data)
+
+	def receive_more_data(self, data: tuple[BaseEvent]):
+		"""接收下一页数据"""
+		self.pending_request = None
+		self.get_data(data)
+		# 停止加载
+		self.loading = False
+		if self.no_more_events:
+			log.info("没有更多数据了，停止加载……")
+			self.notify_no_events()
+			return
+		for event in self.events_used_to_update:
+			self.add_one_item(event)
+		log.info(f"共{self.event_num}条日程")
 
 	def load_searched_data(self, text):
 		"""search_column"""
@@ -597,53 +754,49 @@ class Upcoming(QListWidget):
 			log.error("load_searched_data被非search_column调用！")
 			return
 
+		self.cancel_pending_request()
 		self.clear()
-		self.index_of_date_label.clear()
-		self.items_of_one_date.clear()
 		self.events_used_to_update = tuple()
 		self.no_more_events = False
-		self.loading = False
+		self.loading = True
 		self.event_num = 0
-		self.loading_item = None
 		self.color_choice = 0
-		log.info(f"共{self.event_num}条日程")
-		# 连接接收信号
-		Emitter.instance().backend_data_to_frontend_signal.connect(self.get_data)
 		# 显示加载标签
 		self.show_loading_label()
-		# 发送搜索信息
-		Emitter.instance().request_search_all_event_signal(text)
-		# 断开接收信号连接
-		Emitter.instance().backend_data_to_frontend_signal.disconnect(self.get_data)
+		# 发送搜索信息，结果异步回传
+		self.pending_request = Emitter.instance().request_search_all_event_signal(text, self.receive_searched_data)
 
+	def receive_searched_data(self, data: tuple[BaseEvent]):
+		"""接收搜索结果"""
+		self.pending_request = None
+		self.get_data(data)
+		self.loading = False
 		if not self.no_more_events:
 			for event in self.events_used_to_update:
 				self.add_one_item(event)
 		else:
-			item = QListWidgetItem("没有匹配的日程")
-			set_font(item)
-			item.setTextAlignment(Qt.AlignCenter)
-			self.addItem(item)
+			self.list_model.append_row(UpcomingRow(UpcomingRow.HINT, text="没有匹配的日程"))
+		log.info(f"共{self.event_num}条日程")
 
 	def show_specific_date(self, date: QDate):
 		"""显示指定日期的日程"""
+		self.cancel_pending_request()
 		self.clear()
-		self.index_of_date_label.clear()
-		self.items_of_one_date.clear()
 		self.events_used_to_update = tuple()
-		self.loading = False
+		self.loading = True
 		self.no_more_events = False
 		self.event_num = 0
 		self.color_choice = 0
-		self.loading_item = None
-		# 连接接收信号
-		Emitter.instance().backend_data_to_frontend_signal.connect(self.get_specific_date_data)
 		# 显示加载标签
 		self.show_loading_label()
-		# 发送请求信号
-		Emitter.instance().request_update_specific_date_upcoming_event_signal(date)
-		# 断开接收信号连接
-		Emitter.instance().backend_data_to_frontend_signal.disconnect(self.get_specific_date_data)
+		# 发送请求信号，结果异步回传
+		self.pending_request = Emitter.instance().request_update_specific_date_upcoming_event_signal(
+			date, lambda data: self.receive_specific_date_data(data, date))
+
+	def receive_specific_date_data(self, data: tuple[BaseEvent], date: QDate):
+		"""接收指定日期的数据"""
+		self.pending_request = None
+		self.get_specific_date_data(data)
 		# 停止加载
 		self.loading = False
 		if self.no_more_events:
@@ -660,24 +813,20 @@ class Upcoming(QListWidget):
 			log.error("refresh_upcoming被非Upcoming页面调用！")
 			return
 
+		self.cancel_pending_request()
 		self.clear()
-		self.index_of_date_label.clear()
-		self.items_of_one_date.clear()
 		self.events_used_to_update = tuple()
 		self.loading = False
 		self.no_more_events = False
 		self.event_num = 0
-		self.loading_item = None
+		self.page_cursor = None
 		self.color_choice = 0
 		self.load_more_data()
-		log.info(f"共{self.event_num}条日程")
 
 	def notify_no_events(self, date: QDate = None):
-		# 创建自定义样式的提示项
-		# 创建提示项
-  
-		self.notify_item = QListWidgetItem()
-		self.notify_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)  # 文字居中
+		"""没有日程时显示提示，加载中或已显示过时不重复添加"""
+		if self.loading or self.notify_item is not None:
+			return
 		# 使用Unicode符号+多行文本
 		if date is not None:
 			date_string = date.toString("yyyy年M月d日")
@@ -689,17 +838,8 @@ class Upcoming(QListWidget):
 			────────────────
 			✨ 快来点击下方 + 号按钮添加首个日程吧"""
 		else:
-			return 
-
-		# 设置字体样式
-		set_font(self.notify_item, 4)
-
-		# 设置文字颜色（使用QColor）
-		self.notify_item.setForeground(QColor("#6c757d"))  # 中性灰文字
-
-		# 交互限制
-		self.notify_item.setFlags(Qt.ItemFlag.NoItemFlags)  # 禁止交互
-		self.notify_item.setSizeHint(QSize(200, 100))  # 合适的高度
-		self.notify_item.setText(notice_text)
+			return
 
-		self.addItem(self.notify_item)
+		# 中性灰文字，合适的高度，禁止交互
+		self.notify_item = UpcomingRow(UpcomingRow.HINT, text=notice_text, font_kind=4, height=100)
+		self.list_model.append_row(self.notify_item)
@@ -1,8 +1,10 @@
 from src.common import *
 from src.Upcoming import FloatingButton, DeleteButton
 from functools import partial
+import heapq
 from src.events.Event import *
 from src.events.EventManager import EventSQLManager
+from src.Emitter import Emitter
 log = logging.getLogger(__name__)
 class TimeAxisItem(QGraphicsRectItem):
     """左侧时间轴项"""
@@ -19,18 +21,52 @@ class TimeAxisItem(QGraphicsRectItem):
         painter.setPen(self.text_color)
         painter.drawText(self.rect().adjusted(2, 0, 0, 0), Qt.AlignLeft | Qt.AlignVCenter, self.time_str)
 
-class ScheduleBlockItem(QGraphicsRectItem,QObject):
-    """日程块图形项"""
-    clicked = Signal(BaseEvent)
-    del_btn_clicked = Signal(BaseEvent)
-    double_clicked = Signal(BaseEvent)
-    hover_signal = Signal(BaseEvent)
-
-    def __init__(self, rect: QRectF, event, view:QGraphicsView, parent=None):
-        QObject.__init__(self)  # 初始化 QObject
-        QGraphicsRectItem.__init__(self, rect)  # 初始化 QGraphicsRectItem
+class ScheduleCluster:
+    """同一天内时间上相互重叠的一组日程，列号由 pack_day_schedules 分配"""
+    __slots__ = ("weekday", "start", "end", "columns", "entries")
+
+    def __init__(self, weekday: int, start: int):
+        self.weekday = weekday  # Monday=1, Sunday=7
+        self.start = start  # 整组的开始分钟
+        self.end = start  # 整组的结束分钟
+        self.columns = 0  # 整组占用的列数
+        self.entries: list[tuple[ActivityEvent, int, int, int]] = []  # (事件, 列号, 开始分钟, 结束分钟)
+
+
+def pack_day_schedules(weekday: int, intervals: list[tuple[int, int, ActivityEvent]]) -> list[ScheduleCluster]:
+    """
+    扫描线分配列：intervals 为 (开始分钟, 结束分钟, 事件)，按开始时间依次放入当前空闲的最小列号，
+    没有正在进行的日程时开始新的一组。组内所有日程等分该组的列数
+    """
+    clusters = []
+    cluster = None
+    active = []  # 正在进行的日程 (结束分钟, 列号)
+    free_columns = []  # 当前组内已空出的列号
+    for start, end, event in sorted(intervals, key=lambda item: (item[0], item[1])):
+        while active and active[0][0] <= start:
+            heapq.heappush(free_columns, heapq.heappop(active)[1])
+        if not active:
+            cluster = ScheduleCluster(weekday, start)
+            clusters.append(cluster)
+            free_columns = []
+        column = heapq.heappop(free_columns) if free_columns else cluster.columns
+        cluster.columns = max(cluster.columns, column + 1)
+        cluster.end = max(cluster.end, end)
+        cluster.entries.append((event, column, start, end))
+        heapq.heappush(active, (end, column))
+    return clusters
+
+
+class ScheduleBlockItem(QGraphicsRectItem):
+    """日程块图形项（轻量图元，不带控件；删除按钮由 WeekView 统一提供）"""
+    text_font: QFont = None  # 所有日程块共用的字体，首次创建时初始化
+    line_height = 0
+
+    def __init__(self, rect: QRectF, event, week_view: "WeekView", parent=None):
+        super().__init__(rect, parent)
         self.event:ActivityEvent = event
-        self.view = view
+        self.week_view = week_view
+        self.layout_entry = None  # (所在组, 列号, 开始分钟, 结束分钟)，由 WeekView 在布局时设置
 
         self._border_color = QColor("#DDAE02")  
         self._border_width = 1.0
@@ -41,50 +77,46 @@ class ScheduleBlockItem(QGraphicsRectItem,QObject):
         self.text_color = palette.color(QPalette.Text)
         self.light_color = palette.color(QPalette.Highlight)
 
-        self.delete_button:DeleteButton = DeleteButton(parent=self.view.viewport())
-        self.delete_button.setFixedSize(20, 20)
-        self.delete_button.setStyleSheet("""
-			QPushButton {
-				background-color: rgba(255, 80, 80, 0.1);  /* 半透明红色背景 */
-				border: 1px solid rgba(255, 80, 80, 0.3);
-				border-radius: 6px;
-				min-width: 28px;
-				min-height: 28px;
-				padding: 0;
-				padding-top: -2px;  /* 关键对齐参数 */
-				color: #FF5050;
-				font-size: 14px;
-				font-weight: 300;
-				text-align: center;
-			}
-			QPushButton:hover {
-				background-color: rgba(255, 80, 80, 0.15);
-				border: 1px solid rgba(255, 80, 80, 0.5);
-				color: #E03C3C;
-				font-size: 16px;
-			}
-			QPushButton:pressed {
-				background-color: rgba(224, 60, 60, 0.2);
-				border: 1px solid rgba(224, 60, 60, 0.7);
-				color: #C03030;
-				padding-top: 1px;
-			}
-		""")
+        if ScheduleBlockItem.text_font is None:
+            ScheduleBlockItem.text_font = QFont(QApplication.font())
+            ScheduleBlockItem.text_font.setPointSize(9)
+            ScheduleBlockItem.line_height = QFontMetrics(ScheduleBlockItem.text_font).lineSpacing()
+        self._static_text: QStaticText = None  # 排好版的文字，尺寸变化后才重新排版
+        self._static_text_key = None
 
-        self.delete_button.bind_event(self.event)
-        self.delete_button.clicked.connect(self.on_delete_clicked)
-        self.delete_button.hide()
         self.setAcceptHoverEvents(True)
         self.setBrush(QBrush(self.background_color))
         self.setPen(self.text_color)
+        # 日程块内容缓存为像素图，滚动时无需重绘
+        self.setCacheMode(QGraphicsItem.DeviceCoordinateCache)
 
-    def on_delete_clicked(self):
-        log.info(f" weekview:on_delete_clicked 尝试删除事件：{self.event.title}")
-        self.delete_button.hide()
-        self.del_btn_clicked.emit(self.event)  # 发出删除信号        
+    def block_text(self, compact: bool) -> str:
+        """日程块显示的文字；空间不足时只显示标题"""
+        if compact:
+            return self.event.title
+        start = self.event.start_time[-5:]  # 提取 HH:mm
+        end = self.event.end_time[-5:]
+        return f"{self.event.title}({self.event.repeat_type})\n{start} - {end}"
+
+    def static_text(self) -> QStaticText:
+        """按当前尺寸排版文字并缓存（最多两行，宽度或高度不足时只显示标题）"""
+        rect = self.rect()
+        key = (rect.width(), rect.height())
+        if self._static_text is not None and self._static_text_key == key:
+            return self._static_text
+        compact = rect.width() < 70 or rect.height() < 2 * self.line_height + 4
+        text_option = QTextOption()
+        text_option.setWrapMode(QTextOption.WordWrap)
+        static_text = QStaticText(self.block_text(compact))
+        static_text.setTextFormat(Qt.PlainText)
+        static_text.setTextOption(text_option)
+        static_text.setTextWidth(max(rect.width() - 8, 1))
+        static_text.prepare(QTransform(), self.text_font)
+        self._static_text = static_text
+        self._static_text_key = key
+        return static_text
 
     def paint(self, painter, option, widget=None):
-        # 画背景
         # 绘制背景
         painter.setBrush(QBrush(self._bg_color))
         # 设置边框
@@ -96,52 +128,56 @@ class ScheduleBlockItem(QGraphicsRectItem,QObject):
         rect = self.rect().adjusted(1, 1, -1, -1)  # 向内缩进1像素
         painter.drawRoundedRect(rect, 5, 5)  # 5px圆角
 
-        # 设置字体
-        painter.setPen(self.text_color)
-        font = painter.font()
-        font.setPointSize(9)
-        painter.setFont(font)
-
-        # 显示 event 信息
-        title = self.event.title
-        start = self.event.start_time[-5:]  # 提取 HH:mm
-        end = self.event.end_time[-5:]
-        time_range = f"{start} - {end}"
-
-        # 文字显示（最多两行）
+        # 文字垂直居中，超出日程块的部分裁掉
+        static_text = self.static_text()
         text_rect = self.rect().adjusted(4, 2, -4, -2)  # 留边距
-        self.text = f"{title}({self.event.repeat_type})\n{time_range}"
-        text_option = QTextOption()
-        text_option.setAlignment(Qt.AlignVCenter)
-        text_option.setWrapMode(QTextOption.WordWrap)
-        painter.drawText(text_rect, self.text, text_option)
+        y = text_rect.top() + max((text_rect.height() - static_text.size().height()) / 2, 0)
+        painter.setClipRect(text_rect)
+        painter.setPen(self.text_color)
+        painter.setFont(self.text_font)
+        painter.drawStaticText(QPointF(text_rect.left(), y), static_text)
 
     def mousePressEvent(self, event):
-        self.clicked.emit(self.event)
+        # 接受按下事件，双击事件才会继续发给本图元（默认实现会忽略不可移动、不可选中的图元）
+        event.accept()
 
     def mouseDoubleClickEvent(self, event):
-        self.double_clicked.emit(self.event)
+        self.week_view.schedule_double_clicked.emit(self.event)
 
     def hoverEnterEvent(self, event):
         self.setBrush(QBrush(self.light_color))
-
-        # 显示按钮在右下角
-        scene = self.scene()
-        view = scene.views()[0]
-        block_br = self.sceneBoundingRect().bottomRight()
-        margin = 6
-        button_scene_pos = QPointF(
-            block_br.x() - self.delete_button.width() - margin,
-            block_br.y() - self.delete_button.height() - margin
-        )
-        button_view_pos = view.mapFromScene(button_scene_pos)
-        self.delete_button.move(button_view_pos)
-        self.delete_button.show()
-        self.delete_button.raise_()
+        self.week_view.show_block_actions(self)
 
     def hoverLeaveEvent(self, event):
         self.setBrush(QBrush(self.background_color))  # 鼠标离开时恢复
-        self.delete_button.hide()
+        self.week_view.hide_block_actions(self)
+
+
+class ScheduleSummaryItem(ScheduleBlockItem):
+    """列宽不足以并排显示时，代替一整组重叠日程的汇总块（显示为 +N），悬浮显示全部日程"""
+
+    def __init__(self, rect: QRectF, cluster: ScheduleCluster, week_view: "WeekView", parent=None):
+        super().__init__(rect, cluster.entries[0][0], week_view, parent)
+        self.cluster = cluster
+        self.setToolTip("\n".join(f"{event.title} {event.start_time}-{event.end_time}" for event, *_ in cluster.entries))
+
+    def block_text(self, compact: bool) -> str:
+        count = len(self.cluster.entries)
+        if compact:
+            return f"+{count}"
+        return f"{self.event.title} +{count - 1}\n{count} 个日程"
+
+    def mouseDoubleClickEvent(self, event):
+        # 汇总块代表整组日程，全部发出，由接收方决定打开哪一个
+        self.week_view.schedule_cluster_double_clicked.emit(tuple(entry[0] for entry in self.cluster.entries))
+
+    def hoverEnterEvent(self, event):
+        # 汇总块不提供删除按钮
+        self.setBrush(QBrush(self.light_color))
+
+    def hoverLeaveEvent(self, event):
+        self.setBrush(QBrush(self.background_color))
+
 
 class WeekDayColumn(QGraphicsRectItem):
     """单日列容器"""
@@ -160,11 +196,13 @@ class WeekView(QWidget):
     """周视图主组件"""
     schedule_area_clicked = Signal(object)
     schedule_del_btn_clicked = Signal(BaseEvent)
-    schedule_clicked = Signal(BaseEvent)
     schedule_double_clicked = Signal(BaseEvent)
+    schedule_cluster_double_clicked = Signal(tuple)  # 双击 +N 汇总块，发出组内全部日程
     time_clicked = Signal(QDateTime)  # 点击时间格子信号
     add_schedule = Signal(QDateTime)
     floating_button:FloatingButton = None
+    MIN_BLOCK_WIDTH = 40  # 并排日程块的最小宽度，更窄时折叠为 +N 汇总块
+    WEEK_CACHE_SIZE = 12  # 最多缓存的周数
     def __init__(self):
         super().__init__()
         self.start_hour = 0  # 开始时间
@@ -176,6 +214,28 @@ class WeekView(QWidget):
         self.mp = {"Mon": 1, "Tue": 2, "Wed": 3, "Thu": 4, "Fri": 5, "Sat": 6, "Sun": 7}
         self.schedule_block_items = list()
         self.events = None
+        self.schedule_clusters: list[ScheduleCluster] = []  # 当前周分好列的日程
+        self.collapsed_clusters: list[bool] = []  # 各组当前是否折叠为汇总块
+        # 按周一日期缓存已展开的activity发生（LRU），翻页时直接从内存重绘；任何事件变化都会清空缓存
+        self.week_cache: OrderedDict[QDate, list[ActivityEvent]] = OrderedDict()
+        self.prefetch_requests: dict[QDate, int] = {}  # 正在后台预取的周一日期 -> 请求id
+        # 空闲时预取前后相邻的周
+        self.prefetch_timer = QTimer(self)
+        self.prefetch_timer.setSingleShot(True)
+        self.prefetch_timer.setInterval(0)
+        self.prefetch_timer.timeout.connect(self.prefetch_adjacent_weeks)
+        Emitter.instance().events_changed_signal.connect(self.invalidate_week_cache)
+        # 固定的网格图元：只创建一次，切换周时重新标注日期，缩放时重新摆放
+        self.header_items: list[QGraphicsRectItem] = []
+        self.header_text_items: list[QGraphicsSimpleTextItem] = []
+        self.column_items: list[WeekDayColumn] = []
+        self.column_lines: list[QGraphicsLineItem] = []
+        self.hour_lines: list[QGraphicsLineItem] = []
+        # 缩放防抖：拖动窗口边缘时只在停下后重新布局一次
+        self.resize_timer = QTimer(self)
+        self.resize_timer.setSingleShot(True)
+        self.resize_timer.setInterval(50)
+        self.resize_timer.timeout.connect(self.update_view_geometry)
 
         palette = QApplication.palette()
         self.background_color = palette.color(QPalette.Base)
@@ -183,6 +243,9 @@ class WeekView(QWidget):
 
         self.init_ui()
         self.setup_time_axis()
+        self.setup_day_headers()
+        self.setup_day_columns()
+        self.layout_grid()
         self.current_week = QDate.currentDate().weekNumber()[0]
         self.current_week_date = QDate.currentDate()
         self.update_week(self.current_week_date.addDays(1 - self.current_week_date.dayOfWeek()))
@@ -303,6 +366,72 @@ class WeekView(QWidget):
         self.main_view.setDragMode(QGraphicsView.ScrollHandDrag)  # 支持拖拽滚动
         self.main_layout.addWidget(self.main_view)    
 
+        # 所有日程块共用一个删除按钮，悬浮时移动到对应日程块的右下角
+        self.hovered_block: ScheduleBlockItem = None
+        self.block_delete_button:DeleteButton = DeleteButton(parent=self.main_view.viewport())
+        self.block_delete_button.setFixedSize(20, 20)
+        self.block_delete_button.setStyleSheet("""
+			QPushButton {
+				background-color: rgba(255, 80, 80, 0.1);  /* 半透明红色背景 */
+				border: 1px solid rgba(255, 80, 80, 0.3);
+				border-radius: 6px;
+				min-width: 28px;
+				min-height: 28px;
+				padding: 0;
+				padding-top: -2px;  /* 关键对齐参数 */
+				color: #FF5050;
+				font-size: 14px;
+				font-weight: 300;
+				text-align: center;
+			}
+			QPushButton:hover {
+				background-color: rgba(255, 80, 80, 0.15);
+				border: 1px solid rgba(255, 80, 80, 0.5);
+				color: #E03C3C;
+				font-size: 16px;
+			}
+			QPushButton:pressed {
+				background-color: rgba(224, 60, 60, 0.2);
+				border: 1px solid rgba(224, 60, 60, 0.7);
+				color: #C03030;
+				padding-top: 1px;
+			}
+		""")
+        self.block_delete_button.clicked.connect(self.on_block_delete_clicked)
+        self.block_delete_button.hide()
+        # 滚动后按钮位置失效，直接隐藏
+        self.main_view.verticalScrollBar().valueChanged.connect(lambda _: self.hide_block_actions())
+        self.main_view.horizontalScrollBar().valueChanged.connect(lambda _: self.hide_block_actions())
+
+    def show_block_actions(self, block: ScheduleBlockItem):
+        """在悬浮的日程块右下角显示删除按钮"""
+        self.hovered_block = block
+        block_br = block.sceneBoundingRect().bottomRight()
+        margin = 6
+        button_scene_pos = QPointF(
+            block_br.x() - self.block_delete_button.width() - margin,
+            block_br.y() - self.block_delete_button.height() - margin
+        )
+        self.block_delete_button.bind_event(block.event)
+        self.block_delete_button.move(self.main_view.mapFromScene(button_scene_pos))
+        self.block_delete_button.show()
+        self.block_delete_button.raise_()
+
+    def hide_block_actions(self, block: ScheduleBlockItem = None):
+        """隐藏删除按钮；指定 block 时只有它仍是当前悬浮的日程块才隐藏"""
+        if block is not None and block is not self.hovered_block:
+            return
+        self.hovered_block = None
+        self.block_delete_button.hide()
+
+    def on_block_delete_clicked(self):
+        block = self.hovered_block
+        self.hide_block_actions()
+        if block is None:
+            return
+        log.info(f" weekview:on_delete_clicked 尝试删除事件：{block.event.title}")
+        self.schedule_del_btn_clicked.emit(block.event)  # 发出删除信号
+
     # 上周按钮点击事件
     def on_prev_week_click(self, event):
         if event.button() == Qt.LeftButton:
@@ -393,77 +522,86 @@ class WeekView(QWidget):
                 self.main_scene.addItem(item)
 
     def update_week(self, monday_date: QDate):
-        """更新显示指定周"""
+        """更新显示指定周：只重新标注已有网格的日期，再加载该周日程"""
         self.clear_schedule_blocks()
         self.update_week_display(monday_date)
-        self.setup_time_axis()  # 重新绘制时间轴
         
         # 计算周日期范围
         self.monday = monday_date
         self.dates = [self.monday.addDays(i) for i in range(7)]
         
-        # 创建日期列头
-        self.setup_day_headers()
-        
-        # 创建日期列
-        self.setup_day_columns()
+        # 更新日期列头与各列、各时间格子的日期
+        weekday_names = ['周一','周二','周三','周四','周五','周六','周日']
+        for i, date in enumerate(self.dates):
+            self.header_text_items[i].setText(f"{date.month()}月{date.day()}日  {weekday_names[i]}")
+            self.column_items[i].date = date
+            for h in range(self.time_slot_count):
+                self.cell_map[(i + 1, self.start_hour + h)].date = date
         
         # 添加已有日程
         self.load_schedules()
-        
-        # 设置主场景的大小
-        total_width = 60 + self.day_width * 7  # 时间轴宽度 + 7天宽度
-        total_height = 30 + self.time_slot_count * self.hour_height  # 30是表头高度
-        self.main_scene.setSceneRect(0, 0, total_width, total_height)
 
     def setup_day_headers(self):
-        """创建日期表头"""
-        header_height = 30
-        
-        for i, date in enumerate(self.dates):
-            rect = QRectF(60 + i*self.day_width, 0, self.day_width, header_height)
-            header = QGraphicsRectItem(rect)
+        """创建日期表头（只在初始化时调用一次，日期文本由 update_week 设置）"""
+        for i in range(7):
+            header = QGraphicsRectItem()
             header.setBrush(QBrush(self.background_color))
             self.main_scene.addItem(header)
             
             # 添加日期文本
-            text = f"{date.month()}月{date.day()}日  {['周一','周二','周三','周四','周五','周六','周日'][i]}"
-            text_item = QGraphicsSimpleTextItem(text, header)
+            text_item = QGraphicsSimpleTextItem(header)
             text_item.setFont(QFont("Microsoft YaHei", 9))
             text_item.setBrush(QBrush(self.text_color))
-            text_item.setPos(rect.x() + 12, rect.y() + 5)
+            self.header_items.append(header)
+            self.header_text_items.append(text_item)
 
     def setup_day_columns(self):
-        """创建日期列"""
-        start_y = 30  # 表头高度
-        
+        """创建日期列、时间格子和分隔线（只在初始化时调用一次，位置由 layout_grid 设置）"""
+        today = QDate.currentDate()
+        line_pen = QPen(self.text_color)  # 统一的灰色分割线颜色
+        line_pen.setWidth(1)  # 统一的线宽，防止出现不同粗细
         for i in range(7):
-            col_rect = QRectF(60 + i*self.day_width, start_y, self.day_width, self.time_slot_count * self.hour_height)
-            col = WeekDayColumn(col_rect, self.dates[i])
+            col = WeekDayColumn(QRectF(), today)
             self.main_scene.addItem(col)
+            self.column_items.append(col)
             
             # 添加时间格子
             for h in range(self.time_slot_count):
-                cell_x = 60 + i * self.day_width
-                cell_y = start_y + h * self.hour_height
-                cell_rect = QRectF(0, 0, self.day_width, self.hour_height)
-                cell = ScheduleAreaItem(QTime(h,0), QTime(h+1, 0), self.monday.addDays(i) ,cell_rect)
+                cell = ScheduleAreaItem(QTime(h,0), QTime(h+1, 0), today, QRectF())
                 cell.double_clicked.connect(partial(self.schedule_area_clicked.emit))
-                cell.setPos(cell_x, cell_y)
                 self.main_scene.addItem(cell)      
                 self.cell_map[(i + 1, self.start_hour + h)] = cell         
                     
-            line_pen = QPen(self.text_color)  # 统一的灰色分割线颜色
-            line_pen.setWidth(1)  # 统一的线宽，防止出现不同粗细
-            self.main_scene.addLine(
-                60 + i * self.day_width, start_y,  # 从每一列的左边缘开始
-                60 + i * self.day_width, start_y + self.time_slot_count * self.hour_height,  # 到每列的底边缘
-                line_pen  # 使用统一的笔刷设置
-            )        
+            self.column_lines.append(self.main_scene.addLine(QLineF(), line_pen))
         # 添加贯穿所有列的小时分隔线（与时间轴对齐）
         for h in range(self.time_slot_count + 1):
+            self.hour_lines.append(self.main_scene.addLine(QLineF(), QPen(QColor(180, 180, 180, 80))))
+
+    def layout_grid(self):
+        """按当前的 day_width 摆放表头、日期列、时间格子和分隔线"""
+        header_height = 30
+        start_y = header_height  # 表头高度
+        column_height = self.time_slot_count * self.hour_height
+        for i in range(7):
+            x = 60 + i * self.day_width
+            rect = QRectF(x, 0, self.day_width, header_height)
+            self.header_items[i].setRect(rect)
+            self.header_text_items[i].setPos(rect.x() + 12, rect.y() + 5)
+            self.column_items[i].setRect(QRectF(x, start_y, self.day_width, column_height))
+            for h in range(self.time_slot_count):
+                cell = self.cell_map[(i + 1, self.start_hour + h)]
+                cell.setRect(QRectF(0, 0, self.day_width, self.hour_height))
+                cell.setPos(x, start_y + h * self.hour_height)
+            # 从每一列的左边缘开始，到每列的底边缘
+            self.column_lines[i].setLine(x, start_y, x, start_y + column_height)
+        for h, line in enumerate(self.hour_lines):
             y = start_y + h * self.hour_height
-            self.main_scene.addLine(30, y, 60 + self.day_width * 7, y, QPen(QColor(180, 180, 180, 80)))
+            line.setLine(30, y, 60 + self.day_width * 7, y)
+        
+        # 设置主场景的大小
+        total_width = 60 + self.day_width * 7  # 时间轴宽度 + 7天宽度
+        total_height = header_height + column_height  # 30是表头高度
+        self.main_scene.setSceneRect(0, 0, total_width, total_height)
 
     def handle_time_click(self, date, hour, event):
         """处理时间格子点击"""
@@ -480,55 +618,114 @@ class WeekView(QWidget):
             menu.exec(event.screenPos())
 
     def load_schedules(self):
-        """加载周的日程"""
+        """加载周的日程，优先使用缓存，未命中时才同步查询"""
         self.clear_schedule_blocks()
-        self.events = []
         first_date = self.dates[0].toString("yyyy-MM-dd")
         end_date = self.dates[-1].toString("yyyy-MM-dd")
-        self.events = EventSQLManager.get_activities_between_twodays(first_date,end_date)
-        if(len(self.events) == 0):
-            log.info(f"Weekview load_schedules week{self.week_num}({first_date}~{end_date}): 没有找到任何活动日程")
+        if self.monday in self.week_cache:
+            self.week_cache.move_to_end(self.monday)
+            self.events = self.week_cache[self.monday]
         else:
-            log.info(f"Weekview load_schedules week{self.week_num}({first_date}~{end_date}): 找到 {len(self.events)} 条活动日程\n"
-                    +"\n".join(f"- {event.title} @ {event.start_date}-{event.end_date}" for event in self.events))
-            
-        for event in self.events:
-            self.add_schedule_item(event)
-
-    def add_schedule_item(self, event:ActivityEvent):
-        """添加日程块到视图"""
-        start_t = QTime.fromString(event.start_time, "HH:mm")
-        end_t = QTime.fromString(event.end_time, "HH:mm")
-
-        dt = QDateTime.fromString(event.datetime, "yyyy-MM-dd HH:mm")
-        date = dt.date()
-        weekday = date.dayOfWeek()
-        start_hour = start_t.hour()
-        key = (weekday, start_hour)        
-
-        cell:ScheduleAreaItem = self.cell_map.get(key)
-        # 判断是否在当前视图范围
-        if not cell:
-            log.error(f"添加的日程:{event.title} (weekday, start_hour) = {key} 找不到对应的时间格子")
-            return
-        # 计算局部坐标下的 y 和高度
-        start_min = start_t.minute()
-        y = (start_min / 60) * self.hour_height
-        duration_min = max(start_t.secsTo(end_t) // 60, 40)
-        height = (duration_min / 60) * self.hour_height
-
-        rect = QRectF(0, 0, self.day_width - 4, height)
-        block = ScheduleBlockItem(rect, event, self.main_view)
-        block.double_clicked.connect(lambda e: self.schedule_double_clicked.emit(e))
+            self.events = EventSQLManager.get_activities_between_twodays(first_date,end_date)
+            if(len(self.events) == 0):
+                log.info(f"Weekview load_schedules week{self.week_num}({first_date}~{end_date}): 没有找到任何活动日程")
+            else:
+                log.info(f"Weekview load_schedules week{self.week_num}({first_date}~{end_date}): 找到 {len(self.events)} 条活动日程\n"
+                        +"\n".join(f"- {event.title} @ {event.start_date}-{event.end_date}" for event in self.events))
+            self.cache_week(self.monday, self.events)
+        self.schedule_clusters = self.pack_schedules(self.events)
+        self.build_schedule_blocks()
+        self.prefetch_timer.start()
+
+    def reload_schedules(self):
+        """事件变化后丢弃缓存并重新加载当前周"""
+        self.invalidate_week_cache()
+        self.load_schedules()
 
+    def cache_week(self, monday: QDate, events: list[ActivityEvent]):
+        """放入一周的activity发生，超过容量时淘汰最久未使用的周"""
+        self.week_cache[monday] = list(events)
+        self.week_cache.move_to_end(monday)
+        while len(self.week_cache) > self.WEEK_CACHE_SIZE:
+            self.week_cache.popitem(last=False)
+
+    def prefetch_adjacent_weeks(self):
+        """在后台数据库线程中预取上一周和下一周，结果到达后放入缓存"""
+        for step in (7, -7):
+            monday = self.monday.addDays(step)
+            if monday in self.week_cache or monday in self.prefetch_requests:
+                continue
+            self.prefetch_requests[monday] = Emitter.instance().request_activities_between_twodays_signal(
+                monday.toString("yyyy-MM-dd"), monday.addDays(6).toString("yyyy-MM-dd"),
+                lambda events, monday=monday: self.receive_prefetched_week(monday, events))
+
+    def receive_prefetched_week(self, monday: QDate, events: tuple[ActivityEvent]):
+        self.prefetch_requests.pop(monday, None)
+        if monday not in self.week_cache:
+            self.cache_week(monday, events)
+            log.info(f"预取 {monday.toString('yyyy-MM-dd')} 所在周的日程完成，共 {len(events)} 条")
+
+    def invalidate_week_cache(self):
+        """事件被增删改后清空周缓存，并丢弃尚未返回的预取结果（它们可能是修改前的数据）"""
+        for request_id in self.prefetch_requests.values():
+            Emitter.instance().cancel_backend_request(request_id)
+        self.prefetch_requests.clear()
+        self.week_cache.clear()
+
+    def pack_schedules(self, events: list[ActivityEvent]) -> list[ScheduleCluster]:
+        """按天把日程分组并分配列，结果与视图宽度无关，缩放时直接复用"""
+        intervals_by_day = defaultdict(list)
+        for event in events:
+            date = QDate.fromString(event.datetime[:10], "yyyy-MM-dd")
+            start_t = QTime.fromString(event.start_time, "HH:mm")
+            end_t = QTime.fromString(event.end_time, "HH:mm")
+            # 判断是否在当前视图范围
+            if date not in self.dates or not start_t.isValid():
+                log.error(f"添加的日程:{event.title} ({event.datetime}) 不在当前周视图范围内")
+                continue
+            start = start_t.hour() * 60 + start_t.minute()
+            duration_min = max(start_t.secsTo(end_t) // 60, 40)
+            intervals_by_day[date.dayOfWeek()].append((start, start + duration_min, event))
+        clusters = []
+        for weekday, intervals in sorted(intervals_by_day.items()):
+            clusters += pack_day_schedules(weekday, intervals)
+        return clusters
+
+    def cluster_collapsed(self, cluster: ScheduleCluster) -> bool:
+        """并排的列宽小于 MIN_BLOCK_WIDTH 时整组折叠为一个汇总块"""
+        return cluster.columns > 1 and (self.day_width - 4) / cluster.columns < self.MIN_BLOCK_WIDTH
+
+    def schedule_block_geometry(self, cluster: ScheduleCluster, column: int, columns: int, start: int, end: int) -> tuple[QRectF, QPointF]:
+        """根据当前的格子尺寸计算日程块的 (局部矩形, 场景位置)"""
+        column_width = (self.day_width - 4) / columns
+        x = 60 + (cluster.weekday - 1) * self.day_width + 2 + column * column_width
+        y = 30 + (start / 60 - self.start_hour) * self.hour_height
+        height = (end - start) / 60 * self.hour_height
+        return QRectF(0, 0, column_width, height), QPointF(x, y)
+
+    def add_block_item(self, block: ScheduleBlockItem, layout_entry: tuple):
+        """按布局信息摆放日程块并加入场景"""
+        block.layout_entry = layout_entry
+        rect, pos = self.schedule_block_geometry(*layout_entry)
+        block.setRect(rect)
         block.setZValue(1)  # 保证高于所有 cell（它们默认 Z=0）
-        block.setPos(cell.pos() + QPointF(2, y))  # 手动设置位置
+        block.setPos(pos)  # 手动设置位置
         self.main_scene.addItem(block)
         self.schedule_block_items.append(block)
-        block.del_btn_clicked.connect(lambda e: self.schedule_del_btn_clicked.emit(e))       
+
+    def build_schedule_blocks(self):
+        """按当前宽度为每组日程创建日程块，列宽不足的组只创建一个汇总块"""
+        self.collapsed_clusters = [self.cluster_collapsed(cluster) for cluster in self.schedule_clusters]
+        for cluster, collapsed in zip(self.schedule_clusters, self.collapsed_clusters):
+            if collapsed:
+                self.add_block_item(ScheduleSummaryItem(QRectF(), cluster, self), (cluster, 0, 1, cluster.start, cluster.end))
+                continue
+            for event, column, start, end in cluster.entries:
+                self.add_block_item(ScheduleBlockItem(QRectF(), event, self), (cluster, column, cluster.columns, start, end))
         
     def clear_schedule_blocks(self):
         log.info("clear_schedule_blocks被调用")
+        self.hide_block_actions()
         if not self.schedule_block_items:
             log.info("clear_schedule_blocks: 没有需要移除的日程块")
             return
@@ -543,13 +740,28 @@ class WeekView(QWidget):
         self.schedule_block_items.clear()
         log.info("clear_schedule_blocks: 日程块移除完成")
 
+    def relayout_schedule_blocks(self):
+        """按新的格子尺寸重新摆放已加载的日程块，不重新查询数据库"""
+        self.hide_block_actions()
+        if [self.cluster_collapsed(cluster) for cluster in self.schedule_clusters] != self.collapsed_clusters:
+            # 有组的折叠状态发生变化，用已分好列的数据重建日程块
+            self.clear_schedule_blocks()
+            self.build_schedule_blocks()
+            return
+        for block in self.schedule_block_items:
+            rect, pos = self.schedule_block_geometry(*block.layout_entry)
+            block.setRect(rect)
+            block.setPos(pos)
+
     def resizeEvent(self, event):
         super().resizeEvent(event)
-        self.recalculate_dimensions()
         #self.main_view.fitInView(self.main_scene.sceneRect(), Qt.IgnoreAspectRatio)
-        self.main_view.setHorizontalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        self.main_view.setVerticalScrollBarPolicy(Qt.ScrollBarAsNeeded)
-        log.info(f"Scene rect:{self.main_scene.sceneRect()}")
+        self.resize_timer.start()
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        # 显示时立即按当前大小布局，避免等待防抖定时器
+        self.resize_timer.stop()
         self.update_view_geometry()
 
     def recalculate_dimensions(self):
@@ -561,12 +773,15 @@ class WeekView(QWidget):
         self.main_scene.setSceneRect(0, 0, view_width, current_rect.height())
 
     def update_view_geometry(self):
-        """根据新的大小更新格子和其他组件的位置"""
-        self.main_scene.clear()  # 清空场景，重新绘制
-        self.setup_time_axis()  # 重新绘制时间轴
-        self.setup_day_headers()  # 重新绘制日期头
-        self.setup_day_columns()  # 重新绘制日期列
-        self.load_schedules()  # 重新加载日程
+        """根据新的大小更新格子和日程块的位置（由防抖定时器触发，只用已加载的数据）"""
+        day_width = self.day_width
+        self.recalculate_dimensions()
+        log.info(f"Scene rect:{self.main_scene.sceneRect()}")
+        # 只改变了高度时格子与日程块的位置不变
+        if day_width == self.day_width:
+            return
+        self.layout_grid()  # 重新摆放已有网格
+        self.relayout_schedule_blocks()
 
 
 class ScheduleAreaItem(QObject,QGraphicsRectItem):
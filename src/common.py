@@ -5,13 +5,14 @@ from PySide6.QtWidgets import (QApplication, QStyleFactory, QMainWindow, QWidget
 							QSizePolicy, QFrame, QDateTimeEdit, QGraphicsDropShadowEffect, QCalendarWidget,
 							QScrollBar, QStyledItemDelegate, QTableView, QInputDialog, QHeaderView, QScrollArea,
 							QDialog, QTextEdit, QStyleOptionViewItem, QStyle, QAbstractItemView, QGraphicsSimpleTextItem,
-          					QGraphicsView, QGraphicsScene, QGraphicsRectItem, QSplitter, QGraphicsLineItem, QGraphicsItemGroup,QToolTip,QGraphicsItem,QDateEdit)
+          					QGraphicsView, QGraphicsScene, QGraphicsRectItem, QSplitter, QGraphicsLineItem, QGraphicsItemGroup,QToolTip,QGraphicsItem,QDateEdit,
+							QListView, QStyleOptionButton)
 from PySide6.QtCore import (QPropertyAnimation, QEasingCurve, Qt, QDate, QTime, QDateTime, Signal, Slot, QSize, QObject,
 							QPoint, QTimer, QEvent, QPointF, QPersistentModelIndex, QRect, QModelIndex, QFile, QRectF,
-							QFileInfo, QLineF,QCoreApplication)
+							QFileInfo, QLineF,QCoreApplication, QThread, QAbstractListModel)
 from PySide6.QtGui import (QIcon, QAction, QPixmap, QColor, QLinearGradient, QPainter, QMouseEvent,
 						   QPainter, QFontMetrics, QTextCharFormat, QPen, QCursor, QFont, QPalette, QBrush,
-						   QImageReader,QShortcut,QKeySequence, QTextOption)
+						   QImageReader,QShortcut,QKeySequence, QTextOption, QStaticText, QTransform)
 import logging
 import sys
 import os
@@ -20,5 +21,5 @@ from tkinter import filedialog
 from datetime import datetime, timedelta
 import platform
 import time
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 import json
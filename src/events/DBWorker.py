@@ -0,0 +1,65 @@
+from src.common import *
+from src.Emitter import Emitter
+from src.events.EventManager import handle_request, EventReadManager
+
+log = logging.getLogger(__name__)
+
+
+class DBWorker(QObject):
+	"""
+	后台数据库线程中的工作对象：按顺序执行前端发来的查询请求，
+	将结果连同请求id一起送回GUI线程，由 Emitter 分发给对应的回调。
+	查询使用本线程自己的只读连接（EventReadManager），不与GUI线程争用连接
+	"""
+	result_ready: Signal = Signal(int, object)  # (请求id, 查询结果)
+
+	@Slot(int, object)
+	def run_request(self, request_id: int, request: tuple):
+		try:
+			EventReadManager.ensure_connection()
+			result = handle_request(request, EventReadManager)
+		except Exception as e:
+			log.error(f"DBWorker.run_request:执行{request[0]}请求失败（请求id={request_id}），Error:{e}")
+			result = ()
+		self.result_ready.emit(request_id, result)
+
+
+_db_thread: QThread = None
+_db_worker: DBWorker = None
+
+
+def start_db_worker():
+	"""
+	启动后台数据库线程，并连接 Emitter 的异步请求通道，程序退出时自动结束线程
+	"""
+	global _db_thread, _db_worker
+	if _db_thread is not None:
+		return
+	_db_thread = QThread()
+	_db_thread.setObjectName("DBWorkerThread")
+	_db_worker = DBWorker()
+	_db_worker.moveToThread(_db_thread)
+	# 两端对象属于不同线程，信号自动以队列方式跨线程传递
+	Emitter.instance().db_request_signal.connect(_db_worker.run_request)
+	_db_worker.result_ready.connect(Emitter.instance().receive_backend_result)
+	# finished 在后台线程结束前由该线程发出，直接连接保证只读连接在打开它的线程中关闭
+	_db_thread.finished.connect(EventReadManager.close_connection, Qt.DirectConnection)
+	app = QCoreApplication.instance()
+	if app is not None:
+		app.aboutToQuit.connect(stop_db_worker)
+	_db_thread.start()
+	log.info("后台数据库线程已启动")
+
+
+def stop_db_worker():
+	"""
+	等待正在执行的请求完成后结束后台数据库线程
+	"""
+	global _db_thread, _db_worker
+	if _db_thread is None:
+		return
+	_db_thread.quit()
+	_db_thread.wait()
+	_db_thread = None
+	_db_worker = None
+	log.info("后台数据库线程已结束")
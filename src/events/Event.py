@@ -1,8 +1,15 @@
 from datetime import datetime, timedelta
 import logging
 import json
+import heapq
+import copy
 log = logging.getLogger(__name__)
 
+# 重复星期的英文缩写与 date.weekday() 的对应关系
+WEEKDAY_INDEX = {"Mon": 0, "Tue": 1, "Wed": 2, "Thu": 3, "Fri": 4, "Sat": 5, "Sun": 6}
+# 各重复类型相邻两次发生之间的天数
+REPEAT_STRIDE = {"每周": 7, "每两周": 14}
+
 class BaseEvent:
 	"""
 	事件基类
@@ -107,67 +114,85 @@ class ActivityEvent(BaseEvent):
 		"""
 		将重复日程扩展为多个单日日程
 		"""
-		# 转换为日期对象
-		result = []
+		start = datetime.strptime(range_start, "%Y-%m-%d").date()
+		end = datetime.strptime(range_end, "%Y-%m-%d").date()
+		if start > datetime.strptime(self.end_date, "%Y-%m-%d").date() or end < datetime.strptime(self.start_date, "%Y-%m-%d").date():
+			log.error(f"{self.id} activity事件展开失败，起止日期错误")
+			return []
+		return list(self.iter_expand(range_start, range_end))
+
+	def iter_expand(self, range_start:str, range_end:str):
+		"""
+		惰性地将重复日程扩展为单日日程，按日期升序逐个生成
+		"""
+		for date_obj in self.occurrence_dates(range_start, range_end):
+			yield self._create_occurrence(date_obj)
+
+	def occurrence_dates(self, range_start:str, range_end:str):
+		"""
+		惰性生成日程在 [range_start, range_end] 内的发生日期（date对象，升序）。
+		对每个重复星期直接定位到区间内第一次出现，之后按 7 天（每周）或 14 天（每两周）跳跃，
+		代价只与发生次数有关，与区间天数无关
+		"""
 		start = datetime.strptime(range_start, "%Y-%m-%d").date()
 		end = datetime.strptime(range_end, "%Y-%m-%d").date()
 		base_start = datetime.strptime(self.start_date, "%Y-%m-%d").date()
 		base_end = datetime.strptime(self.end_date, "%Y-%m-%d").date()
-		repeat_days = json.loads(self.repeat_days)
 		if start > base_end or end < base_start:
-			log.error(f"{self.id} activity事件展开失败，起止日期错误")
-			return result
+			return
 		if self.repeat_type == "不重复":
-			event = self._create_occurrence(base_start)
-			result.append(event)
-		elif self.repeat_type == "每周":
-			current = max(start,base_start)
-			while current <= min(end, base_end):
-				if self._is_valid_recurrence_day(current, repeat_days):
-					result.append(self._create_occurrence(current))
-				current += timedelta(days=1)
-		elif self.repeat_type == "每两周":
-			current = max(start,base_start)
-			while current <= min(end, base_end):
-				delta_days = (current - base_start).days
-				week_index = delta_days // 7
-				if week_index % 2 == 0 and self._is_valid_recurrence_day(current, repeat_days):
-					result.append(self._create_occurrence(current))
-				current += timedelta(days=1)
-		else:
+			yield base_start
+			return
+		if self.repeat_type not in REPEAT_STRIDE:
 			log.error(f"错误的重复类型，无法展开{self.id} activity事件")
-		return result
-
+			return
+		stride = REPEAT_STRIDE[self.repeat_type]
+		first_day = max(start, base_start)
+		last_day = min(end, base_end)
+		streams = []
+		for weekday in self.repeat_weekdays():
+			first = first_day + timedelta(days=(weekday - first_day.weekday()) % 7)
+			# 每两周的日程只在从 start_date 起算的偶数周发生
+			if stride == 14 and (first - base_start).days // 7 % 2 == 1:
+				first += timedelta(days=7)
+			streams.append(self._stride_dates(first, last_day, stride))
+		# 多个重复星期的日期流各自有序，归并后整体有序
+		yield from heapq.merge(*streams)
+
+	def repeat_weekdays(self) -> tuple[int]:
+		"""
+		解析 repeat_days，返回重复的星期（0为周一）。结果按 repeat_days 的内容缓存，只解析一次
+		"""
+		cached = getattr(self, "_repeat_weekdays", None)
+		if cached is not None and cached[0] == self.repeat_days:
+			return cached[1]
+		weekdays = set()
+		for day in json.loads(self.repeat_days) or ():
+			if day in WEEKDAY_INDEX:
+				weekdays.add(WEEKDAY_INDEX[day])
+			else:
+				log.error(f"{self.id} activity事件的重复星期 {day} 无法识别")
+		self._repeat_weekdays = (self.repeat_days, tuple(sorted(weekdays)))
+		return self._repeat_weekdays[1]
+
+	@staticmethod
+	def _stride_dates(first, last, stride: int):
+		"""
+		从 first 开始每隔 stride 天生成一个日期，直到超过 last
+		"""
+		step = timedelta(days=stride)
+		while first <= last:
+			yield first
+			first += step
 
-	def _create_occurrence(self, date_obj:datetime) -> "ActivityEvent":
+	def _create_occurrence(self, date_obj) -> "ActivityEvent":
 		"""
-		创建子日程
+		创建子日程，直接浅拷贝原日程，不再重新解析参数。date_obj 可为 date 对象或 "yyyy-MM-dd" 字符串
 		"""
-		occ = ActivityEvent(
-				self.title,
-				self.start_time,
-				self.end_time,
-				self.start_date,
-				self.end_date,
-				self.notes,
-				self.importance,
-				self.repeat_type,
-				json.loads(self.repeat_days)	
-		)
-		# 记录原始id，便于后续从扩张出的事件中修改原重复事件
-		occ.id = self.id
+		if isinstance(date_obj, str):
+			date_obj = datetime.strptime(date_obj, "%Y-%m-%d")
+		occ = copy.copy(self)
+		# 记录原始id，便于后续从扩张出的事件中修改原重复事件（拷贝时已保留）
 		# 记录某天发生的事件（开始时间），与ddl的datetime保持一致，方便复用
 		occ.datetime =f"{date_obj.strftime('%Y-%m-%d')} {self.start_time}"
 		return occ
-	
-	def _is_valid_recurrence_day(self, date_obj:datetime, repeat_days: list[str]) -> bool:
-		"""
-		判断某天是否为重复事件之一
-		"""
-		weekday_map = {
-		0: "Mon", 1: "Tue", 2: "Wed", 3: "Thu",
-		4: "Fri", 5: "Sat", 6: "Sun"
-		}
-		weekday_str = weekday_map[date_obj.weekday()]
-		return weekday_str in repeat_days
-	
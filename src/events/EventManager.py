@@ -1,6 +1,9 @@
 import os
 import sqlite3
+import heapq
+import itertools
 from calendar import monthrange
+from collections import OrderedDict
 from common import *
 from src.Emitter import Emitter
 from src.events.Event import *
@@ -34,27 +37,8 @@ class EventFactory:
 				# 此时纯粹为创建新事件
 				EventSQLManager.add_event(n_event)
 				if isinstance(n_event,DDLEvent):
-					# 如果是提醒类ddl，更新最新事件
-					now_time = QDateTime.currentDateTime()
-					now_time = now_time.toString("yyyy-MM-dd HH:mm")
-					log.info(f"EventFactory.create:现在时间是 {now_time}")
-					if now_time > n_event.datetime:
-						log.info(f"EventFactory.create:现在时间是 {now_time} 添加新事件比最新事件更晚，不更新最新事件")
-					elif EventSQLManager.latest_ddlevent is None:
-						log.info(f"EventFactory.create:没有最新的DDL事件，添加新事件:title：{n_event.title}; notes:{n_event.notes}")
-						EventSQLManager.latest_ddlevent = n_event
-						Emitter.instance().send_notice_signal((n_event,"create"))
-						Emitter.instance().send_notice_signal((n_event,"create"))
-					elif n_event.datetime < EventSQLManager.latest_ddlevent.datetime:
-						log.info(f"EventFactory.create:添加新事件比最新事件更早，更新最新事件为新事件:title：{n_event.title}; notes:{n_event.notes}")
-						EventSQLManager.latest_ddlevent = n_event
-						Emitter.instance().send_notice_signal((n_event,"update"))
-					elif n_event.datetime > now_time >= EventSQLManager.latest_ddlevent.datetime:
-						log.info(f"EventFactory.create:旧事件已经失效，更新最新事件为新事件:title：{n_event.title}; notes:{n_event.notes}")
-						EventSQLManager.latest_ddlevent = n_event
-						Emitter.instance().send_notice_signal((n_event,"update"))
-					else:
-						log.info("EventFactory.create:添加新事件比最新事件更晚，不更新最新事件")
+					# 如果是提醒类ddl，加入提醒调度
+					Emitter.instance().send_notice_signal(([n_event], "upsert"))
 					log.info(f"EventFactory.create:成功添加 {n_event.title} 到 {n_event.table_name()} 表中")
 			elif id is not None:
 				# 此时返回有id的事件，相当于根据id找出原事件
@@ -69,7 +53,7 @@ class EventSQLManager:
 	DB_PATH = None
 	conn = None
 	cursor = None
-	latest_ddlevent = None
+	fts_enabled = False		# 当前SQLite是否支持FTS5全文索引（不支持时搜索退化为LIKE）
 	# 字段类型映射表：用于根据字段名自动生成 SQL 建表语句
 	TYPE_MAP:dict = {
 		"title": "TEXT",              # 事件标题
@@ -91,21 +75,48 @@ class EventSQLManager:
 		"taskevents": "Task",
 		"activityevents": "Activity",
 	}
+	# 各事件表的列顺序，须与对应Event构造函数的参数顺序一致（查询时 row[1:] 直接作为参数）
+	TABLE_COLUMNS:dict = {
+		"ddlevents": ("title", "datetime", "notes", "advance_time", "importance", "done"),
+		"activityevents": ("title", "start_time", "end_time", "start_date", "end_date", "notes",
+						"importance", "repeat_type", "repeat_days"),
+	}
+	# 数据库结构迁移表：(目标版本号, 迁移函数名)，按版本号升序排列，版本号记录在 PRAGMA user_version 中
+	MIGRATIONS:list = [
+		(1, "_migrate_v1_date_indexes"),
+		(2, "_migrate_v2_fts_index"),
+		(3, "_migrate_v3_activity_occurrences"),
+		(4, "_migrate_v4_day_counts"),
+	]
+	SCHEMA_VERSION = MIGRATIONS[-1][0]
+	# 查询结果缓存（LRU）：键为 (查询种类, 日期范围...)，值为事件列表
+	QUERY_CACHE_SIZE = 64
+	query_cache: OrderedDict = OrderedDict()
+	write_counter = 0			# 本进程内每次写入数据库后加一
+	cache_version = None		# 缓存内容对应的 (write_counter, PRAGMA data_version)
 	# === 初始化数据库连接 ===
 	@classmethod
 	def init_connection(cls, db_path: str):
 		"""初始化数据库连接"""
 		cls.DB_PATH = db_path
+		# 该连接只在GUI线程使用，后台数据库线程通过 EventReadManager 打开自己的只读连接
+		# 两个连接都保留 check_same_thread 检查，每个连接只属于一个线程，因此不需要加锁
 		cls.conn = sqlite3.connect(db_path)
 		cls.cursor = cls.conn.cursor()
+		# WAL 模式下后台线程的读与GUI线程的写互不阻塞
+		cls.cursor.execute("PRAGMA journal_mode = WAL")
+		cls.query_cache.clear()
+		cls.cache_version = None
 		# 未创建全局id表就新创建一个
 		cls.init_global_id_table()
-		# 更新最新事件
-		now_time = QDateTime.currentDateTime()
-		now_time = now_time.toString("yyyy-MM-dd HH:mm")
-		cls.latest_ddlevent = cls.get_latest_ddlevent(now_time)
-		if cls.latest_ddlevent is not None:
-			log.info(f"数据库初始化成功，最新ddl事件：{cls.latest_ddlevent.title}")
+		# 建立事件表，并将旧版本数据库升级到最新结构
+		cls.init_event_tables()
+		cls.migrate_schema()
+		cls.fts_enabled = cls.ensure_fts_index()
+		# 连接（或切换）数据库后重新载入全部待提醒事件
+		now_time = QDateTime.currentDateTime().toString("yyyy-MM-dd HH:mm")
+		Emitter.instance().send_notice_signal((cls.get_pending_reminders(now_time), "load"))
+		Emitter.instance().send_events_changed_signal()
 
 	# ===管理全局id表===
 	@classmethod
@@ -125,7 +136,199 @@ class EventSQLManager:
 		cls.cursor.execute("INSERT INTO global_id DEFAULT VALUES")
 		cls.conn.commit()
 		return cls.cursor.lastrowid
-	
+
+	@classmethod
+	def init_event_tables(cls):
+		"""建立各事件表，保证迁移与查询时表一定存在"""
+		for table_name, columns in cls.TABLE_COLUMNS.items():
+			cls.create_table_if_not_exist(table_name, dict.fromkeys(columns))
+
+	# ===数据库结构迁移===
+	@classmethod
+	def migrate_schema(cls) -> None:
+		"""
+		读取 PRAGMA user_version，依次执行尚未应用的迁移。
+		每个迁移连同版本号的更新在同一事务中完成，失败则回滚并停在上一个版本，下次启动时重试
+		"""
+		cls.cursor.execute("PRAGMA user_version")
+		version = cls.cursor.fetchone()[0]
+		if version > cls.SCHEMA_VERSION:
+			log.warning(f"migrate_schema:数据库版本 {version} 高于程序支持的版本 {cls.SCHEMA_VERSION}，跳过迁移")
+			return
+		for target_version, migration_name in cls.MIGRATIONS:
+			if target_version <= version:
+				continue
+			try:
+				cls.cursor.execute("BEGIN")
+				getattr(cls, migration_name)()
+				# PRAGMA 不支持占位符，版本号来自 MIGRATIONS 常量
+				cls.cursor.execute(f"PRAGMA user_version = {int(target_version)}")
+				cls.conn.commit()
+				version = target_version
+				log.info(f"migrate_schema:数据库已升级到版本 {version}（{migration_name}）")
+			except Exception as e:
+				cls.conn.rollback()
+				log.error(f"migrate_schema:升级到版本 {target_version} 失败，已回滚：{e}")
+				break
+
+	@classmethod
+	def ensure_fts_index(cls) -> bool:
+		"""
+		检查全文索引是否存在，返回是否可用。
+		v2 迁移在SQLite不支持FTS5时会跳过建索引但版本号照常前进，这里在每次启动时补建，
+		SQLite升级后即可自动启用全文搜索
+		"""
+		cls.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_fts'")
+		if cls.cursor.fetchone() is not None:
+			return True
+		cls.cursor.execute("PRAGMA user_version")
+		if cls.cursor.fetchone()[0] < 2:
+			return False  # 尚未迁移到 v2（迁移失败），下次启动随迁移一起重试
+		try:
+			cls.cursor.execute("BEGIN")
+			cls._migrate_v2_fts_index()
+			cls.conn.commit()
+		except Exception as e:
+			cls.conn.rollback()
+			log.error(f"ensure_fts_index:补建全文索引失败，已回滚：{e}")
+			return False
+		cls.cursor.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'event_fts'")
+		if cls.cursor.fetchone() is None:
+			return False
+		log.info("ensure_fts_index:已补建全文索引")
+		return True
+
+	@classmethod
+	def _migrate_v1_date_indexes(cls) -> None:
+		"""v1：为按日期范围查询的字段建立索引"""
+		cls.cursor.execute("CREATE INDEX IF NOT EXISTS idx_ddlevents_datetime ON ddlevents(datetime)")
+		cls.cursor.execute("CREATE INDEX IF NOT EXISTS idx_ddlevents_advance_time ON ddlevents(advance_time)")
+		cls.cursor.execute(
+			"CREATE INDEX IF NOT EXISTS idx_activityevents_date_range ON activityevents(start_date, end_date)")
+
+	@classmethod
+	def _migrate_v2_fts_index(cls) -> None:
+		"""
+		v2：建立 title/notes 的FTS5全文索引，rowid 即全局事件id，由触发器与各事件表保持同步。
+		标题多为中文，使用 trigram 分词以支持任意子串匹配
+		"""
+		try:
+			cls.cursor.execute("""
+				CREATE VIRTUAL TABLE IF NOT EXISTS event_fts
+				USING fts5(title, notes, table_name UNINDEXED, tokenize = 'trigram')
+			""")
+		except sqlite3.OperationalError as e:
+			# 旧版本SQLite可能未编译FTS5或不支持trigram，此时保留LIKE搜索
+			log.warning(f"_migrate_v2_fts_index:当前SQLite不支持FTS5 trigram，搜索将使用LIKE：{e}")
+			return
+		for table_name in cls.TABLE_COLUMNS.keys():
+			cls.cursor.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS {table_name}_fts_insert AFTER INSERT ON {table_name} BEGIN
+					INSERT INTO event_fts(rowid, title, notes, table_name)
+					VALUES (new.id, new.title, new.notes, '{table_name}');
+				END
+			""")
+			cls.cursor.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS {table_name}_fts_update AFTER UPDATE OF title, notes ON {table_name} BEGIN
+					UPDATE event_fts SET title = new.title, notes = new.notes WHERE rowid = old.id;
+				END
+			""")
+			cls.cursor.execute(f"""
+				CREATE TRIGGER IF NOT EXISTS {table_name}_fts_delete AFTER DELETE ON {table_name} BEGIN
+					DELETE FROM event_fts WHERE rowid = old.id;
+				END
+			""")
+			# 回填已有事件
+			cls.cursor.execute(f"""
+				INSERT INTO event_fts(rowid, title, notes, table_name)
+				SELECT id, title, notes, '{table_name}' FROM {table_name}
+			""")
+
+	@classmethod
+	def _migrate_v3_activity_occurrences(cls) -> None:
+		"""
+		v3：建立 activity 的发生日期物化表，范围查询直接按日期索引读取，不再在Python中逐个展开。
+		删除activity时由触发器清理其发生日期，新增与修改时由 _write_occurrences 维护
+		"""
+		cls.cursor.execute("""
+			CREATE TABLE IF NOT EXISTS activity_occurrences (
+				activity_id INTEGER NOT NULL,
+				date TEXT NOT NULL,
+				start_time TEXT,
+				end_time TEXT
+			)
+		""")
+		# 索引包含 activity_id，按 (日期, 开始时间, id) 分页时整个排序都由索引给出
+		cls.cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_occurrences_order ON activity_occurrences(date, start_time, activity_id)")
+		cls.cursor.execute("CREATE INDEX IF NOT EXISTS idx_activity_occurrences_activity ON activity_occurrences(activity_id)")
+		cls.cursor.execute("""
+			CREATE TRIGGER IF NOT EXISTS activityevents_occurrences_delete AFTER DELETE ON activityevents BEGIN
+				DELETE FROM activity_occurrences WHERE activity_id = old.id;
+			END
+		""")
+		# 回填已有activity
+		cls.cursor.execute("DELETE FROM activity_occurrences")
+		cls.cursor.execute("SELECT * FROM activityevents")
+		cls._write_occurrences([cls.row_to_activity(row) for row in cls.cursor.fetchall()])
+
+	@classmethod
+	def _migrate_v4_day_counts(cls) -> None:
+		"""
+		v4：建立每日事件数表 event_day_counts，热力图按年份区间直接读取，不再实时聚合。
+		由 ddlevents 与 activity_occurrences 上的触发器在同一事务内增量维护，计数归零的日期随即删除
+		"""
+		cls.cursor.execute("""
+			CREATE TABLE IF NOT EXISTS event_day_counts (
+				date TEXT PRIMARY KEY,
+				count INTEGER NOT NULL
+			) WITHOUT ROWID
+		""")
+		# (触发器名, 触发事件, 增加计数的日期表达式, 减少计数的日期表达式)
+		triggers = [
+			("ddlevents_day_counts_insert", "AFTER INSERT ON ddlevents", "substr(new.datetime, 1, 10)", None),
+			("ddlevents_day_counts_update", "AFTER UPDATE OF datetime ON ddlevents",
+			 "substr(new.datetime, 1, 10)", "substr(old.datetime, 1, 10)"),
+			("ddlevents_day_counts_delete", "AFTER DELETE ON ddlevents", None, "substr(old.datetime, 1, 10)"),
+			("activity_occurrences_day_counts_insert", "AFTER INSERT ON activity_occurrences", "new.date", None),
+			("activity_occurrences_day_counts_delete", "AFTER DELETE ON activity_occurrences", None, "old.date"),
+		]
+		for trigger_name, trigger_event, added_day, removed_day in triggers:
+			body = ""
+			if removed_day is not None:
+				body += f"""
+					UPDATE event_day_counts SET count = count - 1 WHERE date = {removed_day};
+					DELETE FROM event_day_counts WHERE date = {removed_day} AND count <= 0;
+				"""
+			if added_day is not None:
+				body += f"""
+					INSERT OR IGNORE INTO event_day_counts(date, count) VALUES ({added_day}, 0);
+					UPDATE event_day_counts SET count = count + 1 WHERE date = {added_day};
+				"""
+			cls.cursor.execute(f"CREATE TRIGGER IF NOT EXISTS {trigger_name} {trigger_event} BEGIN {body} END")
+		# 回填已有事件
+		cls.cursor.execute("DELETE FROM event_day_counts")
+		cls.cursor.execute("""
+			INSERT INTO event_day_counts(date, count)
+			SELECT day, SUM(num) FROM (
+				SELECT substr(datetime, 1, 10) AS day, COUNT(*) AS num FROM ddlevents GROUP BY day
+				UNION ALL
+				SELECT date AS day, COUNT(*) AS num FROM activity_occurrences GROUP BY day
+			)
+			GROUP BY day
+		""")
+
+	@classmethod
+	def _write_occurrences(cls, activities: list[ActivityEvent]) -> None:
+		"""
+		将 activity 的全部发生日期写入 activity_occurrences。不提交，由调用者所在的事务统一提交
+		"""
+		rows = []
+		for activity in activities:
+			for date_obj in activity.occurrence_dates(activity.start_date, activity.end_date):
+				rows.append((activity.id, date_obj.strftime("%Y-%m-%d"), activity.start_time, activity.end_time))
+		cls.cursor.executemany(
+			"INSERT INTO activity_occurrences (activity_id, date, start_time, end_time) VALUES (?, ?, ?, ?)", rows)
+
 	# 对表操作
 	@classmethod
 	def create_table_if_not_exist(cls, table_name: str, data) -> None:
@@ -142,25 +345,58 @@ class EventSQLManager:
 		cls.conn.commit()
 
 	@classmethod
-	def get_latest_ddlevent(cls, now_time:str) -> DDLEvent:
+	def get_pending_reminders(cls, now_time:str) -> list[DDLEvent]:
 		"""
-		获取最新的ddlevent，其 advance_time 不早于 now_time
+		一次查询取出 advance_time 不早于 now_time 的全部ddlevent，按提醒时间升序，供提醒调度器建堆
 		"""
-		log.info(f"当前时间：{now_time}")
-
-		cls.cursor.execute("SELECT * FROM ddlevents WHERE advance_time >= ? ORDER BY advance_time ASC LIMIT 1",
+		cls.cursor.execute("SELECT * FROM ddlevents WHERE advance_time >= ? ORDER BY advance_time ASC, id ASC",
 						(now_time,))
-		row = cls.cursor.fetchone()
-		if row is None:
-			log.info("get_latest_ddlevent:没有找到任何未来的DDL事件")
-			return None
-		paras = row[1:]
-		event = EventFactory.create(None, "DDL", False, *paras)
-		event.id = row[0]
-		log.info(f"get_latest_ddlevent:获取最新的DDL事件成功，事件为{event.title} @ {event.advance_time}")
-		cls.latest_ddlevent = event
-		return event
+		events = []
+		for row in cls.cursor.fetchall():
+			event = EventFactory.create(row[0], "DDL", False, *row[1:])
+			if event is not None:
+				events.append(event)
+		log.info(f"get_pending_reminders:共有 {len(events)} 条待提醒的DDL事件（{now_time} 之后）")
+		return events
 	
+	# ===查询结果缓存===
+	@classmethod
+	def mark_written(cls) -> None:
+		"""
+		本进程写入数据库后调用，使已缓存的查询结果失效，并通知前端丢弃自己的缓存
+		"""
+		cls.write_counter += 1
+		Emitter.instance().send_events_changed_signal()
+
+	@classmethod
+	def cache_get(cls, key: tuple) -> list | None:
+		"""
+		读取缓存的查询结果，未命中返回 None。
+		本进程的写入通过 write_counter 判断；其他进程（连接）提交的修改通过 PRAGMA data_version 判断，
+		两者任一变化都会清空整个缓存
+		"""
+		cls.cursor.execute("PRAGMA data_version")
+		version = (cls.write_counter, cls.cursor.fetchone()[0])
+		if version != cls.cache_version:
+			cls.query_cache.clear()
+			cls.cache_version = version
+			return None
+		if key not in cls.query_cache:
+			return None
+		cls.query_cache.move_to_end(key)
+		# 返回副本，调用者追加或删除元素不会影响缓存（事件对象本身是共享的）
+		return cls.query_cache[key].copy()
+
+	@classmethod
+	def cache_put(cls, key: tuple, result: list | dict) -> None:
+		"""
+		写入查询结果（列表或字典），超过容量时淘汰最久未使用的结果
+		"""
+		cls.query_cache[key] = result.copy()
+		cls.query_cache.move_to_end(key)
+		while len(cls.query_cache) > cls.QUERY_CACHE_SIZE:
+			cls.query_cache.popitem(last=False)
+
 	@classmethod
 	def get_month_range_str(cls, year: int, month: int):
 		"""
@@ -169,49 +405,81 @@ class EventSQLManager:
 		first_day = f"{year:04d}-{month:02d}-01"
 		last_day = f"{year:04d}-{month:02d}-{monthrange(year, month)[1]:02d}"
 		return first_day, last_day
+
+	@classmethod
+	def next_day_str(cls, date_str: str) -> str:
+		"""
+		获得某日（yyyy-MM-dd）的下一天，用于构造 datetime 字段左闭右开的查询区间
+		"""
+		return (datetime.strptime(date_str, "%Y-%m-%d") + timedelta(days=1)).strftime("%Y-%m-%d")
 	
+	@classmethod
+	def row_to_activity(cls, row: tuple) -> ActivityEvent:
+		"""
+		将 activityevents 表的一行还原为 ActivityEvent
+		"""
+		paras = list(row[1:])
+		# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
+		paras[-1] = json.loads(paras[-1])
+		return EventFactory.create(row[0], "Activity", False, *paras)
+
+	@classmethod
+	def get_activity_occurrences(cls, first_day: str, last_day: str) -> list[ActivityEvent]:
+		"""
+		从物化表中读取 [first_day, last_day] 内的全部activity发生，按日期和开始时间排序，
+		每个activity只构造一次，之后每次发生都是它的浅拷贝
+		"""
+		query = """
+			SELECT o.date, a.* FROM activity_occurrences o
+			JOIN activityevents a ON a.id = o.activity_id
+			WHERE o.date >= ? AND o.date <= ?
+			ORDER BY o.date ASC, o.start_time ASC
+		"""
+		try:
+			cls.cursor.execute(query, (first_day, last_day))
+			rows = cls.cursor.fetchall()
+		except Exception as e:
+			log.error(f"get_activity_occurrences:activity_occurrences数据库查询失败: {e}")
+			return []
+		activities: dict[int, ActivityEvent] = {}
+		events = []
+		for row in rows:
+			activity_id = row[1]
+			try:
+				if activity_id not in activities:
+					activities[activity_id] = cls.row_to_activity(row[1:])
+				events.append(activities[activity_id]._create_occurrence(row[0]))
+			except Exception as e:
+				log.error(f"get_activity_occurrences:解析activity事件失败（ID={activity_id}）: {e}")
+		return events
+
 	@classmethod
 	def get_events_in_month(cls, year: int, month: int) -> list[BaseEvent]:
 		"""
-		获取指定年份和月份的所有事件（ddl基于 datetime 字段匹配年月,activity 先判断起止日期是否落入月份，其次如果是重复事件则展开再进行筛选）。
+		获取指定年份和月份的所有事件（ddl基于 datetime 字段匹配年月,activity 直接从发生日期物化表中按日期读取）。
 		返回 BaseEvent 列表。
 		"""
 		# 验证输入
 		if month < 1 or month > 12:
 			log.warning(f"get_events_in_month:无效的月份输入: {month}")
 			return []
-		# 构造 SQL 查询：同时匹配年份和月份
-		# 查询ddl
+		cached = cls.cache_get(("month", year, month))
+		if cached is not None:
+			return cached
+		# 构造 SQL 查询：日期均以 yyyy-MM-dd 开头的字符串存储，直接比较字段本身以便使用索引
+		# 查询ddl，区间为 [本月第一天, 下月第一天)
+		first_day, last_day = cls.get_month_range_str(year,month)
 		ddl_query = """
 			SELECT * FROM ddlevents 
-			WHERE strftime('%Y', datetime) = ? 
-			AND strftime('%m', datetime) = ?
+			WHERE datetime >= ? AND datetime < ?
 			ORDER BY datetime ASC
 		"""
-
-		year_str = f"{year:04d}"  # 补零为4位（如 2024）
-		month_str = f"{month:02d}"  # 补零为2位（如 07）
-		# 查询activity
-		first_day, last_day = cls.get_month_range_str(year,month)
-		activity_query = f"""
-			SELECT * FROM activityevents
-			WHERE 
-				(date(start_date) <= '{last_day}')
-			AND (date(end_date) >= '{first_day}')
-			ORDER BY date(start_date) ASC, time(start_time) ASC
-		"""
 		ddl_rows = []
-		activity_rows = []
 		try:
-			cls.cursor.execute(ddl_query, (year_str, month_str))
+			cls.cursor.execute(ddl_query, (first_day, cls.next_day_str(last_day)))
 			ddl_rows = cls.cursor.fetchall()
 		except Exception as e:
 			log.error(f"get_events_in_month:ddl_events数据库查询失败: {e}")
-		try:
-			cls.cursor.execute(activity_query)
-			activity_rows = cls.cursor.fetchall()
-		except Exception as e:
-			log.error(f"get_events_in_month:activity_events数据库查询失败: {e}")
 		events = []
 		for row in ddl_rows:
 			try:
@@ -224,20 +492,11 @@ class EventSQLManager:
 					log.debug(f"get_events_in_month:加载ddl事件成功: {event.title} @ {event.datetime}-{event.advance_time}")
 			except Exception as e:
 				log.error(f"get_events_in_month:解析ddl事件失败（ID={row[0]}）: {e}")
-
-		for row in activity_rows:
-			try:
-				paras = list(row[1:])
-				# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
-				paras[-1] = json.loads(paras[-1])
-				event:ActivityEvent = EventFactory.create(None, "Activity", False, *paras)
-				if event is not None and isinstance(event, ActivityEvent):
-					event.id = row[0]
-					events += event.expand(first_day,last_day)
-			except Exception as e:
-				log.error(f"get_events_in_month:解析activity事件失败（ID={row[0]}）: {e}")
+		# 查询activity
+		events += cls.get_activity_occurrences(first_day, last_day)
 
 		log.info(f"get_events_in_month:找到 {len(events)} 个事件（{year}年{month}月）")
+		cls.cache_put(("month", year, month), events)
 		return events
 	
 	@classmethod
@@ -249,38 +508,13 @@ class EventSQLManager:
 		if start_date > end_date:
 			log.warning(f"get_activities_between_twodays:无效的起始日期输入: {start_date}-{end_date}")
 			return []
-		# 构造 SQL 查询：同时匹配年份和月份
-
+		cached = cls.cache_get(("activities", start_date, end_date))
+		if cached is not None:
+			return cached
 		# 查询activity
-		first_day, last_day = start_date,end_date
-		activity_query = f"""
-			SELECT * FROM activityevents
-			WHERE 
-				(date(start_date) <= '{last_day}')
-			AND (date(end_date) >= '{first_day}')
-			ORDER BY date(start_date) ASC, time(start_time) ASC
-		"""
-		activity_rows = []
-		try:
-			cls.cursor.execute(activity_query)
-			activity_rows = cls.cursor.fetchall()
-		except Exception as e:
-			log.error(f"get_events_in_month:activity_events数据库查询失败: {e}")
-		events = []
-
-		for row in activity_rows:
-			try:
-				paras = list(row[1:])
-				# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
-				paras[-1] = json.loads(paras[-1])
-				event:ActivityEvent = EventFactory.create(None, "Activity", False, *paras)
-				if event is not None and isinstance(event, ActivityEvent):
-					event.id = row[0]
-					events += event.expand(first_day,last_day)
-			except Exception as e:
-				log.error(f"get_events_in_month:解析activity事件失败（ID={row[0]}）: {e}")
-
-		log.info(f"get_events_in_month:找到 {len(events)} 个事件（{start_date}-{end_date}）")
+		events = cls.get_activity_occurrences(start_date, end_date)
+		log.info(f"get_activities_between_twodays:找到 {len(events)} 个事件（{start_date}-{end_date}）")
+		cls.cache_put(("activities", start_date, end_date), events)
 		return events
 	
 	@classmethod
@@ -291,17 +525,20 @@ class EventSQLManager:
 		if start_date > end_date:
 			log.warning(f"get_events_between_twodays: 无效的日期范围: {start_date} - {end_date}")
 			return []
+		cached = cls.cache_get(("events", start_date, end_date))
+		if cached is not None:
+			return cached
 
 		events: list[BaseEvent] = []
 
 		# 查询DDL
-		ddl_query = f"""
+		ddl_query = """
 			SELECT * FROM ddlevents 
-			WHERE date(datetime) >= ? AND date(datetime) <= ?
+			WHERE datetime >= ? AND datetime < ?
 			ORDER BY datetime ASC
 		"""
 		try:
-			cls.cursor.execute(ddl_query, (start_date, end_date))
+			cls.cursor.execute(ddl_query, (start_date, cls.next_day_str(end_date)))
 			ddl_rows = cls.cursor.fetchall()
 			for row in ddl_rows:
 				try:
@@ -315,30 +552,53 @@ class EventSQLManager:
 			log.error(f"get_events_between_twodays: 查询 DDL 事件失败: {e}")
 
 		# 查询Activity事件
-		activity_query = f"""
-			SELECT * FROM activityevents
-			WHERE date(start_date) <= ? AND date(end_date) >= ?
-			ORDER BY date(start_date) ASC, time(start_time) ASC
-		"""
-		try:
-			cls.cursor.execute(activity_query, (end_date, start_date))
-			activity_rows = cls.cursor.fetchall()
-			for row in activity_rows:
-				try:
-					paras = list(row[1:])
-					paras[-1] = json.loads(paras[-1])  # 处理 repeat_day
-					event: ActivityEvent = EventFactory.create(None, "Activity", False, *paras)
-					if event is not None:
-						event.id = row[0]
-						events += event.expand(start_date, end_date)
-				except Exception as e:
-					log.error(f"get_events_between_twodays: 解析 Activity 事件失败 (ID={row[0]}): {e}")
-		except Exception as e:
-			log.error(f"get_events_between_twodays: 查询 Activity 事件失败: {e}")
+		events += cls.get_activity_occurrences(start_date, end_date)
 
 		log.info(f"get_events_between_twodays: 共找到 {len(events)} 个事件（{start_date} ~ {end_date}）")
+		cls.cache_put(("events", start_date, end_date), events)
 		return events
 	
+	@classmethod
+	def count_events_per_day(cls, year: int) -> dict[str, int]:
+		"""
+		统计指定年份每天的事件数（ddl按截止日期，activity按发生日期），返回 {"yyyy-MM-dd": 数量}，没有事件的日期不出现。
+		直接按主键区间读取 event_day_counts，不聚合事件表，也不构造任何事件对象
+		"""
+		cached = cls.cache_get(("day_counts", year))
+		if cached is not None:
+			return cached
+		try:
+			cls.cursor.execute(
+				"SELECT date, count FROM event_day_counts WHERE date >= ? AND date <= ?",
+				(f"{year:04d}-01-01", f"{year:04d}-12-31"))
+			counts = {day: num for day, num in cls.cursor.fetchall()}
+		except Exception as e:
+			log.error(f"count_events_per_day:统计{year}年每日事件数失败: {e}")
+			return {}
+		log.info(f"count_events_per_day:{year}年共有 {len(counts)} 天存在事件")
+		cls.cache_put(("day_counts", year), counts)
+		return counts
+
+	@classmethod
+	def get_event_year_range(cls) -> tuple[int, int] | None:
+		"""
+		返回存在事件的最早与最晚年份 (first_year, last_year)，没有任何事件时返回 None。
+		只读取 event_day_counts 主键的两端
+		"""
+		cached = cls.cache_get(("event_year_range",))
+		if cached is not None:
+			return tuple(cached) or None
+		try:
+			cls.cursor.execute("SELECT MIN(date), MAX(date) FROM event_day_counts")
+			first_day, last_day = cls.cursor.fetchone()
+		except Exception as e:
+			log.error(f"get_event_year_range:查询事件年份范围失败: {e}")
+			return None
+		# 缓存统一存放可 copy() 的列表，没有事件时存空列表
+		year_range = [int(first_day[:4]), int(last_day[:4])] if first_day and last_day else []
+		cls.cache_put(("event_year_range",), year_range)
+		return tuple(year_range) or None
+
 	@classmethod
 	def get_specific_date_events(cls, table_name:str, date: QDate) -> list[BaseEvent]:
 		'''
@@ -358,20 +618,15 @@ class EventSQLManager:
 		if table_name == "ddlevents":
 			ddl_query = f"""
 				SELECT * FROM {table_name}
-				WHERE date(datetime) = ?
+				WHERE datetime >= ? AND datetime < ?
 				ORDER BY datetime ASC
 			"""
-			cls.cursor.execute(ddl_query, (target_date,))
+			cls.cursor.execute(ddl_query, (target_date, cls.next_day_str(target_date)))
 			rows = cls.cursor.fetchall()
 		elif table_name == "activityevents":
-			activity_query = f"""
-				SELECT * FROM {table_name}
-				WHERE (date(start_date) <= ?)
-				AND (date(end_date) >= ?)
-				ORDER BY start_time ASC 
-			"""
-			cls.cursor.execute(activity_query,(target_date,target_date))
-			rows = cls.cursor.fetchall()
+			events = cls.get_activity_occurrences(target_date, target_date)
+			log.info(f"get_specific_date_events:找到 {len(events)} 条 {target_date} 的activity发生")
+			return events
 		else:
 			log.error(f"{table_name}类事件未设置")
 
@@ -386,16 +641,6 @@ class EventSQLManager:
 				event_type = "DDL"
 				event:DDLEvent = EventFactory.create(event_id,event_type,False,*paras)
 				events.append(event)
-		elif table_name == "activityevents":
-			for row in rows:
-				event_id = row[0]
-				paras = list(row[1:])
-				# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
-				paras[-1] = json.loads(paras[-1])
-				event_type = "Activity"
-				event:ActivityEvent = EventFactory.create(event_id,event_type,False,*paras)
-				result = event.expand(target_date,target_date)
-				events += result
 		else:
 			log.error("get_specific_date_events:Event类型出错，类型未实现该函数")
 		return events
@@ -403,17 +648,63 @@ class EventSQLManager:
 	@classmethod
 	def search_all(cls, keyword: tuple[str]) -> list[BaseEvent]:
 		"""
-		多关键词模糊性全局搜索（AND关系）,改为只搜索title和notes
+		多关键词全局搜索（AND关系），只搜索title和notes，结果按相关度排序。
+		关键词按原样作为子串匹配（不支持FTS5查询语法，* 等字符按普通字符处理），含空格的关键词视为短语。
+		不少于3个字的关键词走FTS5索引；更短的关键词（如常见的一两个汉字）trigram无法索引，
+		只能在索引表内对每一行做 instr 匹配，仍是全表扫描。只有短关键词时不会比LIKE搜索更快
 		"""
+		if not cls.fts_enabled:
+			return cls.search_all_like(keyword)
+		terms = [key for key in keyword if key]
+		if not terms:
+			return []
+		long_terms = [term for term in terms if len(term) >= 3]
+		short_terms = [term for term in terms if len(term) < 3]
+		where_clauses = []
+		values = []
+		if long_terms:
+			# 每个关键词用双引号包成短语，防止用户输入被解析为FTS5语法
+			where_clauses.append("event_fts MATCH ?")
+			values.append(" AND ".join('"' + term.replace('"', '""') + '"' for term in long_terms))
+		for term in short_terms:
+			where_clauses.append("(instr(lower(title), ?) > 0 OR instr(lower(notes), ?) > 0)")
+			values += [term.lower(), term.lower()]
+		order = "rank" if long_terms else "rowid"
+		query = f"SELECT rowid, table_name FROM event_fts WHERE {' AND '.join(where_clauses)} ORDER BY {order}"
+		try:
+			cls.cursor.execute(query, values)
+			hits = cls.cursor.fetchall()
+		except sqlite3.OperationalError as e:
+			log.error(f"search_all:全文搜索失败，改用LIKE搜索：{e}")
+			return cls.search_all_like(keyword)
+		# 按表批量取出命中的事件，再按相关度顺序组装
+		rows_by_id = {}
+		for table_name in cls.TABLE_COLUMNS.keys():
+			ids = [event_id for event_id, hit_table in hits if hit_table == table_name]
+			if not ids:
+				continue
+			placeholders = ', '.join(['?'] * len(ids))
+			cls.cursor.execute(f"SELECT * FROM {table_name} WHERE id IN ({placeholders})", ids)
+			for row in cls.cursor.fetchall():
+				rows_by_id[row[0]] = (table_name, row)
 		result: list[BaseEvent] = []
-		cls.cursor.execute("SELECT name FROM sqlite_master WHERE type ='table' AND name != 'global_id'")  					# 获取所有table
-		tables = [row[0] for row in cls.cursor.fetchall()]
-		for table in tables:
-			cls.cursor.execute(f"PRAGMA table_info({table})")  									# 通过PRAGMA获取table列信息
-			columns_info = cls.cursor.fetchall()
-			possible_columns = [column[1] for column in columns_info if "TEXT" == column[2] and ("title" == column[1] or "notes" == column[1]) ] 	# 排除格式非TEXT的列
-			if not possible_columns:
+		for event_id, _ in hits:
+			if event_id not in rows_by_id:
+				log.warning(f"search_all:索引中的事件 {event_id} 已不存在")
 				continue
+			table_name, row = rows_by_id[event_id]
+			result += cls.row_to_events(table_name, row)
+		log.info(f"search_all:搜索 {keyword} 命中 {len(hits)} 个事件")
+		return result
+
+	@classmethod
+	def search_all_like(cls, keyword: tuple[str]) -> list[BaseEvent]:
+		"""
+		不支持FTS5时的搜索：多关键词模糊性全局搜索（AND关系），只搜索title和notes
+		"""
+		result: list[BaseEvent] = []
+		possible_columns = ("title", "notes")
+		for table in cls.TABLE_COLUMNS.keys():
 			# 拼接语句，注意使用AND连接
 			where_clauses = [
 				" AND ".join(f"{col} LIKE ?" for key in keyword)
@@ -423,21 +714,29 @@ class EventSQLManager:
 			values = [f"%{key}%" for key in keyword] * len(possible_columns)
 			query = f"SELECT * FROM {table} WHERE {where_column}" 								# 选择匹配关键字的行
 			cls.cursor.execute(query, values)
-			rows = cls.cursor.fetchall()
-			for row in rows:
-				paras = list(row[1:])
-				if cls.TABLE_MAP.get(table, "DDL") == "Activity":
-					# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
-					paras[-1] = json.loads(paras[-1])		
-				event = EventFactory.create(None, cls.TABLE_MAP.get(table, "DDL"), False, *paras)
-				event.id = row[0]
-				if isinstance(event, DDLEvent):
-					result.append(event)
-				elif isinstance(event, ActivityEvent):
-					result += event.expand(event.start_date,event.end_date)
-				else:
-					log.error("search_all发生事件类型错误")
+			for row in cls.cursor.fetchall():
+				result += cls.row_to_events(table, row)
 		return result
+
+	@classmethod
+	def row_to_events(cls, table_name: str, row: tuple) -> list[BaseEvent]:
+		"""
+		将搜索得到的一行转换为事件，activity展开为其全部日程
+		"""
+		paras = list(row[1:])
+		if cls.TABLE_MAP.get(table_name, "DDL") == "Activity":
+			# 此处微调bug，先将SQL中repeat_day的json形式还原为tuple再输入作为paras
+			paras[-1] = json.loads(paras[-1])
+		event = EventFactory.create(None, cls.TABLE_MAP.get(table_name, "DDL"), False, *paras)
+		event.id = row[0]
+		if isinstance(event, DDLEvent):
+			return [event]
+		elif isinstance(event, ActivityEvent):
+			# 发生日期直接取自物化表
+			cls.cursor.execute("SELECT date FROM activity_occurrences WHERE activity_id = ? ORDER BY date", (event.id,))
+			return [event._create_occurrence(date_row[0]) for date_row in cls.cursor.fetchall()]
+		log.error("search_all发生事件类型错误")
+		return []
 	
 	@classmethod
 	def search_time(cls, start_time: str, end_time: str) -> list[BaseEvent]:
@@ -464,23 +763,26 @@ class EventSQLManager:
 		return result
 	
 	@classmethod
-	def get_data_time_order(cls, table_name: str, start_pos: int, event_num: int) -> tuple[BaseEvent]:
+	def get_data_after_cursor(cls, table_name: str, cursor: tuple, event_num: int) -> tuple[BaseEvent]:
 		'''
-		从指定数据库中按时间顺序获取ddl数据，从start_pos开始，取num个返回，目前暂时只支持ddlevent
+		从指定数据库中按 (datetime, id) 顺序取出游标之后的 event_num 个事件（keyset分页）。
+		ddlevent 按截止时间排序；activityevent 从发生日期物化表中按每次发生的 (日期 开始时间, id) 排序，返回单次发生。
+		cursor 为上一页最后一个事件的 (datetime, id)，None 表示从头开始；
+		每页都是一次索引定位，与已翻过的页数无关，翻页期间增删事件也不会造成重复或遗漏
 		'''
-		cls.cursor.execute(f"SELECT name FROM sqlite_master WHERE type ='table'")  # 获取所有table名称
-		tables = [row[0] for row in cls.cursor.fetchall()]
-		if table_name not in tables:
+		if table_name not in cls.TABLE_COLUMNS:
 			log.error(f"{table_name}不存在")
 			return ()
-		if table_name == "ddlevents":
-			query = f"SELECT * FROM {table_name} ORDER BY datetime ASC LIMIT {event_num} OFFSET {start_pos}"
+		if table_name == "activityevents":
+			return cls.get_occurrences_after_cursor(cursor, event_num)
+		if cursor is None:
+			query = f"SELECT * FROM {table_name} ORDER BY datetime ASC, id ASC LIMIT ?"
+			cls.cursor.execute(query, (event_num,))
 		else:
-			log.error("get_data_time_order:Event类型出错，类型未实现该函数")	
-			return ()
-		cls.cursor.execute(query)
+			query = f"SELECT * FROM {table_name} WHERE (datetime, id) > (?, ?) ORDER BY datetime ASC, id ASC LIMIT ?"
+			cls.cursor.execute(query, (cursor[0], cursor[1], event_num))
 		rows = cls.cursor.fetchall()
-		log.info(f"获取数据成功，数据为{rows}")
+		log.info(f"get_data_after_cursor:获取数据成功，游标{cursor}之后共{len(rows)}条")
 		result = []
 		for row in rows:
 			paras = row[1:]
@@ -488,6 +790,64 @@ class EventSQLManager:
 			event.id = row[0]
 			result.append(event)
 		return tuple(result)
+
+	@classmethod
+	def get_occurrences_after_cursor(cls, cursor: tuple, event_num: int) -> tuple[ActivityEvent]:
+		"""
+		按 (日期, 开始时间, id) 顺序取出游标之后的 event_num 次activity发生，游标格式同 get_data_after_cursor
+		"""
+		query = """
+			SELECT o.date, a.* FROM activity_occurrences o
+			JOIN activityevents a ON a.id = o.activity_id
+			{where}
+			ORDER BY o.date ASC, o.start_time ASC, o.activity_id ASC
+			LIMIT ?
+		"""
+		if cursor is None:
+			cls.cursor.execute(query.format(where=""), (event_num,))
+		else:
+			# datetime 形如 "yyyy-MM-dd HH:mm"，拆成日期与开始时间以便使用 (date, start_time) 索引
+			where = "WHERE (o.date, o.start_time, o.activity_id) > (?, ?, ?)"
+			cls.cursor.execute(query.format(where=where), (cursor[0][:10], cursor[0][11:], cursor[1], event_num))
+		rows = cls.cursor.fetchall()
+		activities: dict[int, ActivityEvent] = {}
+		result = []
+		for row in rows:
+			activity_id = row[1]
+			if activity_id not in activities:
+				activities[activity_id] = cls.row_to_activity(row[1:])
+			result.append(activities[activity_id]._create_occurrence(row[0]))
+		return tuple(result)
+
+	@classmethod
+	def iter_after_cursor(cls, table_name: str, cursor: tuple, chunk_size: int = 50):
+		"""
+		惰性地按 (datetime, id) 顺序逐个生成游标之后的事件，每次向数据库取 chunk_size 条，用完再取下一批
+		"""
+		while True:
+			chunk = cls.get_data_after_cursor(table_name, cursor, chunk_size)
+			yield from chunk
+			if len(chunk) < chunk_size:
+				return
+			cursor = (chunk[-1].datetime, chunk[-1].id)
+
+	@classmethod
+	def get_upcoming_page(cls, cursor: tuple, event_num: int) -> tuple[BaseEvent]:
+		"""
+		Upcoming的一页：将ddl与activity的每次发生按 (datetime, id) 归并（heapq.merge），取游标之后的 event_num 个。
+		两路数据都是按需分批读取的有序流，只读取本页实际用到的部分。
+		ddl保留过去未处理的事项，activity只从今天开始，避免整学期已上过的课程排在前面
+		"""
+		today_cursor = (f"{QDate.currentDate().toString('yyyy-MM-dd')} 00:00", 0)
+		activity_cursor = cursor if cursor is not None and cursor > today_cursor else today_cursor
+		streams = [
+			cls.iter_after_cursor("ddlevents", cursor, event_num),
+			cls.iter_after_cursor("activityevents", activity_cursor, event_num),
+		]
+		merged = heapq.merge(*streams, key=lambda event: (event.datetime, event.id))
+		result = tuple(itertools.islice(merged, event_num))
+		log.info(f"get_upcoming_page:获取数据成功，游标{cursor}之后共{len(result)}条")
+		return result
 	
 	# 对特定事件进行操作，增删减改
 	@classmethod
@@ -500,17 +860,69 @@ class EventSQLManager:
 			log.error(f"已经存在过该事件，应该为修改事件")
 			cls.modify_event(event)
 		else:
-			global_id = cls.get_global_id() 					# 获取全局变量 
-			table_name = event.table_name()
-			data = event.to_dict()
-			cls.create_table_if_not_exist(table_name, data)
-			columns = ', '.join(data.keys())
-			placeholders = ', '.join(['?'] * len(data))  	# 使用占位符防御SQL注入
-			values = tuple(data.values())
-			query = f"INSERT INTO {table_name} (id,{columns}) VALUES (?,{placeholders})"
-			cls.cursor.execute(query, (global_id,) + values)
-			event.id = global_id  							# 获取全局中的唯一id值作为事件标识符
+			cls._insert_events([event])
+
+	@classmethod
+	def add_events(cls, events) -> list[BaseEvent]:
+		"""
+		批量将Event加入日程（如导入课表），所有事件在同一事务中写入，只提交一次，最后统一更新一次最新事件。
+		返回成功写入的事件（已带上全局id）
+		"""
+		new_events = []
+		for event in events:
+			if event is None:
+				continue
+			if event.id is not None:
+				log.error(f"add_events:事件{event.title}已经存在（ID={event.id}），跳过")
+				continue
+			new_events.append(event)
+		if not new_events:
+			return []
+		try:
+			cls._insert_events(new_events)
+		except Exception as e:
+			log.error(f"add_events:批量添加 {len(new_events)} 个事件失败，已回滚：{e}")
+			return []
+		log.info(f"add_events:成功批量添加 {len(new_events)} 个事件")
+		ddl_events = [event for event in new_events if isinstance(event, DDLEvent)]
+		if ddl_events:
+			# 批量添加后只通知一次提醒调度器
+			Emitter.instance().send_notice_signal((ddl_events, "upsert"))
+		return new_events
+
+	@classmethod
+	def _insert_events(cls, events: list[BaseEvent]) -> None:
+		"""
+		在一个事务中写入一批新事件：一次性预留连续的全局id，再按表 executemany 插入，失败则整体回滚
+		"""
+		try:
+			# 先取得写锁再读最大id，其他连接（如另一个程序实例）无法在读取与插入之间提交新的id
+			cls.cursor.execute("BEGIN IMMEDIATE")
+			# global_id.id 为 INTEGER PRIMARY KEY，新id从当前最大值之后连续分配
+			cls.cursor.execute("SELECT COALESCE(MAX(id), 0) FROM global_id")
+			first_id = cls.cursor.fetchone()[0] + 1
+			global_ids = list(range(first_id, first_id + len(events)))
+			cls.cursor.executemany("INSERT INTO global_id (id) VALUES (?)", [(global_id,) for global_id in global_ids])
+			rows_of_table = defaultdict(list)
+			for global_id, event in zip(global_ids, events):
+				data = event.to_dict()
+				rows_of_table[event.table_name()].append((global_id,) + tuple(data[key] for key in cls.TABLE_COLUMNS[event.table_name()]))
+			for table_name, rows in rows_of_table.items():
+				columns = cls.TABLE_COLUMNS[table_name]
+				placeholders = ', '.join(['?'] * len(columns))  	# 使用占位符防御SQL注入
+				query = f"INSERT INTO {table_name} (id, {', '.join(columns)}) VALUES (?, {placeholders})"
+				cls.cursor.executemany(query, rows)
+			for global_id, event in zip(global_ids, events):
+				event.id = global_id  						# 获取全局中的唯一id值作为事件标识符
+			# 新activity的发生日期与事件本身在同一事务中写入
+			cls._write_occurrences([event for event in events if isinstance(event, ActivityEvent)])
 			cls.conn.commit()
+			cls.mark_written()
+		except Exception:
+			cls.conn.rollback()
+			for event in events:
+				event.id = None
+			raise
 
 	@classmethod
 	def delete_event(cls, event:BaseEvent) -> None:
@@ -525,6 +937,40 @@ class EventSQLManager:
 		# query_global = "DELETE FROM global_id WHERE id = ?"
 		# cursor.execute(query_global, (self.id,))
 		cls.conn.commit()
+		cls.mark_written()
+
+	@classmethod
+	def delete_events_in_dates(cls, dates: list[str]) -> tuple[list[int], list[int]]:
+		"""
+		在同一个事务中删除指定日期（yyyy-MM-dd）内的全部事件：截止时间落在这些日期的ddl，
+		以及在这些日期有发生的activity（整个activity一并删除，发生日期由触发器清理）。
+		返回被删除的 (ddl id列表, activity id列表)
+		"""
+		if not dates:
+			return [], []
+		try:
+			ddl_ids = []
+			for date in dates:
+				cls.cursor.execute(
+					"SELECT id FROM ddlevents WHERE datetime >= ? AND datetime < ?",
+					(date, cls.next_day_str(date))
+				)
+				ddl_ids += [row[0] for row in cls.cursor.fetchall()]
+			placeholders = ', '.join(['?'] * len(dates))
+			cls.cursor.execute(
+				f"SELECT DISTINCT activity_id FROM activity_occurrences WHERE date IN ({placeholders})",
+				tuple(dates)
+			)
+			activity_ids = [row[0] for row in cls.cursor.fetchall()]
+			cls.cursor.executemany("DELETE FROM ddlevents WHERE id = ?", [(id,) for id in ddl_ids])
+			cls.cursor.executemany("DELETE FROM activityevents WHERE id = ?", [(id,) for id in activity_ids])
+			cls.conn.commit()
+			cls.mark_written()
+		except Exception:
+			cls.conn.rollback()
+			raise
+		log.info(f"delete_events_in_dates:删除{len(dates)}天内的 {len(ddl_ids)} 个ddl与 {len(activity_ids)} 个activity")
+		return ddl_ids, activity_ids
 
 	@classmethod
 	def modify_event(cls, event:BaseEvent) -> None:
@@ -537,14 +983,61 @@ class EventSQLManager:
 		columns = ', '.join([f"{k} = ?" for k in data.keys()])
 		values = list(data.values()) + [event.id]
 		query = f"UPDATE {table_name} SET {columns} WHERE id = ?"
-		cls.cursor.execute(query, values)
-		cls.conn.commit()
+		try:
+			cls.cursor.execute(query, values)
+			if isinstance(event, ActivityEvent):
+				# 重复规则或起止日期可能改变，重写该activity的全部发生日期
+				cls.cursor.execute("DELETE FROM activity_occurrences WHERE activity_id = ?", (event.id,))
+				cls._write_occurrences([event])
+			cls.conn.commit()
+			cls.mark_written()
+		except Exception:
+			cls.conn.rollback()
+			raise
+class EventReadManager(EventSQLManager):
+	"""
+	后台数据库线程专用的只读管理器：沿用 EventSQLManager 的全部查询方法，
+	但连接与查询缓存都是自己的，后台线程执行慢查询时GUI线程的读写不必等待。
+	连接在后台线程中按需打开，EventSQLManager 切换数据库后下一次请求时重新打开
+	"""
+	conn = None
+	cursor = None
+	query_cache: OrderedDict = OrderedDict()
+	cache_version = None
+	db_path = None		# 当前只读连接对应的数据库路径
+
+	@classmethod
+	def ensure_connection(cls) -> None:
+		"""保证只读连接指向 EventSQLManager 当前的数据库，必须在后台数据库线程中调用"""
+		if cls.conn is not None and cls.db_path == EventSQLManager.DB_PATH:
+			return
+		if EventSQLManager.DB_PATH is None:
+			raise RuntimeError("数据库尚未初始化")
+		cls.close_connection()
+		cls.conn = sqlite3.connect(EventSQLManager.DB_PATH)
+		cls.cursor = cls.conn.cursor()
+		cls.cursor.execute("PRAGMA query_only = ON")
+		cls.db_path = EventSQLManager.DB_PATH
+		cls.query_cache.clear()
+		cls.cache_version = None
+		log.info(f"EventReadManager:后台线程已打开只读连接 {cls.db_path}")
+
+	@classmethod
+	def close_connection(cls) -> None:
+		"""关闭只读连接，必须在打开它的后台数据库线程中调用"""
+		if cls.conn is None:
+			return
+		cls.conn.close()
+		cls.conn = None
+		cls.cursor = None
+		cls.db_path = None
+
 # ===统一管理接口===
 def receive_signal(receive_data: tuple) -> None:
 	"""
 	接收信号函数
 	"""
-	global DB_PATH, conn, cursor, latest_ddlevent  	# 全局变量
+	global DB_PATH, conn, cursor  	# 全局变量
 	if not receive_data or len(receive_data) == 0:
 		log.error("receive_signal:接收信号失败，参数为空")
 	elif receive_data[0] == "create_event":
@@ -560,12 +1053,9 @@ def receive_signal(receive_data: tuple) -> None:
 		args = receive_data[3:]  					# 事件参数
 		event = EventFactory.create(id, event_type,False, *args)
 		EventSQLManager.modify_event(event)
-		# 修改事件后需要更新最新事件
-		now_time = QDateTime.currentDateTime()
-		now_time = now_time.toString("yyyy-MM-dd HH:mm")
-		result = EventSQLManager.get_latest_ddlevent(now_time)
-		latest_ddlevent = result
-		Emitter.instance().send_notice_signal((result,"update"))
+		# 修改事件后更新该事件的提醒
+		if isinstance(event, DDLEvent):
+			Emitter.instance().send_notice_signal(([event], "upsert"))
 	elif receive_data[0] == "storage_path":
 		path = receive_data[1]
 		DB_PATH = os.path.join(path, "events.db")
@@ -580,54 +1070,81 @@ def receive_signal(receive_data: tuple) -> None:
 		if EventSQLManager.cursor is not None and EventSQLManager.conn is not None:
 			EventSQLManager.cursor.execute(f"DELETE FROM {receive_data[1][1]} WHERE id = ?", (receive_data[1][0],))
 			EventSQLManager.conn.commit()
+			EventSQLManager.mark_written()
 			log.info(f"receive_signal:删除{receive_data[1][1]}中{receive_data[1][0]}事件成功")
-			# 删除事件后需要更新最新事件
-			now_time = QDateTime.currentDateTime()
-			now_time = now_time.toString("yyyy-MM-dd HH:mm")
-			result = EventSQLManager.get_latest_ddlevent(now_time)
-			latest_ddlevent = result
 			if(receive_data[1][1] == "activityevents"):
 				Emitter.instance().send_del_activity_event_signal()
-			Emitter.instance().send_notice_signal((result,"update"))
+			else:
+				# 删除ddl后撤销其提醒
+				Emitter.instance().send_notice_signal(([receive_data[1][0]], "remove"))
 		else:
 			log.error(f"receive_signal:未能连接到数据库，删除{receive_data[1][1]}类{receive_data[1][0]}事件失败")
+	elif receive_data[0] == "delete_events_in_dates":
+		dates = receive_data[1][0]
+		try:
+			ddl_ids, activity_ids = EventSQLManager.delete_events_in_dates(dates)
+		except Exception as e:
+			log.error(f"receive_signal:删除{dates}内的事件失败，Error:{e}")
+			return
+		log.info(f"receive_signal:删除{dates}内的事件成功，ddl:{ddl_ids}，activity:{activity_ids}")
+		# 一次删除只发送一次通知
+		if activity_ids:
+			Emitter.instance().send_del_activity_event_signal()
+		if ddl_ids:
+			Emitter.instance().send_notice_signal((ddl_ids, "remove"))
 	else:
 		log.error(f"receive_signal:接收信号失败，未知信号类型{receive_data[0]}，参数为{receive_data[1:]}")
 
-def request_signal(recieve_data: tuple) -> None:
+def handle_request(recieve_data: tuple, manager: type[EventSQLManager] = EventSQLManager) -> tuple:
 	"""
-	处理请求信号并回传数据
+	执行查询请求并直接返回结果，不发送信号。
+	后台数据库线程（见 DBWorker，使用 EventReadManager）与同步的 request_signal 共用
 	"""
 	result = ()		# tuple便于信号传递
 	signal_name = recieve_data[0]
 	if signal_name == "search_all":
 		keyword = recieve_data[1]
-		result = EventSQLManager.search_all(keyword)
-		log.info(f"request_signal:接收{signal_name}请求信号成功，搜索事件{keyword}，搜索结果为{result}")
-	elif signal_name == "update_upcoming":
-		start_pos = recieve_data[1][0]
+		result = manager.search_all(keyword)
+		log.info(f"handle_request:处理{signal_name}请求成功，搜索事件{keyword}，搜索结果为{result}")
+	elif signal_name == "upcoming_page":
+		cursor = recieve_data[1][0]
 		event_num = recieve_data[1][1]
-		result = EventSQLManager.get_data_time_order("ddlevents", start_pos, event_num)
-		log.info(f"request_signal:接收{signal_name}请求信号成功，获取事件")
+		result = manager.get_upcoming_page(cursor, event_num)
+		log.info(f"handle_request:处理{signal_name}请求成功，获取事件")
+	elif signal_name == "events_in_month":
+		year, month = recieve_data[1]
+		result = tuple(manager.get_events_in_month(year, month))
+		log.info(f"handle_request:处理{signal_name}请求成功，获取{year}年{month}月事件")
+	elif signal_name == "activities_between_twodays":
+		start_date, end_date = recieve_data[1]
+		result = tuple(manager.get_activities_between_twodays(start_date, end_date))
+		log.info(f"handle_request:处理{signal_name}请求成功，获取{start_date}~{end_date}的activity")
 	elif signal_name == "update_specific_date_upcoming":
 		date = recieve_data[1][0]
-		tmp = EventSQLManager.get_specific_date_events("ddlevents", date)
-		tmp += EventSQLManager.get_specific_date_events("activityevents", date)
+		tmp = manager.get_specific_date_events("ddlevents", date)
+		tmp += manager.get_specific_date_events("activityevents", date)
 		result = tuple(tmp)
-		log.info(f"request_signal:接收{signal_name}请求信号成功，获取事件")
+		log.info(f"handle_request:处理{signal_name}请求成功，获取事件")
 	elif signal_name == "search_time":
 		raise NotImplementedError("时间范围搜索功能尚未实现")
 	elif signal_name == "search_some_columns":
 		raise NotImplementedError("部分列搜索功能尚未实现")
-	elif signal_name == "latest_event":
+	else:
+		log.error(f"handle_request:处理请求失败，未知请求类型{signal_name}，参数为{recieve_data}")
+	return result
+
+def request_signal(recieve_data: tuple) -> None:
+	"""
+	处理请求信号并回传数据
+	"""
+	signal_name = recieve_data[0]
+	if signal_name == "pending_reminders":
 		now_time = recieve_data[1][0]
-		result = EventSQLManager.get_latest_ddlevent(now_time)
-		Emitter.instance().send_notice_signal((result,"get"))
+		result = EventSQLManager.get_pending_reminders(now_time)
+		Emitter.instance().send_notice_signal((result, "load"))
 		log.info(f"request_signal:接收{signal_name}请求信号成功，获取事件")
 		# 此处不走统一回传信号通道，因此提前返回
 		return
-	else:
-		log.error(f"request_signal:接收信号失败，未知信号类型{signal_name}，参数为{recieve_data}")
+	result = handle_request(recieve_data)
 	# 发送结果给回调函数
 	Emitter.instance().send_backend_data_to_frontend_signal(result)
-
@@ -68,6 +68,7 @@ class CourseScheduleImporter:
             raise ValueError("不支持的文件格式")
 
         # 提取每一个单元格信息
+        events:list[ActivityEvent] = []
         for idx, row in schedule.iterrows():
             for weekday in schedule.columns:
                 cell = row[weekday]
@@ -77,9 +78,13 @@ class CourseScheduleImporter:
                     log.info(f"{weekday}，{idx}，内容：{cell}")
                     try:
                         n_event = cls.process_data(cell,weekday,idx)
-                        log.info(f"添加课程{n_event.to_dict()}成功")
+                        log.info(f"解析课程{n_event.to_dict()}成功")
+                        events.append(n_event)
                     except Exception as e:
-                        log.error(f"添加课程{cell}失败,{e}")
+                        log.error(f"解析课程{cell}失败,{e}")
+        # 整张课表在一个事务中写入数据库
+        added = EventSQLManager.add_events(events)
+        log.info(f"导入课表完成，共添加 {len(added)} 门课程")
     @classmethod
     def process_data(cls, cell, weekday, idx) -> ActivityEvent:
         """
@@ -144,4 +149,4 @@ class CourseScheduleImporter:
         # 合并notes
         notes = f"上课地点：{result['location']}\n备注：{result['remark']}\n{result['exam_info']}"
         """输入：标题，每天开始时间，每天结束时间，开始日期，终止日期，笔记，重要程度，重复类型如("weekly"、"biweekly），重复具体星期"""
-        return EventFactory.create(None, "Activity", True, result["title"], start_time, end_time, start_date_str, end_date_str, notes, "Great", repeat_type, (repeat_day,))
\ No newline at end of file
+        return EventFactory.create(None, "Activity", False, result["title"], start_time, end_time, start_date_str, end_date_str, notes, "Great", repeat_type, (repeat_day,))
\ No newline at end of file
@@ -0,0 +1,23 @@
+import os
+import sys
+
+import pytest
+
+# 与 run.py 一致：项目根目录与 src 目录都加入模块路径
+BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SRC_DIR = os.path.join(BASE_DIR, "src")
+for path in (BASE_DIR, SRC_DIR):
+	if path not in sys.path:
+		sys.path.insert(0, path)
+
+# 界面模块之间存在循环导入（Upcoming 与 MainWindow 互相导入），与程序启动时的顺序一致，先导入 MainWindow
+import src.MainWindow  # noqa: E402,F401
+
+
+@pytest.fixture
+def db(tmp_path):
+	"""连接到临时目录中的新数据库，返回 EventSQLManager"""
+	from src.events.EventManager import EventSQLManager
+	EventSQLManager.init_connection(str(tmp_path / "events.db"))
+	yield EventSQLManager
+	EventSQLManager.conn.close()
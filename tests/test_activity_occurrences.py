@@ -0,0 +1,74 @@
+from src.events.Event import ActivityEvent
+from src.events.EventManager import EventFactory, EventSQLManager
+
+
+def add_activity(title: str, start_date: str, end_date: str, repeat_type: str = "每周", repeat_days=("Mon",)) -> ActivityEvent:
+	return EventFactory.create(None, "Activity", True, title, "08:00", "09:50", start_date, end_date, "", "Great",
+							   repeat_type, list(repeat_days))
+
+
+def stored_dates(db, activity_id: int) -> list[str]:
+	db.cursor.execute("SELECT date FROM activity_occurrences WHERE activity_id = ? ORDER BY date", (activity_id,))
+	return [row[0] for row in db.cursor.fetchall()]
+
+
+def expected_dates(activity: ActivityEvent) -> list[str]:
+	return [day.isoformat() for day in activity.occurrence_dates(activity.start_date, activity.end_date)]
+
+
+def test_insert_writes_every_occurrence(db):
+	weekly = add_activity("高等数学", "2026-09-01", "2026-10-31", "每周", ("Mon", "Thu"))
+	biweekly = add_activity("线性代数", "2026-09-01", "2026-10-31", "每两周", ("Wed",))
+	once = add_activity("讲座", "2026-10-05", "2026-10-05", "不重复", ())
+	for activity in (weekly, biweekly, once):
+		assert stored_dates(db, activity.id) == expected_dates(activity)
+	assert stored_dates(db, once.id) == ["2026-10-05"]
+	bulk = db.add_events([ActivityEvent("实验", "14:00", "16:00", "2026-09-01", "2026-09-30", "", "Great", "每周", ["Fri"])])
+	assert stored_dates(db, bulk[0].id) == ["2026-09-04", "2026-09-11", "2026-09-18", "2026-09-25"]
+
+
+def test_modify_rewrites_occurrences(db):
+	activity = add_activity("高等数学", "2026-09-01", "2026-10-31", "每周", ("Mon",))
+	other = add_activity("线性代数", "2026-09-01", "2026-10-31", "每周", ("Mon",))
+	activity.start_date, activity.end_date = "2026-10-01", "2026-11-30"
+	activity.repeat_type = "每两周"
+	activity.repeat_days = '["Tue", "Fri"]'
+	db.modify_event(activity)
+	assert stored_dates(db, activity.id) == expected_dates(activity)
+	assert stored_dates(db, activity.id)[0] == "2026-10-02"
+	# 其他activity的发生日期不受影响
+	assert stored_dates(db, other.id) == expected_dates(other)
+
+
+def test_delete_removes_occurrences(db):
+	activity = add_activity("高等数学", "2026-09-01", "2026-10-31")
+	other = add_activity("线性代数", "2026-09-01", "2026-10-31")
+	db.delete_event(activity)
+	assert stored_dates(db, activity.id) == []
+	assert stored_dates(db, other.id) == expected_dates(other)
+
+
+def test_range_queries_read_occurrences(db):
+	add_activity("高等数学", "2026-09-01", "2026-12-31", "每周", ("Mon",))
+	add_activity("线性代数", "2026-09-01", "2026-12-31", "每两周", ("Wed",))
+	events = db.get_activities_between_twodays("2026-10-01", "2026-10-31")
+	assert sorted((event.datetime, event.title) for event in events) == [
+		("2026-10-05 08:00", "高等数学"), ("2026-10-12 08:00", "高等数学"), ("2026-10-14 08:00", "线性代数"),
+		("2026-10-19 08:00", "高等数学"), ("2026-10-26 08:00", "高等数学"), ("2026-10-28 08:00", "线性代数"),
+	]
+
+
+def test_migration_backfills_existing_activities(tmp_path):
+	path = str(tmp_path / "events.db")
+	EventSQLManager.init_connection(path)
+	activity = add_activity("高等数学", "2026-09-01", "2026-10-31", "每周", ("Mon", "Wed"))
+	# 退回到没有物化表的旧版本数据库
+	EventSQLManager.cursor.execute("DROP TABLE activity_occurrences")
+	EventSQLManager.cursor.execute("PRAGMA user_version = 2")
+	EventSQLManager.conn.commit()
+	EventSQLManager.conn.close()
+	EventSQLManager.init_connection(path)
+	try:
+		assert stored_dates(EventSQLManager, activity.id) == expected_dates(activity)
+	finally:
+		EventSQLManager.conn.close()
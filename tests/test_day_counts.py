@@ -0,0 +1,96 @@
+from src.events.EventManager import EventFactory, EventSQLManager
+
+
+def add_ddl(title: str, datetime: str):
+	return EventFactory.create(None, "DDL", True, title, datetime, "", datetime, "Great")
+
+
+def add_activity(title: str, start_date: str, end_date: str, repeat_days: list[str]):
+	return EventFactory.create(None, "Activity", True, title, "08:00", "09:50", start_date, end_date, "", "Great",
+							   "每周", repeat_days)
+
+
+def stored_counts(db) -> dict[str, int]:
+	db.cursor.execute("SELECT date, count FROM event_day_counts")
+	return dict(db.cursor.fetchall())
+
+
+def true_counts(db) -> dict[str, int]:
+	"""直接聚合事件表得到的每日事件数"""
+	db.cursor.execute("""
+		SELECT day, SUM(num) FROM (
+			SELECT substr(datetime, 1, 10) AS day, COUNT(*) AS num FROM ddlevents GROUP BY day
+			UNION ALL
+			SELECT date AS day, COUNT(*) AS num FROM activity_occurrences GROUP BY day
+		)
+		GROUP BY day
+	""")
+	return dict(db.cursor.fetchall())
+
+
+def assert_counts_consistent(db):
+	counts = stored_counts(db)
+	assert counts == true_counts(db)
+	assert all(num > 0 for num in counts.values())
+
+
+def test_counts_follow_add_modify_and_delete(db):
+	ddl = add_ddl("作业", "2026-10-05 23:59")
+	add_ddl("实验报告", "2026-10-05 12:00")
+	activity = add_activity("高等数学", "2026-09-28", "2026-10-18", ["Mon", "Wed"])
+	assert_counts_consistent(db)
+	assert stored_counts(db)["2026-10-05"] == 3
+
+	ddl.datetime = "2026-10-06 23:59"
+	db.modify_event(ddl)
+	assert_counts_consistent(db)
+	activity.start_date, activity.end_date = "2026-10-10", "2026-10-31"
+	db.modify_event(activity)
+	assert_counts_consistent(db)
+	assert stored_counts(db)["2026-10-05"] == 1
+
+	db.delete_event(activity)
+	assert_counts_consistent(db)
+	db.delete_event(ddl)
+	assert stored_counts(db) == {"2026-10-05": 1}
+
+
+def test_counts_after_delete_events_in_dates(db):
+	add_ddl("作业", "2026-10-05 23:59")
+	add_ddl("论文", "2026-10-20 23:59")
+	add_activity("高等数学", "2026-09-28", "2026-10-18", ["Mon"])
+	add_activity("线性代数", "2026-10-19", "2026-10-31", ["Tue"])
+	ddl_ids, activity_ids = db.delete_events_in_dates(["2026-10-05", "2026-10-12"])
+	assert len(ddl_ids) == 1 and len(activity_ids) == 1
+	assert_counts_consistent(db)
+	assert stored_counts(db) == {"2026-10-20": 2, "2026-10-27": 1}
+
+
+def test_bulk_insert_and_year_range(db):
+	assert db.get_event_year_range() is None
+	db.add_events([
+		EventFactory.create(None, "DDL", False, "作业", "2025-12-31 23:59", "", "2025-12-31 20:00", "Great"),
+		EventFactory.create(None, "Activity", False, "高等数学", "08:00", "09:50", "2026-12-28", "2027-01-10", "", "Great",
+							"每周", ["Mon"]),
+	])
+	assert_counts_consistent(db)
+	assert db.get_event_year_range() == (2025, 2027)
+	assert db.count_events_per_day(2027) == {"2027-01-04": 1}
+
+
+def test_migration_backfills_counts(tmp_path):
+	path = str(tmp_path / "events.db")
+	EventSQLManager.init_connection(path)
+	add_ddl("作业", "2026-10-05 23:59")
+	add_activity("高等数学", "2026-09-28", "2026-10-18", ["Mon"])
+	# 退回到没有每日计数表的旧版本数据库
+	EventSQLManager.cursor.execute("DROP TABLE event_day_counts")
+	EventSQLManager.cursor.execute("PRAGMA user_version = 3")
+	EventSQLManager.conn.commit()
+	EventSQLManager.conn.close()
+	EventSQLManager.init_connection(path)
+	try:
+		assert stored_counts(EventSQLManager) == {"2026-09-28": 1, "2026-10-05": 2, "2026-10-12": 1}
+		assert_counts_consistent(EventSQLManager)
+	finally:
+		EventSQLManager.conn.close()
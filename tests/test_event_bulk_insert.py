@@ -0,0 +1,91 @@
+import sqlite3
+
+import pytest
+
+from src.events.Event import ActivityEvent, DDLEvent
+
+
+def make_ddl(title: str) -> DDLEvent:
+	return DDLEvent(title, "2026-10-20 10:00", "", "2026-10-20 09:00", "Great")
+
+
+def make_activity(title: str) -> ActivityEvent:
+	return ActivityEvent(title, "08:00", "09:50", "2026-09-07", "2026-09-07", "", "Great", "不重复", [])
+
+
+def table_ids(db, table_name: str) -> list[int]:
+	db.cursor.execute(f"SELECT id FROM {table_name} ORDER BY id")
+	return [row[0] for row in db.cursor.fetchall()]
+
+
+def test_bulk_insert_assigns_consecutive_global_ids(db):
+	db.add_event(make_ddl("已有作业"))
+	events = [make_ddl("作业1"), make_activity("课程1"), make_ddl("作业2"), None, make_activity("课程2")]
+	added = db.add_events(events)
+	assert [event.title for event in added] == ["作业1", "课程1", "作业2", "课程2"]
+	assert [event.id for event in added] == [2, 3, 4, 5]
+	assert table_ids(db, "global_id") == [1, 2, 3, 4, 5]
+	assert table_ids(db, "ddlevents") == [1, 2, 4]
+	assert table_ids(db, "activityevents") == [3, 5]
+
+
+def test_events_with_ids_are_skipped(db):
+	existing = make_ddl("已有作业")
+	db.add_event(existing)
+	added = db.add_events([existing, make_ddl("新作业")])
+	assert [event.title for event in added] == ["新作业"]
+	assert table_ids(db, "ddlevents") == [1, 2]
+
+
+def test_failed_batch_rolls_back_everything(db):
+	db.add_event(make_ddl("已有作业"))
+	broken = make_ddl("坏数据")
+	broken.to_dict = lambda: {"title": object()}  # sqlite 无法绑定的参数，且缺少列
+	events = [make_ddl("作业1"), broken]
+	assert db.add_events(events) == []
+	assert table_ids(db, "global_id") == [1]
+	assert table_ids(db, "ddlevents") == [1]
+	assert all(event.id is None for event in events)
+	# 失败后连接不处于事务中，后续写入正常
+	assert not db.conn.in_transaction
+	assert [event.id for event in db.add_events([make_ddl("作业2")])] == [2]
+
+
+class InterleavingCursor:
+	"""读取最大id之后，让另一个连接尝试提交一个新id，模拟另一个程序实例同时写入"""
+
+	def __init__(self, cursor, other: sqlite3.Connection):
+		self.cursor = cursor
+		self.other = other
+		self.other_committed = None
+
+	def execute(self, sql, *args):
+		result = self.cursor.execute(sql, *args)
+		if "MAX(id)" in sql:
+			try:
+				self.other.execute("INSERT INTO global_id DEFAULT VALUES")
+				self.other.commit()
+				self.other_committed = True
+			except sqlite3.OperationalError:
+				self.other_committed = False
+		return result
+
+	def __getattr__(self, name):
+		return getattr(self.cursor, name)
+
+
+def test_id_reservation_holds_the_write_lock(db, tmp_path, monkeypatch):
+	other = sqlite3.connect(str(tmp_path / "events.db"), timeout=0)
+	try:
+		cursor = InterleavingCursor(db.cursor, other)
+		monkeypatch.setattr(db, "cursor", cursor)
+		added = db.add_events([make_ddl("作业1"), make_ddl("作业2")])
+		# 预留id期间写锁已被占用，另一个连接无法插入，批量写入不会因主键冲突失败
+		assert cursor.other_committed is False
+		assert [event.id for event in added] == [1, 2]
+		monkeypatch.undo()
+		other.execute("INSERT INTO global_id DEFAULT VALUES")
+		other.commit()
+		assert table_ids(db, "global_id") == [1, 2, 3]
+	finally:
+		other.close()
@@ -0,0 +1,93 @@
+import sqlite3
+
+from src.events.EventManager import EventSQLManager
+
+
+def create_v0_database(path: str):
+	"""按旧版本（没有 user_version、没有索引）的结构建表并写入数据"""
+	conn = sqlite3.connect(path)
+	conn.execute("""
+		CREATE TABLE ddlevents (id INTEGER PRIMARY KEY, title TEXT, datetime DATETIME, notes TEXT,
+			advance_time DATETIME, importance TEXT, done INTEGER)
+	""")
+	conn.execute("""
+		CREATE TABLE activityevents (id INTEGER PRIMARY KEY, title TEXT, start_time TEXT, end_time TEXT,
+			start_date TEXT, end_date TEXT, notes TEXT, importance TEXT, repeat_type TEXT, repeat_days TEXT)
+	""")
+	conn.execute("INSERT INTO ddlevents VALUES (1, '作业', '2026-10-20 10:00', '笔记', '2026-10-20 09:00', 'Great', 0)")
+	conn.execute("""
+		INSERT INTO activityevents VALUES (2, '高等数学', '08:00', '09:50', '2026-09-01', '2026-12-31', '',
+			'Great', '每周', '["Mon"]')
+	""")
+	conn.commit()
+	conn.close()
+
+
+def index_names() -> set[str]:
+	EventSQLManager.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'index'")
+	return {row[0] for row in EventSQLManager.cursor.fetchall()}
+
+
+def user_version() -> int:
+	EventSQLManager.cursor.execute("PRAGMA user_version")
+	return EventSQLManager.cursor.fetchone()[0]
+
+
+def test_upgrade_from_v0_keeps_data(tmp_path):
+	path = str(tmp_path / "events.db")
+	create_v0_database(path)
+	EventSQLManager.init_connection(path)
+	try:
+		assert user_version() == EventSQLManager.SCHEMA_VERSION
+		assert {"idx_ddlevents_datetime", "idx_ddlevents_advance_time", "idx_activityevents_date_range"} <= index_names()
+		EventSQLManager.cursor.execute("SELECT id, title FROM ddlevents")
+		assert EventSQLManager.cursor.fetchall() == [(1, "作业")]
+		EventSQLManager.cursor.execute("SELECT id, title FROM activityevents")
+		assert EventSQLManager.cursor.fetchall() == [(2, "高等数学")]
+	finally:
+		EventSQLManager.conn.close()
+
+
+def test_new_database_is_created_at_latest_version(db):
+	assert user_version() == db.SCHEMA_VERSION
+
+
+def test_failed_migration_rolls_back_and_retries(tmp_path, monkeypatch):
+	path = str(tmp_path / "events.db")
+	EventSQLManager.init_connection(path)
+	EventSQLManager.conn.close()
+	version = EventSQLManager.SCHEMA_VERSION
+
+	def failing_migration(cls):
+		cls.cursor.execute("CREATE TABLE half_done (id INTEGER)")
+		raise RuntimeError("迁移失败")
+
+	monkeypatch.setattr(EventSQLManager, "_migrate_failing", classmethod(failing_migration), raising=False)
+	monkeypatch.setattr(EventSQLManager, "MIGRATIONS", EventSQLManager.MIGRATIONS + [(version + 1, "_migrate_failing")])
+	monkeypatch.setattr(EventSQLManager, "SCHEMA_VERSION", version + 1)
+	EventSQLManager.init_connection(path)
+	try:
+		# 失败的迁移整体回滚，版本号停在上一个版本
+		assert user_version() == version
+		EventSQLManager.cursor.execute("SELECT 1 FROM sqlite_master WHERE name = 'half_done'")
+		assert EventSQLManager.cursor.fetchone() is None
+		# 修复后重新连接时再次执行
+		monkeypatch.setattr(EventSQLManager, "_migrate_failing", classmethod(lambda cls: None), raising=False)
+		EventSQLManager.conn.close()
+		EventSQLManager.init_connection(path)
+		assert user_version() == version + 1
+	finally:
+		EventSQLManager.conn.close()
+
+
+def test_newer_database_is_left_untouched(tmp_path):
+	path = str(tmp_path / "events.db")
+	conn = sqlite3.connect(path)
+	conn.execute(f"PRAGMA user_version = {EventSQLManager.SCHEMA_VERSION + 5}")
+	conn.close()
+	EventSQLManager.init_connection(path)
+	try:
+		assert user_version() == EventSQLManager.SCHEMA_VERSION + 5
+		assert "idx_ddlevents_datetime" not in index_names()
+	finally:
+		EventSQLManager.conn.close()
@@ -0,0 +1,73 @@
+from datetime import date, timedelta
+
+import pytest
+
+from src.events.Event import ActivityEvent
+
+WEEKDAY_NAMES = ("Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun")
+
+
+def expand_by_day(activity: ActivityEvent, range_start: str, range_end: str) -> list[date]:
+	"""原 expand 的逐日扫描实现，作为 occurrence_dates 的参照"""
+	start, end = date.fromisoformat(range_start), date.fromisoformat(range_end)
+	base_start, base_end = date.fromisoformat(activity.start_date), date.fromisoformat(activity.end_date)
+	if start > base_end or end < base_start:
+		return []
+	if activity.repeat_type == "不重复":
+		return [base_start]
+	repeat_days = set(activity.to_args()[-1])
+	result = []
+	current = max(start, base_start)
+	while current <= min(end, base_end):
+		week_index = (current - base_start).days // 7
+		if WEEKDAY_NAMES[current.weekday()] in repeat_days:
+			if activity.repeat_type == "每周" or week_index % 2 == 0:
+				result.append(current)
+		current += timedelta(days=1)
+	return result
+
+
+REPEAT_CASES = [
+	("不重复", []),
+	("每周", ["Mon"]),
+	("每周", ["Mon", "Wed", "Sun"]),
+	("每周", ["Sun", "Tue"]),
+	("每两周", ["Fri"]),
+	("每两周", ["Wed", "Fri"]),
+	("每两周", ["Sat", "Mon", "Thu"]),
+]
+
+RANGES = [
+	("2026-01-01", "2026-12-31"),
+	("2026-09-03", "2026-09-03"),
+	("2026-09-10", "2026-10-20"),
+	("2025-01-01", "2026-09-02"),
+	("2027-01-05", "2027-06-30"),
+	("2027-02-01", "2027-03-01"),
+]
+
+
+@pytest.mark.parametrize("repeat_type, repeat_days", REPEAT_CASES)
+@pytest.mark.parametrize("start_date", ["2026-09-01", "2026-09-03", "2026-09-06"])
+@pytest.mark.parametrize("range_start, range_end", RANGES)
+def test_occurrence_dates_matches_daily_scan(repeat_type, repeat_days, start_date, range_start, range_end):
+	activity = ActivityEvent("课程", "08:00", "09:50", start_date, "2027-01-20", "", "Great", repeat_type, repeat_days)
+	assert list(activity.occurrence_dates(range_start, range_end)) == expand_by_day(activity, range_start, range_end)
+
+
+def test_occurrence_dates_outside_activity_range_is_empty():
+	activity = ActivityEvent("课程", "08:00", "09:50", "2026-09-01", "2026-12-31", "", "Great", "每周", ["Mon"])
+	assert list(activity.occurrence_dates("2027-01-01", "2027-12-31")) == []
+	assert list(activity.occurrence_dates("2026-01-01", "2026-08-31")) == []
+
+
+def test_unknown_repeat_day_is_ignored():
+	activity = ActivityEvent("课程", "08:00", "09:50", "2026-09-01", "2026-09-30", "", "Great", "每周", ["Mon", "周一"])
+	assert list(activity.occurrence_dates("2026-09-01", "2026-09-30")) == [
+		date(2026, 9, 7), date(2026, 9, 14), date(2026, 9, 21), date(2026, 9, 28)]
+
+
+def test_expand_sets_occurrence_datetime():
+	activity = ActivityEvent("课程", "08:00", "09:50", "2026-09-01", "2026-09-30", "", "Great", "每两周", ["Tue"])
+	assert [event.datetime for event in activity.expand("2026-09-01", "2026-09-30")] == [
+		"2026-09-01 08:00", "2026-09-15 08:00", "2026-09-29 08:00"]
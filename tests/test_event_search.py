@@ -0,0 +1,83 @@
+import pytest
+
+from src.events.EventManager import EventFactory
+
+
+def add_ddl(title: str, notes: str = ""):
+	return EventFactory.create(None, "DDL", True, title, "2026-10-20 10:00", notes, "2026-10-20 09:00", "Great")
+
+
+def fts_rows(db) -> list[tuple]:
+	db.cursor.execute("SELECT rowid, title, notes, table_name FROM event_fts ORDER BY rowid")
+	return db.cursor.fetchall()
+
+
+def titles(events) -> set[str]:
+	return {event.title for event in events}
+
+
+@pytest.fixture
+def fts_db(db):
+	if not db.fts_enabled:
+		pytest.skip("当前SQLite不支持FTS5 trigram")
+	return db
+
+
+def test_triggers_keep_index_in_sync(fts_db):
+	ddl = add_ddl("线性代数作业", "第三章习题")
+	activity = EventFactory.create(None, "Activity", True, "高等数学课程", "08:00", "09:50", "2026-09-07", "2026-09-07",
+								   "理教101", "Great", "不重复", [])
+	assert fts_rows(fts_db) == [
+		(ddl.id, "线性代数作业", "第三章习题", "ddlevents"),
+		(activity.id, "高等数学课程", "理教101", "activityevents"),
+	]
+	ddl.title = "概率论作业"
+	fts_db.modify_event(ddl)
+	assert fts_rows(fts_db)[0] == (ddl.id, "概率论作业", "第三章习题", "ddlevents")
+	assert titles(fts_db.search_all(("概率论",))) == {"概率论作业"}
+	assert fts_db.search_all(("线性代数",)) == []
+	fts_db.delete_event(ddl)
+	assert fts_rows(fts_db) == [(activity.id, "高等数学课程", "理教101", "activityevents")]
+	assert fts_db.search_all(("概率论",)) == []
+
+
+def test_search_combines_terms_with_and(fts_db):
+	add_ddl("线性代数作业", "第三章习题")
+	add_ddl("线性代数复习", "期中考试")
+	add_ddl("Python project", "report")
+	assert titles(fts_db.search_all(("线性代数",))) == {"线性代数作业", "线性代数复习"}
+	assert titles(fts_db.search_all(("线性代数", "第三章"))) == {"线性代数作业"}
+	# trigram 不区分大小写，短语按原样匹配
+	assert titles(fts_db.search_all(("PROJECT",))) == {"Python project"}
+	assert titles(fts_db.search_all(("python proj",))) == {"Python project"}
+	assert fts_db.search_all(('"; DROP',)) == []
+
+
+def test_short_terms_fall_back_to_row_matching(fts_db):
+	add_ddl("线性代数作业", "第三章习题")
+	add_ddl("高等数学作业", "")
+	add_ddl("Go", "")
+	# 少于3个字的关键词不能用 trigram 索引，逐行用 instr 匹配
+	assert titles(fts_db.search_all(("作业",))) == {"线性代数作业", "高等数学作业"}
+	assert titles(fts_db.search_all(("数",))) == {"线性代数作业", "高等数学作业"}
+	assert titles(fts_db.search_all(("go",))) == {"Go"}
+	# 长短关键词混合：长关键词走索引，短关键词在命中行内过滤
+	assert titles(fts_db.search_all(("高等数学", "作业"))) == {"高等数学作业"}
+	assert titles(fts_db.search_all(("第三章", "数学"))) == set()
+
+
+def test_missing_index_is_rebuilt_on_connect(fts_db, tmp_path):
+	add_ddl("线性代数作业", "第三章习题")
+	# 模拟在不支持FTS5的SQLite上完成了 v2 迁移：版本号已前进，但索引与触发器都不存在
+	for table_name in fts_db.TABLE_COLUMNS:
+		for action in ("insert", "update", "delete"):
+			fts_db.cursor.execute(f"DROP TRIGGER IF EXISTS {table_name}_fts_{action}")
+	fts_db.cursor.execute("DROP TABLE event_fts")
+	fts_db.conn.commit()
+	fts_db.conn.close()
+	fts_db.init_connection(str(tmp_path / "events.db"))
+	assert fts_db.fts_enabled
+	assert titles(fts_db.search_all(("线性代数",))) == {"线性代数作业"}
+	# 重建的触发器同样生效
+	add_ddl("线性代数复习", "")
+	assert titles(fts_db.search_all(("线性代数",))) == {"线性代数作业", "线性代数复习"}
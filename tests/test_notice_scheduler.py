@@ -0,0 +1,108 @@
+import sys
+
+import pytest
+
+from src.common import QDateTime
+from src.Emitter import Emitter
+from src.events.Event import DDLEvent
+from src.Notice import Notice
+
+
+class RecordingTimer:
+	"""代替 QTimer，只记录最近一次设置的间隔，不会真正触发"""
+
+	def __init__(self):
+		self.interval = None
+
+	def start(self, interval: int):
+		self.interval = interval
+
+	def stop(self):
+		self.interval = None
+
+
+def minutes_from_now(minutes: int) -> str:
+	return QDateTime.currentDateTime().addSecs(minutes * 60).toString("yyyy-MM-dd HH:mm")
+
+
+def make_event(event_id: int, advance_time: str, title: str = "作业") -> DDLEvent:
+	event = DDLEvent(title, advance_time, "", advance_time, "Great")
+	event.id = event_id
+	return event
+
+
+@pytest.fixture
+def notice():
+	notice = Notice()
+	notice.timer.stop()
+	notice.timer = RecordingTimer()
+	notice.published = []
+	notice.notify_to_floating_window.connect(lambda info: notice.published.append(info[0]))
+	yield notice
+	Emitter.instance().notice_signal.disconnect(notice.update_reminders)
+
+
+def test_load_keeps_only_future_reminders(notice):
+	past, soon, later = make_event(1, minutes_from_now(-60)), make_event(2, minutes_from_now(10)), make_event(3, minutes_from_now(120))
+	notice.update_reminders(([later, past, soon], "load"))
+	assert set(notice.reminders) == {2, 3}
+	assert sorted(notice.reminder_heap) == [(soon.advance_time, 2), (later.advance_time, 3)]
+	assert notice.latest_event is soon
+	assert notice.published[-1] is soon
+	assert 0 < notice.timer.interval <= 10 * 60 * 1000
+
+
+def test_timer_is_capped_at_max_interval(notice):
+	notice.update_reminders(([make_event(1, minutes_from_now(180))], "load"))
+	assert notice.timer.interval == Notice.MAX_TIMER_INTERVAL
+
+
+def test_upsert_replaces_entry_and_drops_stale_heap_item(notice):
+	first, second = make_event(1, minutes_from_now(10)), make_event(2, minutes_from_now(30))
+	notice.update_reminders(([first, second], "load"))
+	moved = make_event(1, minutes_from_now(60))
+	notice.update_reminders(([moved], "upsert"))
+	# 旧的 (10分钟后, 1) 在堆顶失效，arm_timer 应将其丢弃并按第2条设置定时器
+	assert notice.reminders == {1: moved, 2: second}
+	assert notice.reminder_heap[0] == (second.advance_time, 2)
+	assert (first.advance_time, 1) not in notice.reminder_heap
+	assert notice.latest_event is second
+	assert 20 * 60 * 1000 < notice.timer.interval <= 30 * 60 * 1000
+
+
+def test_upsert_into_the_past_removes_reminder(notice):
+	notice.update_reminders(([make_event(1, minutes_from_now(10))], "load"))
+	notice.update_reminders(([make_event(1, minutes_from_now(-10))], "upsert"))
+	assert notice.reminders == {}
+	assert notice.reminder_heap == []
+	assert notice.timer.interval is None
+	assert notice.published[-1] is None
+
+
+def test_remove_rearms_for_next_reminder(notice):
+	first, second = make_event(1, minutes_from_now(10)), make_event(2, minutes_from_now(120))
+	notice.update_reminders(([first, second], "load"))
+	notice.update_reminders(([1], "remove"))
+	assert set(notice.reminders) == {2}
+	assert notice.reminder_heap == [(second.advance_time, 2)]
+	assert notice.latest_event is second
+	assert notice.timer.interval == Notice.MAX_TIMER_INTERVAL
+	notice.update_reminders(([2], "remove"))
+	assert notice.timer.interval is None
+	assert notice.latest_event is None
+
+
+@pytest.mark.skipif(sys.platform == "darwin", reason="macOS 上直接调用系统通知")
+def test_check_notice_delivers_due_batch(notice, monkeypatch):
+	now = Notice.now_str()
+	monkeypatch.setattr(Notice, "now_str", staticmethod(lambda: now))
+	delivered = []
+	notice.notify_to_tray.connect(delivered.append)
+	due_a, due_b, later = make_event(1, now, "作业一"), make_event(2, now, "作业二"), make_event(3, minutes_from_now(120))
+	notice.update_reminders(([due_a, due_b, later], "load"))
+	notice.check_notice()
+	assert len(delivered) == 1
+	assert sorted(event.id for event in delivered[0]) == [1, 2]
+	assert set(notice.reminders) == {3}
+	assert notice.reminder_heap[0] == (later.advance_time, 3)
+	assert notice.latest_event is later
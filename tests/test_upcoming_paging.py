@@ -0,0 +1,71 @@
+from datetime import date, timedelta
+
+from src.events.EventManager import EventFactory
+
+
+def add_ddl(title: str, datetime: str):
+	return EventFactory.create(None, "DDL", True, title, datetime, "", datetime, "Great")
+
+
+def add_activity(title: str, start_date: str, end_date: str, repeat_days: list[str]):
+	return EventFactory.create(None, "Activity", True, title, "10:00", "11:40", start_date, end_date, "", "Great",
+							   "每周", repeat_days)
+
+
+def page_through(db, page_size: int, upcoming: bool = False) -> list[tuple[str, int]]:
+	"""从头翻到底，返回每个事件的 (datetime, id)；upcoming 为 True 时翻 ddl 与 activity 合并后的页"""
+	seen = []
+	cursor = None
+	while True:
+		if upcoming:
+			page = db.get_upcoming_page(cursor, page_size)
+		else:
+			page = db.get_data_after_cursor("ddlevents", cursor, page_size)
+		if not page:
+			return seen
+		seen += [(event.datetime, event.id) for event in page]
+		cursor = seen[-1]
+
+
+def test_pages_cover_every_ddl_once(db):
+	# 大量相同的截止时间，分页边界必然落在同一时间的事件之间
+	for k in range(17):
+		add_ddl(f"作业{k}", f"2026-10-{20 + k % 3} 10:00")
+	for page_size in (1, 2, 3, 5, 17, 50):
+		seen = page_through(db, page_size)
+		assert len(seen) == 17
+		assert len(set(seen)) == 17
+		assert seen == sorted(seen)
+
+
+def test_events_added_during_paging_do_not_shift_pages(db):
+	for k in range(6):
+		add_ddl(f"作业{k}", "2026-10-20 10:00")
+	first_page = db.get_data_after_cursor("ddlevents", None, 3)
+	# 在已显示的位置之前插入新事件，后续页不会重复已显示的事件
+	add_ddl("更早的作业", "2026-10-01 10:00")
+	cursor = (first_page[-1].datetime, first_page[-1].id)
+	second_page = db.get_data_after_cursor("ddlevents", cursor, 10)
+	assert [event.title for event in second_page] == ["作业3", "作业4", "作业5"]
+
+
+def test_upcoming_pages_merge_ddls_and_activities(db):
+	today = date.today()
+	day = lambda offset: (today + timedelta(days=offset)).isoformat()
+	expected = []
+	# ddl 与 activity 的发生时间大量重合，分页边界会落在相同 datetime 的不同表之间
+	for k in range(8):
+		ddl = add_ddl(f"作业{k}", f"{day(k % 4)} 10:00")
+		expected.append((ddl.datetime, ddl.id))
+	overdue = add_ddl("过期作业", f"{day(-3)} 10:00")
+	expected.append((overdue.datetime, overdue.id))
+	weekdays = ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"]
+	for k in range(3):
+		activity = add_activity(f"课程{k}", day(-14), day(20), weekdays[k::2])
+		# activity 只显示今天及以后的发生
+		expected += [(f"{occurrence.isoformat()} 10:00", activity.id)
+					 for occurrence in activity.occurrence_dates(activity.start_date, activity.end_date)
+					 if occurrence >= today]
+	expected.sort()
+	for page_size in (1, 2, 3, 7, 50):
+		assert page_through(db, page_size, upcoming=True) == expected
@@ -0,0 +1,62 @@
+import random
+from datetime import date, timedelta
+
+from src.events.Event import ActivityEvent, DDLEvent
+from src.Upcoming import DateRowCounter, UpcomingModel, UpcomingRow
+
+
+def test_rows_before_counts_earlier_dates_only():
+	counter = DateRowCounter()
+	counter.add("2026-10-01", 3)
+	counter.add("2026-10-05", 2)
+	counter.add("2027-01-01", 4)
+	assert counter.rows_before("2026-10-01") == 0
+	assert counter.rows_before("2026-10-02") == 3
+	assert counter.rows_before("2026-10-05") == 3
+	assert counter.rows_before("2026-10-06") == 5
+	assert counter.rows_before("2027-01-01") == 5
+	assert counter.rows_before("2030-01-01") == 9
+
+
+def test_remove_rows_and_clear():
+	counter = DateRowCounter()
+	counter.add("2026-10-01", 3)
+	counter.add("2026-10-05", 2)
+	counter.add("2026-10-01", -1)
+	counter.add("2026-10-05", -2)
+	assert counter.rows_before("2026-10-06") == 2
+	counter.clear()
+	assert counter.rows_before("2030-01-01") == 0
+
+
+def test_prefix_counts_match_naive_sum_after_random_updates():
+	rng = random.Random(20261018)
+	days = [(date(2026, 1, 1) + timedelta(days=offset)).isoformat() for offset in range(0, 800, 3)]
+	counter = DateRowCounter()
+	rows = dict.fromkeys(days, 0)
+	for _ in range(2000):
+		day = rng.choice(days)
+		# 行数不会减到负数，与模型中删除已有行的情况一致
+		delta = rng.choice((1, 2, 3)) if rows[day] == 0 else rng.choice((-1, 1, 2, -rows[day]))
+		rows[day] += delta
+		counter.add(day, delta)
+	for day in days + ["2025-12-31", "2028-06-01"]:
+		assert counter.rows_before(day) == sum(num for other, num in rows.items() if other < day)
+
+
+def test_remove_all_event_rows_drops_every_occurrence():
+	model = UpcomingModel()
+	activity = ActivityEvent("高等数学", "08:00", "09:50", "2026-10-01", "2026-10-31", "", "Great", "每周", ["Mon"])
+	activity.id = 1
+	ddl = DDLEvent("作业", "2026-10-12 23:59", "", "2026-10-12 20:00", "Great")
+	ddl.id = 2
+	for day in ("2026-10-05", "2026-10-12", "2026-10-19"):
+		model.add_date_label(UpcomingRow(UpcomingRow.DATE, date=day, text=day))
+		model.add_event_row(UpcomingRow(UpcomingRow.EVENT, date=day, event=activity), at_top=True)
+	model.add_event_row(UpcomingRow(UpcomingRow.EVENT, date="2026-10-12", event=ddl), at_top=False)
+	assert model.remove_all_event_rows(1) == 3
+	# 只剩ddl所在的日期分组
+	assert [(row.kind, row.date) for row in model.rows] == [(UpcomingRow.DATE, "2026-10-12"), (UpcomingRow.EVENT, "2026-10-12")]
+	assert model.item_dates == {2: {"2026-10-12"}}
+	assert model.remove_all_event_rows(1) == 0
+	assert model.row_counter.rows_before("2030-01-01") == 2
@@ -0,0 +1,66 @@
+import random
+
+from src.Weekview import pack_day_schedules
+
+
+def overlaps(a: tuple, b: tuple) -> bool:
+	return a[2] < b[3] and b[2] < a[3]
+
+
+def check_packing(intervals: list[tuple[int, int, str]]):
+	clusters = pack_day_schedules(1, intervals)
+	entries = [entry for cluster in clusters for entry in cluster.entries]
+	# 每个日程恰好出现一次
+	assert sorted(event for event, *_ in entries) == sorted(event for *_, event in intervals)
+	for cluster in clusters:
+		assert cluster.weekday == 1
+		assert cluster.start == min(entry[2] for entry in cluster.entries)
+		assert cluster.end == max(entry[3] for entry in cluster.entries)
+		assert cluster.columns == max(entry[1] for entry in cluster.entries) + 1
+		# 同一列中的日程互不重叠
+		for i, a in enumerate(cluster.entries):
+			for b in cluster.entries[i + 1:]:
+				if a[1] == b[1]:
+					assert not overlaps(a, b)
+		# 列数等于组内同时进行的日程数的最大值
+		concurrent = max(sum(1 for other in cluster.entries if other[2] <= entry[2] < other[3]) for entry in cluster.entries)
+		assert cluster.columns == concurrent
+	# 不同组之间没有重叠，且按时间先后排列
+	for previous, cluster in zip(clusters, clusters[1:]):
+		assert previous.end <= cluster.start
+	return clusters
+
+
+def test_overlapping_schedules_share_a_cluster():
+	clusters = check_packing([(480, 590, "a"), (500, 560, "b"), (560, 620, "c"), (600, 700, "d"), (800, 840, "e")])
+	assert [[(event, column) for event, column, *_ in cluster.entries] for cluster in clusters] == [
+		[("a", 0), ("b", 1), ("c", 1), ("d", 0)],
+		[("e", 0)],
+	]
+	assert [cluster.columns for cluster in clusters] == [2, 1]
+
+
+def test_back_to_back_schedules_reuse_a_column():
+	clusters = check_packing([(480, 540, "a"), (540, 600, "b"), (540, 660, "c")])
+	assert len(clusters) == 2
+	assert clusters[1].columns == 2
+
+
+def test_identical_schedules_get_separate_columns():
+	clusters = check_packing([(840, 930, f"课程{k}") for k in range(6)])
+	assert len(clusters) == 1
+	assert sorted(column for _, column, *_ in clusters[0].entries) == list(range(6))
+
+
+def test_empty_day():
+	assert pack_day_schedules(3, []) == []
+
+
+def test_random_days_never_overlap_within_a_column():
+	rng = random.Random(20261018)
+	for _ in range(200):
+		intervals = []
+		for k in range(rng.randint(1, 25)):
+			start = rng.randrange(0, 24 * 60 - 15, 15)
+			intervals.append((start, min(24 * 60, start + rng.choice((15, 30, 50, 90, 120, 240))), f"e{k}"))
+		check_packing(intervals)